@@ -1,5 +1,7 @@
 import json
 import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from ipaddress import IPv4Address
 from pathlib import Path
 
@@ -12,6 +14,11 @@ def pytest_addoption(parser) -> None:
         action="store_true",
         help="Run tests that perform HTTP requests to external resources",
     )
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        help="Run benchmarks comparing the performance of implementations",
+    )
 
 
 def pytest_runtest_setup(item) -> None:
@@ -21,6 +28,59 @@ def pytest_runtest_setup(item) -> None:
         pytest.skip(
             'Run pytest with the "--external_fetch" option enabled to run ' "this test"
         )
+    if "benchmark" in item.keywords and not item.config.getoption("benchmark"):
+        pytest.skip('Run pytest with the "--benchmark" option enabled to run this test')
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    throttled = set()
+
+    def do_GET(self):
+        body = self.path.encode()
+        if self.path.startswith("/chunked"):
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (body[:3], body[3:]):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        if self.path.startswith("/throttled") and self.path not in self.throttled:
+            # Answer the first request to each of these paths with 429
+            self.throttled.add(self.path)
+            self.send_response(429)
+            self.send_header("Retry-After", "0.2" if "/slow" in self.path else "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/down") or (
+            self.path.startswith("/flaky") and self.path not in self.throttled
+        ):
+            # Answer every request to "/down" and the first request to
+            # each "/flaky" path with 503
+            self.throttled.add(self.path)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(404 if self.path.startswith("/missing") else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
 
 
 @pytest.fixture
@@ -116,17 +176,25 @@ def crtsh_github_response() -> str:
 @pytest.fixture
 def crtsh_github_domains() -> set[str]:
     return {
-        "skyline.github.com",
-        "*.proxima-review-lab.github.com",
-        "*.registry.github.com",
+        "api.security.github.com",
+        "api.stars.github.com",
+        "examregistration.github.com",
         "f.cloud.github.com",
+        "import2.github.com",
+        "importer2.github.com",
+        "partnerportal.github.com",
+        "porter2.github.com",
+        "proxima-review-lab.github.com",
+        "registry.github.com",
+        "skyline.github.com",
         "support.enterprise.github.com",
         "ws.support.github.com",
-        "examregistration.github.com",
-        "api.security.github.com",
-        "partnerportal.github.com",
-        "import2.github.com",
-        "api.stars.github.com",
+        "www.api.security.github.com",
+        "www.api.stars.github.com",
+        "www.partnerportal.github.com",
+        "www.skyline.github.com",
+        "www.support.enterprise.github.com",
+        "www.ws.support.github.com",
     }
 
 
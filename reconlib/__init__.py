@@ -23,6 +23,40 @@ Contact: https://www.twitter.com/eon_raider
     <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
 """
 
-from .crtsh.api import CRTShAPI
-from .hackertarget.api import HackerTargetAPI
-from .virustotal.api import VirusTotalAPI
+from importlib import import_module
+
+# Recognized by type checkers in place of typing.TYPE_CHECKING, which
+# would make importing the package alone load the typing module
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .core.recon import Recon
+    from .crtsh.api import AsyncCRTShAPI, CRTShAPI
+    from .hackertarget.api import AsyncHackerTargetAPI, HackerTargetAPI
+    from .virustotal.api import AsyncVirusTotalAPI, VirusTotalAPI
+
+# Public names mapped to the modules defining them. Modules are only
+# imported once one of their names is accessed, so that importing a
+# single service does not load every other one.
+_LAZY_ATTRIBUTES = {
+    "Recon": ".core.recon",
+    "AsyncCRTShAPI": ".crtsh.api",
+    "CRTShAPI": ".crtsh.api",
+    "AsyncHackerTargetAPI": ".hackertarget.api",
+    "HackerTargetAPI": ".hackertarget.api",
+    "AsyncVirusTotalAPI": ".virustotal.api",
+    "VirusTotalAPI": ".virustotal.api",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    if (module := _LAZY_ATTRIBUTES.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # Skip this function on later accesses
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,237 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import argparse
+import json
+import os
+import sys
+from importlib import import_module
+from itertools import chain
+from typing import Iterable, Iterator, TextIO
+
+from reconlib.core.base import ExternalService
+from reconlib.core.recon import Recon
+
+# Sources selectable from the command line mapped to the module and
+# class implementing them. Modules are only imported when selected.
+SOURCES = {
+    "crtsh": ("reconlib.crtsh.api", "CRTShAPI"),
+    "hackertarget": ("reconlib.hackertarget.api", "HackerTargetAPI"),
+    "virustotal": ("reconlib.virustotal.api", "VirusTotalAPI"),
+}
+DEFAULT_SOURCES = ("crtsh", "hackertarget")
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="reconlib",
+        description="Enumerate the subdomains of many targets from several "
+        "sources in parallel and stream the results as they arrive",
+    )
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        metavar="TARGET",
+        help="Domain names to enumerate. Targets are read from the standard "
+        "input if neither targets nor a file are given.",
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        type=argparse.FileType("r"),
+        help='File containing one target per line ("-" for the standard input)',
+    )
+    parser.add_argument(
+        "-s",
+        "--sources",
+        type=_sources,
+        default=DEFAULT_SOURCES,
+        help=f"Comma-separated list of sources out of {', '.join(SOURCES)} "
+        f"(defaults to {','.join(DEFAULT_SOURCES)})",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of requests in flight for each source (defaults to 4)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        choices=("plain", "ndjson"),
+        default="plain",
+        help='Format of the results: the unique subdomains of each target one '
+        'per line ("plain") or one JSON object per target, source and '
+        'subdomain ("ndjson")',
+    )
+    parser.add_argument(
+        "--api-key",
+        help="VirusTotal API key or path to a file defining it (defaults to "
+        "the VIRUSTOTAL_API_KEY environment variable)",
+    )
+    parser.add_argument(
+        "--journal",
+        help="Path to a progress journal recording the targets already "
+        "enumerated, so that an interrupted run can be resumed",
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("argument -c/--concurrency: must be a positive integer")
+    return args
+
+
+def _sources(value: str) -> tuple[str, ...]:
+    sources = tuple(dict.fromkeys(name.strip().lower() for name in value.split(",")))
+    if unknown := [name for name in sources if name not in SOURCES]:
+        raise argparse.ArgumentTypeError(
+            f"unknown source(s) {', '.join(unknown)}; "
+            f"choose from {', '.join(SOURCES)}"
+        )
+    return sources
+
+
+def read_targets(targets: list[str], file: TextIO = None) -> Iterator[str]:
+    """
+    Lazily read targets given as arguments and from a file, skipping
+    blank lines and comments
+
+    :param targets: Targets given as command-line arguments
+    :param file: A file object containing one target per line. The
+        standard input is read if no targets or file are given.
+    :return: A generator of domain names
+    """
+    if file is None and not targets:
+        file = sys.stdin
+    lines = targets if file is None else chain(targets, file)
+    for line in lines:
+        if (target := line.strip()) and not target.startswith("#"):
+            yield target
+
+
+def build_services(args: argparse.Namespace) -> list[ExternalService]:
+    """
+    Instantiate the sources selected on the command line
+    """
+    journal = None
+    if args.journal is not None:
+        from reconlib.core.journal import ProgressJournal
+
+        journal = ProgressJournal(args.journal)
+    services = []
+    for source in args.sources:
+        module, name = SOURCES[source]
+        cls = getattr(import_module(module), name)
+        kwargs = {"api_key": args.api_key} if source == "virustotal" else {}
+        services.append(cls(journal=journal, **kwargs))
+    return services
+
+
+def enumerate_subdomains(
+    services: Iterable[ExternalService],
+    targets: Iterable[str],
+    output: str = "plain",
+    concurrency: int = 4,
+    stdout: TextIO = None,
+    stderr: TextIO = None,
+) -> int:
+    """
+    Query every service for each target and write new results as soon
+    as they arrive
+
+    :param services: Instances of ExternalService subclasses
+    :param targets: An iterable of domain names
+    :param output: Either "plain" to write each unique subdomain of a
+        target on its own line or "ndjson" to write one JSON object per
+        target, source and subdomain. Subdomains are deduplicated per
+        target only, so that memory usage does not grow with the total
+        output of long runs.
+    :param concurrency: Maximum number of requests in flight for each
+        service
+    :param stdout: File object results are written to
+    :param stderr: File object errors are reported to
+    :return: The number of errors raised by services
+    """
+    stdout = stdout if stdout is not None else sys.stdout
+    stderr = stderr if stderr is not None else sys.stderr
+    recon = Recon(services, concurrency=concurrency)
+    reported = 0
+    for target, source, subdomains in recon.run(targets, retain=False):
+        if output == "ndjson":
+            lines = (
+                json.dumps({"target": target, "source": source, "subdomain": name})
+                for name in sorted(subdomains)
+            )
+        else:  # Recon only yields subdomains not reported for the target
+            lines = sorted(subdomains)
+        for line in lines:
+            stdout.write(f"{line}\n")
+        stdout.flush()
+        reported += _report_errors(recon.errors, stderr)
+    return reported + _report_errors(recon.errors, stderr)
+
+
+def _report_errors(errors: list, stderr: TextIO) -> int:
+    """
+    Write errors to the standard error and discard them
+    :return: The number of errors reported
+    """
+    for source, target, error in errors:
+        stderr.write(f"reconlib: {source} failed for {target}: {error}\n")
+    stderr.flush()
+    count = len(errors)
+    errors.clear()
+    return count
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Entry point of the "reconlib" command
+
+    :param argv: Command-line arguments (defaults to sys.argv)
+    :return: The exit status of the command: 0 on success, 1 if any
+        source failed for any target and 2 on invalid arguments
+    """
+    args = parse_args(argv)
+    try:
+        services = build_services(args)
+    except Exception as e:
+        print(f"reconlib: {e}", file=sys.stderr)
+        return 2
+    try:
+        errors = enumerate_subdomains(
+            services,
+            read_targets(args.targets, args.file),
+            output=args.output,
+            concurrency=args.concurrency,
+        )
+    except BrokenPipeError:
+        # The reading end of the pipeline was closed, as in "| head".
+        # Silence the error Python reports when flushing stdout at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    return 1 if errors else 0
@@ -0,0 +1,164 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import threading
+from ipaddress import (
+    ip_address,
+    ip_network,
+    summarize_address_range,
+    IPv4Network,
+    IPv6Network,
+)
+from pathlib import Path
+from typing import Any, Iterator
+
+
+class ASNCache:
+    def __init__(self):
+        """
+        Local cache mapping IP networks to the autonomous systems that
+        announce them. Networks are kept in one hash table per prefix
+        length, so that finding the longest prefix matching an address
+        takes at most one lookup per distinct prefix length (32 for IPv4
+        and 128 for IPv6).
+        """
+        self._tables = {4: {}, 6: {}}  # Version -> prefix length -> network
+        # Longest prefixes first. Replaced rather than modified, so that
+        # lookups never see a list being sorted by another thread.
+        self._prefix_lengths = {4: (), 6: ()}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, ip_addr: Any) -> bool:
+        return self.lookup(ip_addr) is not None
+
+    def __iter__(self) -> Iterator[tuple[[IPv4Network, IPv6Network], int, str]]:
+        for version in (4, 6):
+            for table in list(self._tables[version].values()):
+                yield from list(table.values())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(networks={len(self)})"
+
+    def add(self, network: Any, asn: int, owner: str = None) -> None:
+        """
+        Add a network announced by an autonomous system to the cache
+
+        :param network: An IPv4/IPv6 network or a string in CIDR notation
+        :param asn: The number of the autonomous system
+        :param owner: The name of the owner of the autonomous system
+        """
+        network = ip_network(network, strict=False)
+        version, prefix_length = network.version, network.prefixlen
+        with self._lock:
+            if (table := self._tables[version].get(prefix_length)) is None:
+                table = self._tables[version][prefix_length] = {}
+                lengths = (*self._prefix_lengths[version], prefix_length)
+                self._prefix_lengths[version] = tuple(sorted(lengths, reverse=True))
+            key = int(network.network_address)
+            self._size += key not in table
+            table[key] = (network, int(asn), owner)
+
+    def lookup(self, ip_addr: Any) -> [dict[str, Any], None]:
+        """
+        Find the most specific network containing an IP address
+
+        :param ip_addr: An IPv4/IPv6 address or its string representation
+        :return: A dictionary in the format returned by the "aslookup"
+            endpoint of HackerTarget, or None if no cached network
+            contains the address
+        """
+        ip_addr = ip_address(ip_addr)
+        value, bits = int(ip_addr), ip_addr.max_prefixlen
+        tables = self._tables[ip_addr.version]
+        for prefix_length in self._prefix_lengths[ip_addr.version]:
+            mask = ((1 << prefix_length) - 1) << (bits - prefix_length)
+            if (entry := tables[prefix_length].get(value & mask)) is not None:
+                network, asn, owner = entry
+                return {
+                    "IP_ADDRESS": ip_addr,
+                    "ASN": asn,
+                    "NETWORK": network,
+                    "OWNER": owner,
+                }
+        return None
+
+    def save(self, file_path: [str, Path]) -> None:
+        """
+        Write every cached network to a tab-separated file that can be
+        read back by the "load" method
+
+        :param file_path: Path of the file to write to
+        """
+        with open(file_path, "w", encoding="utf_8") as file:
+            for network, asn, owner in self:
+                fields = (network, asn) if owner is None else (network, asn, owner)
+                file.write("\t".join(map(str, fields)) + "\n")
+
+    @classmethod
+    def load(cls, file_path: [str, Path]) -> "ASNCache":
+        """
+        Create a cache from a file written by the "save" method or from a
+        prefix-to-ASN dump
+
+        :param file_path: Path of the file to read from
+        :return: A new ASNCache instance
+        """
+        (cache := cls()).import_dump(file_path)
+        return cache
+
+    def import_dump(self, file_path: [str, Path]) -> int:
+        """
+        Add the networks of a local prefix-to-ASN dump to the cache. Each
+        line must contain either a network in CIDR notation or the first
+        and last addresses of a range, followed by the ASN and optionally
+        by the name of its owner as the last field, separated by tabs.
+        Empty lines, lines starting with "#" and ranges of ASN 0 are
+        ignored.
+
+        :param file_path: Path of the dump
+        :return: The number of lines imported
+        """
+        lines = 0
+        with open(file_path, encoding="utf_8") as file:
+            for line in file:
+                if not (line := line.rstrip("\r\n")) or line.startswith("#"):
+                    continue
+                fields = line.split("\t")
+                if "/" in fields[0]:
+                    networks, fields = (fields[0],), fields[1:]
+                else:
+                    first, last = ip_address(fields[0]), ip_address(fields[1])
+                    networks, fields = summarize_address_range(first, last), fields[2:]
+                if (asn := int(fields[0].upper().removeprefix("AS"))) == 0:
+                    continue  # Address space not announced by any ASN
+                owner = fields[-1] if len(fields) > 1 else None
+                for network in networks:
+                    self.add(network, asn, owner)
+                lines += 1
+        return lines
@@ -0,0 +1,642 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import asyncio
+import http.client
+import io
+import socket
+import ssl
+import time
+from collections import defaultdict, deque
+from typing import Awaitable
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+
+from reconlib.core.metrics import RequestTimings
+from reconlib.core.transport import (
+    _REDIRECT_CODES,
+    _absolute_path,
+    _find_proxy,
+    _get_proxies,
+    _origin,
+    _parse_origins,
+    _parse_proxies,
+)
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class _AsyncConnection:
+    """
+    An HTTP(S) connection driven by asyncio streams along with the
+    bookkeeping required to decide whether it can be reused
+    """
+
+    __slots__ = ("reader", "writer", "requests", "last_used", "slot")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.requests = 0
+        self.last_used = time.monotonic()
+        self.slot = None  # Semaphore held while a request is in flight
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class AsyncPooledResponse:
+    """
+    HTTP/1.1 response read incrementally from an asyncio stream. The
+    underlying connection is handed back to its pool once the response
+    is closed.
+    """
+
+    def __init__(
+        self,
+        pool: "AsyncConnectionPool",
+        key: tuple[str, str, int],
+        connection: _AsyncConnection,
+        status: int,
+        reason: str,
+        headers: http.client.HTTPMessage,
+        url: str,
+        method: str,
+        version: str,
+        timings: RequestTimings = None,
+    ):
+        self._pool = pool
+        self._key = key
+        self._connection = connection
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.url = url
+        self.timings = timings
+
+        self._chunked = "chunked" in headers.get("Transfer-Encoding", "").lower()
+        self._remaining = None  # Bytes left in the body or current chunk
+        self._complete = False
+        connection_header = headers.get("Connection", "").lower()
+        self._will_close = connection_header == "close" or (
+            version == "HTTP/1.0" and connection_header != "keep-alive"
+        )
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            self._complete = True
+        elif not self._chunked:
+            if (length := headers.get("Content-Length")) is not None:
+                self._remaining = int(length)
+                self._complete = self._remaining == 0
+            else:  # Body delimited by the server closing the connection
+                self._will_close = True
+
+    async def __aenter__(self) -> "AsyncPooledResponse":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def read(self, amt: int = None) -> bytes:
+        """
+        Read up to "amt" bytes from the response body or the entire
+        remaining body if "amt" is None
+        """
+        if amt is None:
+            buffer = bytearray()
+            while chunk := await self._read_chunk(_CHUNK_SIZE):
+                buffer += chunk
+            return bytes(buffer)
+        return await self._read_chunk(amt)
+
+    async def iter_chunks(self, chunk_size: int = _CHUNK_SIZE):
+        """
+        Asynchronously iterate over the response body in chunks of at
+        most "chunk_size" bytes
+        """
+        while chunk := await self._read_chunk(chunk_size):
+            yield chunk
+
+    async def close(self) -> None:
+        """
+        Release the connection back to the pool if the response body was
+        entirely consumed or discard it otherwise
+        """
+        if self._connection is None:
+            return
+        reusable = self._complete and not self._will_close
+        self._pool._release(self._key, self._connection, reusable)
+        self._connection = None
+
+    async def _read_chunk(self, amt: int) -> bytes:
+        if self._complete or self._connection is None:
+            return b""
+        reader = self._connection.reader
+        if self._chunked:
+            if not self._remaining:
+                size_line = await self._read_line()
+                self._remaining = int(size_line.split(b";", 1)[0].strip(), 16)
+                if self._remaining == 0:
+                    # Consume optional trailers up to the terminating
+                    # empty line
+                    while (await self._read_line()) not in (b"\r\n", b"\n"):
+                        pass
+                    self._complete = True
+                    return b""
+            data = await self._timed(reader.read(min(amt, self._remaining)))
+            if not data:
+                self._will_close = True
+                raise http.client.IncompleteRead(b"")
+            self._remaining -= len(data)
+            if self._remaining == 0:
+                await self._read_line()  # CRLF following each chunk
+            return data
+        if self._remaining is None:  # Read until EOF
+            data = await self._timed(reader.read(amt))
+            self._complete = not data
+            return data
+        data = await self._timed(reader.read(min(amt, self._remaining)))
+        if not data:
+            raise http.client.IncompleteRead(b"", self._remaining)
+        self._remaining -= len(data)
+        self._complete = self._remaining == 0
+        return data
+
+    async def _read_line(self) -> bytes:
+        """
+        Read a line of the framing of a chunked body
+        :raise: IncompleteRead if the connection was closed before the
+            terminating zero-size chunk was received
+        """
+        if not (line := await self._timed(self._connection.reader.readline())):
+            self._will_close = True
+            raise http.client.IncompleteRead(b"")
+        return line
+
+    async def _timed(self, read: Awaitable[bytes]) -> bytes:
+        """
+        Await a read from the connection for no longer than the timeout
+        of the pool, as a socket timeout does for synchronous responses.
+        Connections whose read timed out are not reused.
+        """
+        try:
+            return await asyncio.wait_for(read, self._pool.timeout)
+        except asyncio.TimeoutError:
+            self._will_close = True
+            raise
+
+
+class AsyncConnectionPool:
+    def __init__(
+        self,
+        *,
+        max_connections: int = 100,
+        max_size: int = 10,
+        idle_timeout: float = 30.0,
+        max_requests: int = 100,
+        timeout: float = 30.0,
+        max_redirects: int = 5,
+        ssl_context: ssl.SSLContext = None,
+        origins: dict[str, str] = None,
+        proxies: dict[str, str] = None,
+    ):
+        """
+        Pool of persistent HTTP/1.1 connections driven by asyncio and
+        grouped by scheme, host and port
+
+        :param max_connections: Maximum number of connections open at
+            the same time for each scheme and host. Requests exceeding
+            this number wait for a connection to be released, which
+            bounds memory usage regardless of the number of tasks.
+        :param max_size: Maximum number of idle connections kept open
+            for each scheme and host
+        :param idle_timeout: Number of seconds after which an idle
+            connection is considered stale and is discarded
+        :param max_requests: Maximum number of requests sent through a
+            single connection before it is closed and replaced
+        :param timeout: Timeout in seconds for establishing a connection,
+            sending a request and each read of the response
+        :param max_redirects: Maximum number of HTTP redirects followed
+            for a single request
+        :param ssl_context: SSL context used on HTTPS connections
+            (defaults to the system's default context)
+        :param origins: A dictionary mapping origins, such as
+            "https://crt.sh", to the origins their requests are sent to
+            instead, such as a local mock server
+        :param proxies: A dictionary mapping URL schemes to the URLs of
+            the proxies their requests are sent through, along with an
+            optional "no" key listing the hosts reached directly
+            (defaults to None to read the http_proxy, https_proxy and
+            no_proxy environment variables). HTTPS requests are tunneled
+            through the proxy with the CONNECT method. An empty
+            dictionary disables proxies.
+        """
+        self.max_connections = max_connections
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_requests = max_requests
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.ssl_context = (
+            ssl_context if ssl_context is not None else ssl.create_default_context()
+        )
+        self.origins = _parse_origins(origins)
+        self.proxies = _get_proxies(proxies)
+        self._proxies = _parse_proxies(self.proxies)
+        self._routes = {}
+        self._loop = None
+        self._idle = defaultdict(deque)
+        self._slots = {}
+        self._requests = 0
+        self._opened = 0
+        self._reused = 0
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(max_connections={self.max_connections}, "
+            f"max_size={self.max_size}, idle_timeout={self.idle_timeout}, "
+            f"max_requests={self.max_requests})"
+        )
+
+    @property
+    def statistics(self) -> dict[str, [int, float]]:
+        """
+        A dictionary describing how often connections have been reused
+        """
+        return {
+            "requests": self._requests,
+            "connections_opened": self._opened,
+            "connections_reused": self._reused,
+            "idle_connections": sum(len(idle) for idle in self._idle.values()),
+            "reuse_ratio": self._reused / self._requests if self._requests else 0.0,
+        }
+
+    async def urlopen(
+        self,
+        url: str,
+        headers: dict = None,
+        method: str = "GET",
+        timings: RequestTimings = None,
+    ) -> AsyncPooledResponse:
+        """
+        Send an HTTP request through a pooled connection
+
+        :param url: Absolute URL of the resource to be fetched
+        :param headers: A dictionary of HTTP headers sent with the
+            request
+        :param method: The HTTP method of the request
+        :param timings: A RequestTimings object in which the duration
+            of DNS resolution, connection, TLS handshake and time to
+            first byte are recorded
+        :return: An AsyncPooledResponse object that must be closed (or
+            used as an asynchronous context manager) so that its
+            connection can be reused
+        :raise: urllib.error.HTTPError if the server responds with a
+            status code of 400 or above
+        """
+        headers = headers if headers is not None else {}
+        for _ in range(self.max_redirects + 1):
+            response = await self._send(url, headers, method, timings)
+            if response.status in _REDIRECT_CODES and "Location" in response.headers:
+                await response.read()
+                await response.close()
+                url = urljoin(url, response.headers["Location"])
+                continue
+            if response.status >= 400:
+                body = await response.read()
+                await response.close()
+                raise HTTPError(
+                    url,
+                    response.status,
+                    response.reason,
+                    response.headers,
+                    io.BytesIO(body),
+                )
+            return response
+        raise HTTPError(
+            url, response.status, "Too many redirects", response.headers, None
+        )
+
+    async def close(self) -> None:
+        """
+        Close every idle connection held by the pool
+        """
+        connections = [conn for idle in self._idle.values() for conn in idle]
+        self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+    def _bind_loop(self) -> None:
+        # Connections and semaphores belong to the event loop on which
+        # they were created. Drop them if the pool moved to a new loop.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._idle.clear()
+            self._slots.clear()
+
+    async def _send(
+        self, url: str, headers: dict, method: str, timings: RequestTimings = None
+    ) -> AsyncPooledResponse:
+        self._bind_loop()
+        parts = urlsplit(url)
+        key = _origin(parts)
+        key = self.origins.get(key, key)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        host = parts.netloc.rsplit("@", 1)[-1]
+        if key[0] == "http" and (proxy := self._proxy(key)) is not None:
+            # Plain HTTP requests are forwarded by the proxy itself
+            path = _absolute_path(key, path)
+            headers = {**proxy[2], **headers}
+        request = "".join(
+            (
+                f"{method} {path} HTTP/1.1\r\n",
+                *(
+                    f"{name}: {value}\r\n"
+                    for name, value in {
+                        "Host": host,
+                        "Accept-Encoding": "identity",
+                        **headers,
+                    }.items()
+                ),
+                "\r\n",
+            )
+        ).encode("latin-1")
+
+        if (slots := self._slots.get(key)) is None:
+            slots = self._slots[key] = asyncio.Semaphore(self.max_connections)
+        await slots.acquire()
+        try:
+            connection, reused = await self._acquire(key, timings)
+            try:
+                version, status, reason, response_headers = await self._request(
+                    connection, request, timings
+                )
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection.close()
+                if not reused:
+                    raise
+                # The server closed an idle connection. Retry once on a
+                # freshly opened one.
+                connection, reused = await self._new_connection(key, timings), False
+                version, status, reason, response_headers = await self._request(
+                    connection, request, timings
+                )
+        except BaseException:
+            slots.release()
+            raise
+
+        connection.slot = slots
+        self._requests += 1
+        self._reused += reused
+        return AsyncPooledResponse(
+            self,
+            key,
+            connection,
+            status,
+            reason,
+            response_headers,
+            url,
+            method,
+            version,
+            timings,
+        )
+
+    async def _request(
+        self,
+        connection: _AsyncConnection,
+        request: bytes,
+        timings: RequestTimings = None,
+    ) -> tuple[str, int, str, http.client.HTTPMessage]:
+        sent = time.perf_counter()
+        try:
+            connection.requests += 1
+            connection.writer.write(request)
+            await asyncio.wait_for(connection.writer.drain(), self.timeout)
+            head = await asyncio.wait_for(
+                connection.reader.readuntil(b"\r\n\r\n"), self.timeout
+            )
+        except BaseException:
+            connection.close()
+            raise
+        status_line, _, raw_headers = head.partition(b"\r\n")
+        version, status, *reason = status_line.decode("latin-1").split(" ", 2)
+        if not version.startswith("HTTP/"):
+            connection.close()
+            raise http.client.BadStatusLine(status_line.decode("latin-1"))
+        if timings is not None:
+            timings.ttfb = time.perf_counter() - sent
+            timings.status = int(status)
+        headers = http.client.parse_headers(io.BytesIO(raw_headers))
+        return version, int(status), reason[0] if reason else "", headers
+
+    async def _acquire(
+        self, key: tuple[str, str, int], timings: RequestTimings = None
+    ) -> tuple[_AsyncConnection, bool]:
+        now, idle = time.monotonic(), self._idle[key]
+        while idle:
+            connection = idle.pop()  # Most recently used first
+            if (
+                now - connection.last_used <= self.idle_timeout
+                and not connection.reader.at_eof()
+            ):
+                return connection, True
+            connection.close()
+        return await self._new_connection(key, timings), False
+
+    def _proxy(self, key: tuple[str, str, int]) -> [tuple[str, int, dict], None]:
+        """
+        Find the proxy through which the requests to an origin are sent
+        :return: A tuple containing the host and port of the proxy and
+            the headers authenticating to it or None if the origin is
+            reached directly
+        """
+        try:
+            return self._routes[key]
+        except KeyError:
+            proxy = self._routes[key] = _find_proxy(key, self.proxies, self._proxies)
+            return proxy
+
+    async def _new_connection(
+        self, key: tuple[str, str, int], timings: RequestTimings = None
+    ) -> _AsyncConnection:
+        scheme, host, port = key
+        if (proxy := self._proxy(key)) is not None:
+            opening = self._open_proxied_connection(key, proxy, timings)
+        elif timings is not None:
+            opening = self._timed_open_connection(host, port, scheme, timings)
+        else:
+            opening = asyncio.open_connection(
+                host,
+                port,
+                ssl=self.ssl_context if scheme == "https" else None,
+                server_hostname=host if scheme == "https" else None,
+                limit=_CHUNK_SIZE * 4,
+            )
+        reader, writer = await asyncio.wait_for(opening, self.timeout)
+        self._opened += 1
+        return _AsyncConnection(reader, writer)
+
+    async def _timed_open_connection(
+        self, host: str, port: int, scheme: str, timings: RequestTimings
+    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """
+        Open a connection while recording the duration of DNS
+        resolution, of the TCP connection and of the TLS handshake. The
+        handshake is counted as part of the connection on Python
+        versions whose streams cannot start TLS on an open connection.
+        """
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        addresses = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        timings.dns = time.perf_counter() - start
+
+        tls = scheme == "https"
+        separate_tls = tls and hasattr(asyncio.StreamWriter, "start_tls")
+        start, error = time.perf_counter(), None
+        for *_, sockaddr in addresses:
+            try:
+                reader, writer = await asyncio.open_connection(
+                    sockaddr[0],
+                    port,
+                    ssl=self.ssl_context if tls and not separate_tls else None,
+                    server_hostname=host if tls and not separate_tls else None,
+                    limit=_CHUNK_SIZE * 4,
+                )
+            except OSError as e:
+                error = e
+            else:
+                break
+        else:
+            raise error or OSError(f"No address found for host {host!r}")
+        timings.connect = time.perf_counter() - start
+
+        if separate_tls:
+            start = time.perf_counter()
+            await writer.start_tls(self.ssl_context, server_hostname=host)
+            timings.tls = time.perf_counter() - start
+        return reader, writer
+
+    async def _open_proxied_connection(
+        self,
+        key: tuple[str, str, int],
+        proxy: tuple[str, int, dict],
+        timings: RequestTimings = None,
+    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """
+        Open a connection to a proxy and, for HTTPS origins, tunnel it
+        to the origin with the CONNECT method before starting TLS
+        """
+        scheme, host, port = key
+        proxy_host, proxy_port, proxy_headers = proxy
+        if timings is not None:
+            reader, writer = await self._timed_open_connection(
+                proxy_host, proxy_port, "http", timings
+            )
+        else:
+            reader, writer = await asyncio.open_connection(
+                proxy_host, proxy_port, limit=_CHUNK_SIZE * 4
+            )
+        if scheme != "https":
+            return reader, writer
+        authority = f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+        request = "".join(
+            (
+                f"CONNECT {authority} HTTP/1.1\r\n",
+                *(
+                    f"{name}: {value}\r\n"
+                    for name, value in {"Host": authority, **proxy_headers}.items()
+                ),
+                "\r\n",
+            )
+        ).encode("latin-1")
+        try:
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            _, status, *reason = (
+                head.partition(b"\r\n")[0].decode("latin-1").split(" ", 2)
+            )
+            if status != "200":
+                reason = reason[0].strip() if reason else ""
+                raise OSError(f"Tunnel connection failed: {status} {reason}")
+            start = time.perf_counter()
+            reader, writer = await _start_tls(reader, writer, self.ssl_context, host)
+        except BaseException:
+            writer.close()
+            raise
+        if timings is not None:
+            timings.tls = time.perf_counter() - start
+        return reader, writer
+
+    def _release(
+        self, key: tuple[str, str, int], connection: _AsyncConnection, reusable: bool
+    ) -> None:
+        slot, connection.slot = connection.slot, None
+        if slot is not None:
+            slot.release()
+        if reusable and connection.requests < self.max_requests:
+            connection.last_used = time.monotonic()
+            if len(idle := self._idle[key]) < self.max_size:
+                idle.append(connection)
+                return
+        connection.close()
+
+
+async def _start_tls(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    ssl_context: ssl.SSLContext,
+    host: str,
+) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """
+    Start TLS on an open connection. On Python versions whose streams
+    cannot do so, the transport is upgraded by the event loop and
+    wrapped in a new writer.
+    """
+    if hasattr(asyncio.StreamWriter, "start_tls"):
+        await writer.start_tls(ssl_context, server_hostname=host)
+        return reader, writer
+    loop = asyncio.get_running_loop()
+    protocol = writer.transport.get_protocol()
+    transport = await loop.start_tls(
+        writer.transport, protocol, ssl_context, server_hostname=host
+    )
+    return reader, asyncio.StreamWriter(transport, protocol, reader, loop)
+
+
+_default_pool = None
+
+
+def get_default_async_pool() -> AsyncConnectionPool:
+    """
+    Get the connection pool shared by every AsyncExternalService
+    instance that was not initialized with a pool of its own
+    """
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = AsyncConnectionPool()
+    return _default_pool
@@ -24,22 +24,82 @@ Contact: https://www.twitter.com/eon_raider
 """
 
 import os
+import time
 from abc import ABC, abstractmethod
 from pathlib import Path
-from urllib.request import Request, urlopen
-
-from dotenv import load_dotenv
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    TYPE_CHECKING,
+)
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
 
 from reconlib.core.exceptions import APIKeyError
-from reconlib.core.utils.user_agents import random_user_agent
+from reconlib.core.rate_limit import TokenBucket, get_rate_limiter, parse_retry_after
+from reconlib.core.retry import CircuitBreaker, RetryPolicy
+from reconlib.core.transport import ConnectionPool, PooledResponse, get_default_pool
+from reconlib.core.utils.user_agents import DEFAULT_USER_AGENTS, UserAgentPool
+
+# Optional features are only imported once used, which keeps sqlite3,
+# zlib, csv and concurrent.futures out of the start-up time of programs
+# that do not use them
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Future
+
+    from reconlib.core.async_transport import AsyncPooledResponse
+    from reconlib.core.cache import ResponseCache
+    from reconlib.core.index import SubdomainIndex
+    from reconlib.core.journal import ProgressJournal
+    from reconlib.core.metrics import MetricsRegistry, RequestTimings
+    from reconlib.core.sinks import ResultSink
+    from reconlib.core.snapshots import Snapshot, SnapshotStore, SubdomainDiff
 
 
 class ExternalService(ABC):
     service_name = "Undefined"
+    cache_ttl = 3600  # Seconds a cached response of the service is valid
+    requests_per_minute = None  # Default rate limit shared by all instances
+    # Attributes holding results keyed by target
+    _target_attributes = ("subdomains", "results")
+    _default_transport = staticmethod(get_default_pool)
 
-    def __init__(self, user_agent: str, encoding: str):
+    def __init__(
+        self,
+        user_agent: [str, UserAgentPool],
+        encoding: str,
+        *,
+        transport: ConnectionPool = None,
+        cache: "ResponseCache" = None,
+        rate_limiter: TokenBucket = None,
+        retry_policy: RetryPolicy = None,
+        index: "SubdomainIndex" = None,
+        sink: "ResultSink" = None,
+        journal: "ProgressJournal" = None,
+        metrics: "MetricsRegistry" = None,
+    ):
         self.user_agent = user_agent
         self.encoding = encoding
+        self.transport = (
+            transport if transport is not None else self._default_transport()
+        )
+        self.cache = cache
+        self.rate_limiter = (
+            rate_limiter
+            if rate_limiter is not None
+            else get_rate_limiter(self.service_name, self.requests_per_minute)
+        )
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.index = index
+        self.sink = sink
+        self.journal = journal
+        self.metrics = metrics
 
     def __repr__(self):
         attrs = (f"{attr}={value}" for attr, value in self.__dict__.items())
@@ -66,35 +126,637 @@ class ExternalService(ABC):
         """
         ...
 
+    def fetch_subdomains_many(
+        self,
+        targets: Iterable[str],
+        concurrency: int = 8,
+        *,
+        retain: bool = True,
+        return_exceptions: bool = False,
+    ) -> Iterator[tuple[str, [set[str], Exception]]]:
+        """
+        Fetch the subdomains of many targets concurrently and yield the
+        results of each target as soon as they are available
+
+        :param targets: An iterable of domain names. Targets are consumed
+            lazily so that no more than twice as many targets as the
+            number of concurrent requests are held at any given time.
+        :param concurrency: Maximum number of targets queried at the
+            same time
+        :param retain: Keep the results of each target in the instance
+            attributes after they are yielded. Setting it to False bounds
+            memory usage on very long runs.
+        :param return_exceptions: Yield the exception raised for a target
+            in place of its subdomains instead of raising it
+        :return: A generator of tuples containing a target and its set
+            of subdomains
+        """
+        for target, future in self._map_concurrently(
+            self._fetch_journaled, targets, concurrency
+        ):
+            yield self._batch_result(target, future, retain, return_exceptions)
+
+    def _fetch_journaled(self, target: str) -> set[str]:
+        """
+        Fetch the subdomains of a target unless the progress journal of
+        the service records them as already fetched, in which case they
+        are restored from the journal
+        """
+        if self.journal is None:
+            return self.fetch_subdomains(target)
+        if (names := self._restore_journaled(target)) is not None:
+            return names
+        errors = self._error_count(target)
+        names = self.fetch_subdomains(target)
+        if self._error_count(target) == errors:
+            self.journal.complete(self.service_name, "subdomains", target, names)
+        return names
+
+    def _error_count(self, target: str) -> int:
+        """
+        Number of errors recorded by the service for a target. Targets
+        whose fetch recorded new errors are left pending in the progress
+        journal so that the next run queries them again.
+        """
+        return 0
+
+    def _restore_journaled(self, target: str) -> [set[str], None]:
+        names = self.journal.result(self.service_name, "subdomains", target)
+        if names is None:
+            return None
+        self.subdomains[target].update(names)
+        return self.subdomains[target]
+
+    def _map_concurrently(
+        self, function: Callable, items: Iterable, concurrency: int
+    ) -> Iterator[tuple[Any, "Future"]]:
+        """
+        Call a function with each item of an iterable in a pool of
+        threads and yield each item along with the future of its call as
+        soon as the call is done. Items are consumed lazily so that no
+        more than twice as many items as the number of threads are held
+        at any given time.
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        items, pending = iter(items), {}
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix=f"{self.service_name}-worker"
+        ) as executor:
+            try:
+                while True:
+                    for item in items:
+                        pending[executor.submit(function, item)] = item
+                        if len(pending) >= 2 * concurrency:
+                            break
+                    if not pending:
+                        return
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _batch_result(
+        self, target: str, future, retain: bool, return_exceptions: bool
+    ) -> tuple[str, [set[str], Exception]]:
+        """
+        Unwrap the result of a target fetched by fetch_subdomains_many
+        """
+        if (error := future.exception()) is not None:
+            if not return_exceptions:
+                raise error
+            result = error
+        else:
+            result = future.result()
+        if not retain:
+            self.discard(target)
+        return target, result
+
+    def discard(self, target: str) -> None:
+        """
+        Remove every result stored for a given target
+
+        :param target: A domain name previously queried
+        """
+        for attribute in self._target_attributes:
+            getattr(self, attribute).pop(target, None)
+
+    def diff_subdomains(
+        self, target: str, store: "SnapshotStore", *, save: bool = True
+    ) -> "SubdomainDiff":
+        """
+        Fetch the subdomains of a target and compare them with the ones
+        found by the last run, as kept in a snapshot store. Any result
+        previously stored in the instance for the target is discarded.
+
+        :param target: A domain name to search for in the service's API
+        :param store: The SnapshotStore holding the last snapshot
+        :param save: Replace the snapshot with the subdomains found
+        :return: The subdomains added and removed since the last run
+        """
+        snapshot = store.load(self.service_name, target)
+        names, watermark, incremental = self._fetch_since(target, snapshot)
+        return store.diff(
+            self.service_name,
+            target,
+            names,
+            watermark=watermark,
+            incremental=incremental,
+            save=save,
+            snapshot=snapshot,
+        )
+
+    def _fetch_since(
+        self, target: str, snapshot: "Snapshot"
+    ) -> tuple[set[str], [int, None], bool]:
+        """
+        Fetch the subdomains of a target for comparison with a snapshot.
+        Services able to skip items already seen by the last run return
+        only the subdomains of newer items.
+
+        :return: A tuple containing the subdomains found, the highest
+            identifier of the items seen and whether the subdomains were
+            found only among items newer than the snapshot
+        """
+        self.discard(target)
+        return self.fetch_subdomains(target), None, False
+
+    def _record_subdomains(self, target: str, subdomains: Iterable[str]) -> None:
+        """
+        Write new subdomains found for a target into the shared index
+        and the result sink, if the service was given any of them
+        """
+        if self.index is not None:
+            subdomains = tuple(subdomains)
+            self.index.update(subdomains, source=self.service_name, target=target)
+        if self.sink is not None:
+            for subdomain in subdomains:
+                self._emit(target, "subdomain", subdomain)
+
+    def _emit(self, target: str, kind: str, name: Any, value: Any = None, **extra):
+        """
+        Write a single result to the result sink, if the service was
+        given one
+
+        :param target: The target the result was found for
+        :param kind: The type of the result, such as "subdomain"
+        :param name: The name of the result
+        :param value: The value associated with the name, if any
+        :param extra: Any additional fields of the result
+        """
+        if self.sink is not None:
+            self.sink.write(
+                {
+                    "service": self.service_name,
+                    "target": target,
+                    "type": kind,
+                    "name": name,
+                    "value": value,
+                    **extra,
+                }
+            )
+
     def _query_service(self, url: str, headers: dict = None) -> str:
         """
         Send an HTTP GET request to an external service
         :return: A string containing the service's response
         """
-        # Build a User-Agent header from a user-supplied value or get a
-        # random agent
-        ua_header = {
-            "User-Agent": self.user_agent
-            if self.user_agent is not None
-            else random_user_agent()
-        }
+        return self._fetch(url, headers).decode(self.encoding)
+
+    def _fetch(self, url: str, headers: dict = None) -> bytes:
+        """
+        Send an HTTP GET request to an external service through a pooled
+        keep-alive connection
+        :return: The raw bytes of the service's response body
+        """
+        cache_key, body = self._get_cached(url, headers)
+        if body is None:
+            with self._open(url, headers) as response:
+                if response.timings is None:
+                    body = response.read()
+                else:
+                    start = time.perf_counter()
+                    body = response.read()
+                    self._request_finished(response.timings, start, len(body))
+            if self._is_cacheable(body):
+                self._set_cached(cache_key, body)
+        return body
+
+    def _stream_service(
+        self, url: str, headers: dict = None, chunk_size: int = 64 * 1024
+    ) -> Iterator[bytes]:
+        """
+        Send an HTTP GET request to an external service and read the
+        response body incrementally
+        :return: A generator of byte strings of at most "chunk_size"
+            bytes each
+        """
+        # Streamed responses are served from the cache when present but
+        # are never stored in it, as that would require buffering them
+        if (body := self._get_cached(url, headers)[1]) is not None:
+            yield body
+            return
+        with self._open(url, headers) as response:
+            if (timings := response.timings) is None:
+                while chunk := response.read(chunk_size):
+                    yield chunk
+                return
+            # Only the time spent reading counts towards the download
+            timings.download = 0.0
+            while True:
+                start = time.perf_counter()
+                chunk = response.read(chunk_size)
+                timings.download += time.perf_counter() - start
+                if not chunk:
+                    break
+                timings.bytes += len(chunk)
+                yield chunk
+            self.metrics.request_finished(timings)
+
+    def _open(self, url: str, headers: dict = None) -> PooledResponse:
+        """
+        Send an HTTP GET request to an external service once the rate
+        limiter allows it. Failed requests are retried according to the
+        retry policy of the service.
+        :return: A response object whose body has not been read yet
+        :raise: ServiceUnavailableError if the circuit breaker of the
+            host is open
+        """
+        parts = urlsplit(url)
+        headers = self._build_headers(headers, parts.hostname)
+        breaker = self.retry_policy.circuit_breaker(parts.netloc)
+        attempt, timings = 0, None
+        while True:
+            breaker.before_request()
+            self.rate_limiter.acquire()
+            if self.metrics is not None:
+                timings = self._request_started(url)
+            try:
+                response = self.transport.urlopen(url, headers, timings=timings)
+            except Exception as e:
+                if timings is not None:
+                    self.metrics.request_finished(timings, e)
+                if (delay := self._retry_delay(e, attempt, breaker)) is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+            else:
+                breaker.record_success()
+                return response
+
+    def _request_started(self, url: str) -> "RequestTimings":
+        """
+        Call the hooks run before a request is sent
+        :return: The RequestTimings object to be filled in by the
+            transport
+        """
+        return self.metrics.request_started(
+            self.service_name, self._endpoint_name(url), url
+        )
+
+    def _request_finished(
+        self, timings: "RequestTimings", download_start: float, size: int
+    ) -> None:
+        """
+        Record a request whose response body was entirely read
+        """
+        timings.download = time.perf_counter() - download_start
+        timings.bytes = size
+        self.metrics.request_finished(timings)
+
+    def _endpoint_name(self, url: str) -> str:
+        """
+        Name of the endpoint of the service that a URL points to, as
+        used in metrics
+        """
+        return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1] or "/"
+
+    def _retry_delay(
+        self, error: Exception, attempt: int, breaker: CircuitBreaker
+    ) -> [float, None]:
+        """
+        Record a failed request and decide whether it must be retried
+        :return: The number of seconds to wait before retrying or None
+            if the error must be raised
+        """
+        throttled = isinstance(error, HTTPError) and error.code == 429
+        if self.retry_policy.is_retryable(error) and not throttled:
+            breaker.record_failure()
+        else:  # The host is up even though the request failed
+            breaker.record_success()
+        if not self.retry_policy.should_retry(error, attempt):
+            return None
+        if throttled:
+            # Hold back every request to the service for the delay set
+            # by the Retry-After header. The rate limiter enforces it.
+            self.rate_limiter.penalize(
+                parse_retry_after(
+                    error.headers.get("Retry-After"),
+                    self.retry_policy.backoff(attempt),
+                )
+            )
+            return 0.0
+        return self.retry_policy.backoff(attempt)
+
+    def _get_cached(self, url: str, headers: dict = None) -> tuple[str, bytes]:
+        """
+        Look up a response in the cache
+        :return: A tuple containing the cache key of the request and the
+            cached response body or None if absent or if caching is off
+        """
+        if self.cache is None:
+            return "", None
+        from reconlib.core.cache import make_cache_key
+
+        key = make_cache_key(url, headers)
+        return key, self.cache.get(key)
+
+    def _is_cacheable(self, body: bytes) -> bool:
+        """
+        Decide whether a response body may be stored in the cache.
+        Services whose APIs send error messages with a 200 status code
+        override it so that such messages are not replayed for the
+        whole TTL of the cache.
+        """
+        return True
+
+    def _set_cached(self, cache_key: str, body: bytes) -> None:
+        """
+        Store a response in the cache with the TTL set for the service
+        """
+        if self.cache is not None:
+            ttl = self.cache.ttl_for(self.service_name, self.cache_ttl)
+            self.cache.set(cache_key, body, ttl)
+
+    def _build_headers(self, headers: dict = None, host: str = None) -> dict:
+        """
+        Merge a User-Agent header with any supplied additional headers
+        """
+        # Build a User-Agent header from a user-supplied value or select
+        # an agent from a pool
+        if isinstance(user_agent := self.user_agent, str):
+            ua_header = {"User-Agent": user_agent}
+        else:
+            pool = user_agent if user_agent is not None else DEFAULT_USER_AGENTS
+            ua_header = {"User-Agent": pool.select(host)}
 
         # Merge the User-Agent header with any supplied additional values
-        headers = {**headers, **ua_header} if headers is not None else ua_header
+        return {**headers, **ua_header} if headers is not None else ua_header
+
+
+def _get_default_async_pool():
+    # asyncio and the asyncio transport are only imported once an
+    # asynchronous service is created, which keeps them out of the
+    # start-up time of synchronous programs
+    from reconlib.core.async_transport import get_default_async_pool
+
+    return get_default_async_pool()
+
+
+class AsyncExternalService(ExternalService, ABC):
+    """
+    Base class for services that send their requests through an asyncio
+    connection pool. Subclasses expose coroutines in place of the
+    blocking methods of their synchronous counterparts.
+    """
+
+    _default_transport = staticmethod(_get_default_async_pool)
+
+    async def fetch_subdomains_many(
+        self,
+        targets: [Iterable[str], AsyncIterable[str]],
+        concurrency: int = 100,
+        *,
+        retain: bool = True,
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[tuple[str, [set[str], Exception]]]:
+        """
+        Fetch the subdomains of many targets concurrently and yield the
+        results of each target as soon as they are available
+
+        :param targets: An iterable or asynchronous iterable of domain
+            names. Targets are consumed lazily so that no more than
+            "concurrency" targets are held at any given time.
+        :param concurrency: Maximum number of targets queried at the
+            same time
+        :param retain: Keep the results of each target in the instance
+            attributes after they are yielded. Setting it to False bounds
+            memory usage on very long runs.
+        :param return_exceptions: Yield the exception raised for a target
+            in place of its subdomains instead of raising it
+        :return: An asynchronous generator of tuples containing a target
+            and its set of subdomains
+        """
+        async for target, task in self._map_concurrently(
+            self._fetch_journaled, targets, concurrency
+        ):
+            yield self._batch_result(target, task, retain, return_exceptions)
+
+    async def _fetch_journaled(self, target: str) -> set[str]:
+        if self.journal is None:
+            return await self.fetch_subdomains(target)
+        if (names := self._restore_journaled(target)) is not None:
+            return names
+        errors = self._error_count(target)
+        names = await self.fetch_subdomains(target)
+        if self._error_count(target) == errors:
+            self.journal.complete(self.service_name, "subdomains", target, names)
+        return names
+
+    async def _map_concurrently(
+        self,
+        function: Callable[..., Awaitable],
+        items: [Iterable, AsyncIterable],
+        concurrency: int,
+    ) -> AsyncIterator[tuple[Any, "asyncio.Task"]]:
+        """
+        Await a coroutine function with each item of an iterable or
+        asynchronous iterable in its own task and yield each item along
+        with its task as soon as the task is done. No more than
+        "concurrency" tasks are run at any given time.
+        """
+        import asyncio
+
+        items = (
+            aiter(items)
+            if isinstance(items, AsyncIterable)
+            else _as_async_iterator(items)
+        )
+        pending, exhausted = {}, False
+        try:
+            while True:
+                while not exhausted and len(pending) < concurrency:
+                    if (item := await anext(items, None)) is None:
+                        exhausted = True
+                        break
+                    pending[asyncio.create_task(function(item))] = item
+                if not pending:
+                    return
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield pending.pop(task), task
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def diff_subdomains(
+        self, target: str, store: "SnapshotStore", *, save: bool = True
+    ) -> "SubdomainDiff":
+        """
+        Fetch the subdomains of a target and compare them with the ones
+        found by the last run, as kept in a snapshot store. Any result
+        previously stored in the instance for the target is discarded.
+
+        :param target: A domain name to search for in the service's API
+        :param store: The SnapshotStore holding the last snapshot
+        :param save: Replace the snapshot with the subdomains found
+        :return: The subdomains added and removed since the last run
+        """
+        snapshot = store.load(self.service_name, target)
+        names, watermark, incremental = await self._fetch_since(target, snapshot)
+        return store.diff(
+            self.service_name,
+            target,
+            names,
+            watermark=watermark,
+            incremental=incremental,
+            save=save,
+            snapshot=snapshot,
+        )
+
+    async def _fetch_since(
+        self, target: str, snapshot: "Snapshot"
+    ) -> tuple[set[str], [int, None], bool]:
+        self.discard(target)
+        return await self.fetch_subdomains(target), None, False
+
+    async def _query_service(self, url: str, headers: dict = None) -> str:
+        """
+        Send an HTTP GET request to an external service without blocking
+        the event loop
+        :return: A string containing the service's response
+        """
+        return (await self._fetch(url, headers)).decode(self.encoding)
 
-        with urlopen(Request(url=url, data=None, headers=headers)) as response:
-            return response.read().decode(self.encoding)
+    async def _fetch(self, url: str, headers: dict = None) -> bytes:
+        """
+        Send an HTTP GET request to an external service through a pooled
+        asyncio connection
+        :return: The raw bytes of the service's response body
+        """
+        cache_key, body = self._get_cached(url, headers)
+        if body is None:
+            async with await self._open(url, headers) as response:
+                if response.timings is None:
+                    body = await response.read()
+                else:
+                    start = time.perf_counter()
+                    body = await response.read()
+                    self._request_finished(response.timings, start, len(body))
+            if self._is_cacheable(body):
+                self._set_cached(cache_key, body)
+        return body
+
+    async def _stream_service(
+        self, url: str, headers: dict = None, chunk_size: int = 64 * 1024
+    ) -> AsyncIterator[bytes]:
+        """
+        Send an HTTP GET request to an external service and read the
+        response body incrementally without blocking the event loop
+        :return: An asynchronous generator of byte strings of at most
+            "chunk_size" bytes each
+        """
+        if (body := self._get_cached(url, headers)[1]) is not None:
+            yield body
+            return
+        async with await self._open(url, headers) as response:
+            if (timings := response.timings) is None:
+                async for chunk in response.iter_chunks(chunk_size):
+                    yield chunk
+                return
+            timings.download = 0.0
+            while True:
+                start = time.perf_counter()
+                chunk = await response.read(chunk_size)
+                timings.download += time.perf_counter() - start
+                if not chunk:
+                    break
+                timings.bytes += len(chunk)
+                yield chunk
+            self.metrics.request_finished(timings)
+
+    async def _open(self, url: str, headers: dict = None) -> "AsyncPooledResponse":
+        """
+        Send an HTTP GET request to an external service once the rate
+        limiter allows it. Failed requests are retried according to the
+        retry policy of the service.
+        :return: A response object whose body has not been read yet
+        :raise: ServiceUnavailableError if the circuit breaker of the
+            host is open
+        """
+        import asyncio
+
+        parts = urlsplit(url)
+        headers = self._build_headers(headers, parts.hostname)
+        breaker = self.retry_policy.circuit_breaker(parts.netloc)
+        attempt, timings = 0, None
+        while True:
+            breaker.before_request()
+            await self.rate_limiter.acquire_async()
+            if self.metrics is not None:
+                timings = self._request_started(url)
+            try:
+                response = await self.transport.urlopen(url, headers, timings=timings)
+            except Exception as e:
+                if timings is not None:
+                    self.metrics.request_finished(timings, e)
+                if (delay := self._retry_delay(e, attempt, breaker)) is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+            else:
+                breaker.record_success()
+                return response
+
+
+async def _as_async_iterator(iterable: Iterable) -> AsyncIterator:
+    for item in iterable:
+        yield item
 
 
 class AuthenticatedExternalService(ExternalService, ABC):
     def __init__(
         self,
-        user_agent: str,
+        user_agent: [str, UserAgentPool],
         encoding: str,
         api_key: [str, Path],
         api_key_env_name: str,
+        *,
+        transport: ConnectionPool = None,
+        cache: "ResponseCache" = None,
+        rate_limiter: TokenBucket = None,
+        retry_policy: RetryPolicy = None,
+        index: "SubdomainIndex" = None,
+        sink: "ResultSink" = None,
+        journal: "ProgressJournal" = None,
+        metrics: "MetricsRegistry" = None,
     ):
-        super().__init__(user_agent, encoding)
+        super().__init__(
+            user_agent,
+            encoding,
+            transport=transport,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            index=index,
+            sink=sink,
+            journal=journal,
+            metrics=metrics,
+        )
         self.api_key_env_name = api_key_env_name
         self.api_key = api_key
 
@@ -116,6 +778,10 @@ class AuthenticatedExternalService(ExternalService, ABC):
         """
         if value is not None:
             if (file_path := Path(value)).is_file():  # Read API key from file
+                # Imported here so that python-dotenv is only loaded by
+                # instances reading their API key from a file
+                from dotenv import load_dotenv
+
                 load_dotenv(file_path, override=True)
                 self._api_key = os.environ.get(self.api_key_env_name)
             else:  # Read API key as an assigned string value
@@ -0,0 +1,276 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Headers that do not change the contents of a response and must not be
+# part of a cache key
+_IGNORED_HEADERS = frozenset({"user-agent", "accept-encoding", "connection"})
+
+
+def make_cache_key(url: str, headers: dict = None) -> str:
+    """
+    Build a cache key from a URL normalized to a canonical form and the
+    headers that may affect the contents of a response
+
+    :param url: The URL of the request
+    :param headers: A dictionary of HTTP headers sent with the request
+    :return: A hexadecimal digest identifying the request
+    """
+    parts = urlsplit(url)
+    normalized = urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path or "/",
+            urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True))),
+            "",
+        )
+    )
+    relevant = sorted(
+        (name.lower(), str(value))
+        for name, value in (headers or {}).items()
+        if name.lower() not in _IGNORED_HEADERS
+    )
+    digest = hashlib.sha256(normalized.encode())
+    for name, value in relevant:
+        digest.update(f"\n{name}:{value}".encode())
+    return digest.hexdigest()
+
+
+class ResponseCache(ABC):
+    def __init__(self, ttl: dict[str, float] = None):
+        """
+        Base class for caches of responses from external services
+
+        :param ttl: A dictionary mapping service names to the number of
+            seconds their responses remain valid, overriding the
+            "cache_ttl" attribute of each service
+        """
+        self.ttl = ttl if ttl is not None else {}
+        self.hits = 0
+        self.misses = 0
+
+    def ttl_for(self, service_name: str, default: float) -> float:
+        """
+        Get the number of seconds a response from a service is valid for
+        """
+        return self.ttl.get(service_name, default)
+
+    def get(self, key: str) -> [bytes, None]:
+        """
+        Get a cached response that has not expired yet
+
+        :param key: A key built by make_cache_key
+        :return: The cached response body or None if absent or expired
+        """
+        value = self._get(key, time.time())
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """
+        Store a response in the cache
+
+        :param key: A key built by make_cache_key
+        :param value: The response body
+        :param ttl: Number of seconds the response remains valid
+        """
+        if ttl > 0:
+            self._set(key, value, time.time() + ttl)
+
+    @abstractmethod
+    def _get(self, key: str, now: float) -> [bytes, None]: ...
+
+    @abstractmethod
+    def _set(self, key: str, value: bytes, expires: float) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache
+        """
+
+
+class MemoryCache(ResponseCache):
+    def __init__(
+        self, *, max_entries: int = 1024, max_bytes: int = None, ttl: dict = None
+    ):
+        """
+        Thread-safe in-memory cache of responses evicting the least
+        recently used entries first
+
+        :param max_entries: Maximum number of responses kept in memory
+        :param max_bytes: Maximum combined size in bytes of the cached
+            responses (defaults to None for no limit)
+        :param ttl: A dictionary mapping service names to the number of
+            seconds their responses remain valid
+        """
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key: str, now: float) -> [bytes, None]:
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return None
+            value, expires = entry
+            if expires <= now:
+                del self._entries[key]
+                self._size -= len(value)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: bytes, expires: float) -> None:
+        with self._lock:
+            if (previous := self._entries.pop(key, None)) is not None:
+                self._size -= len(previous[0])
+            self._entries[key] = (value, expires)
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._size > self.max_bytes
+            ):
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class SQLiteCache(ResponseCache):
+    def __init__(
+        self, path: [str, Path], *, max_bytes: int = 256 * 2**20, ttl: dict = None
+    ):
+        """
+        Thread-safe on-disk cache of responses backed by a SQLite
+        database. Entries survive process restarts and the least
+        recently used ones are evicted first once the database grows
+        beyond a given size.
+
+        :param path: Path to the SQLite database file. It is created if
+            it does not exist.
+        :param max_bytes: Maximum combined size in bytes of the cached
+            responses
+        :param ttl: A dictionary mapping service names to the number of
+            seconds their responses remain valid
+        """
+        super().__init__(ttl)
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "expires REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)"
+            )
+        self._size = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _get(self, key: str, now: float) -> [bytes, None]:
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT value, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._delete_where("key = ?", key)
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            return row[0]
+
+    def _set(self, key: str, value: bytes, expires: float) -> None:
+        with self._lock, self._db:
+            self._delete_where("key = ?", key)
+            self._db.execute(
+                "INSERT INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), expires, time.time()),
+            )
+            self._size += len(value)
+            if self._size > self.max_bytes:
+                self._delete_where("expires <= ?", time.time())
+            if self._size > self.max_bytes:
+                # Delete the least recently accessed entries until the
+                # combined size of the remaining ones fits the limit
+                self._delete_where(
+                    "key IN (SELECT key FROM (SELECT key, SUM(size) OVER "
+                    "(ORDER BY accessed DESC, key) AS running FROM responses) "
+                    "WHERE running > ?)",
+                    self.max_bytes,
+                )
+
+    def _delete_where(self, condition: str, *params) -> None:
+        freed = self._db.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM responses WHERE {condition}", params
+        ).fetchone()[0]
+        self._db.execute(f"DELETE FROM responses WHERE {condition}", params)
+        self._size -= freed
+
+    def clear(self) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+            self._size = 0
+
+    def close(self) -> None:
+        """
+        Close the connection to the database
+        """
+        with self._lock:
+            self._db.close()
@@ -34,3 +34,18 @@ class InvalidTargetError(ReconLibException):
 class APIKeyError(ReconLibException):
     def __init__(self, message: str, code: int = 1):
         super().__init__(message, code)
+
+
+class ServiceUnavailableError(ReconLibException):
+    def __init__(self, message: str, code: int = 1):
+        super().__init__(message, code)
+
+
+class ServiceResponseError(ReconLibException):
+    def __init__(self, message: str, code: int = 1):
+        super().__init__(message, code)
+
+
+class QuotaExceededError(ServiceResponseError):
+    def __init__(self, message: str, code: int = 1):
+        super().__init__(message, code)
@@ -0,0 +1,213 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import threading
+from typing import Iterable, Iterator, Optional
+
+
+class _Node:
+    __slots__ = ("children", "sources", "targets")
+
+    def __init__(self):
+        self.children = None  # Mapping of labels to child nodes
+        self.sources = 0  # Bitmask of the sources a name was found by
+        # Identifier of the target a name was found for, or a set of
+        # identifiers if it was found for several targets
+        self.targets = None
+
+
+class SubdomainIndex:
+    def __init__(self):
+        """
+        Index of subdomains shared by any number of services and
+        targets. Names are stored in a trie keyed by their labels in
+        reverse order ("www.example.com" is stored under "com",
+        "example" and "www"), so that inserting or looking up a name
+        takes time proportional to its number of labels and every name
+        under a given zone can be enumerated without scanning the whole
+        index. Labels are interned, the sources of each name are
+        recorded as a bitmask and its targets as interned identifiers,
+        so that the memory taken by each name does not grow with the
+        number of targets in the index.
+        """
+        self._root = _Node()
+        self._labels = {}
+        self._sources = {}
+        self._targets = {}  # Mapping of targets to their identifiers
+        self._target_names = []  # Targets indexed by their identifiers
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, name: str) -> bool:
+        return (node := self._find(name)) is not None and node.sources != 0
+
+    def __iter__(self) -> Iterator[str]:
+        return (".".join(reversed(labels)) for labels in self._walk(self._root, []))
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(names={len(self)}, "
+            f"sources={len(self._sources)}, targets={len(self._targets)})"
+        )
+
+    def add(self, name: str, source: str = "", target: str = None) -> bool:
+        """
+        Add a name to the index
+
+        :param name: A fully qualified domain name
+        :param source: The name of the service by which the name was
+            found
+        :param target: The target for which the name was found
+        :return: True if the name was not previously in the index
+        """
+        labels = self._split(name)
+        with self._lock:
+            node = self._root
+            for label in labels:
+                if node.children is None:
+                    node.children = {}
+                if (child := node.children.get(label)) is None:
+                    label = self._labels.setdefault(label, label)
+                    child = node.children[label] = _Node()
+                node = child
+            is_new = node.sources == 0
+            node.sources |= self._bit(self._sources, source)
+            if target is not None:
+                self._add_target(node, target)
+            self._size += is_new
+        return is_new
+
+    def update(self, names: Iterable[str], source: str = "", target: str = None) -> int:
+        """
+        Add many names found by the same source for the same target
+
+        :return: The number of names not previously in the index
+        """
+        return sum(self.add(name, source, target) for name in names)
+
+    def sources(self, name: str) -> set[str]:
+        """
+        Get the names of the services by which a name was found
+
+        :param name: A fully qualified domain name
+        """
+        node = self._find(name)
+        return set() if node is None else self._decode(self._sources, node.sources)
+
+    def targets(self, name: str) -> set[str]:
+        """
+        Get the targets for which a name was found
+
+        :param name: A fully qualified domain name
+        """
+        if (node := self._find(name)) is None or node.targets is None:
+            return set()
+        if isinstance(node.targets, int):
+            return {self._target_names[node.targets]}
+        return {self._target_names[target_id] for target_id in node.targets}
+
+    def zone(self, domain: str, *, source: str = None) -> Iterator[str]:
+        """
+        Enumerate every name under a domain. A domain starting with "*."
+        yields only the names below it, excluding the domain itself.
+
+        :param domain: A domain name such as "example.com" or
+            "*.api.example.com"
+        :param source: Yield only the names found by this service
+        :return: A generator of domain names
+        """
+        include_apex = not domain.startswith("*.")
+        labels = self._split(domain.removeprefix("*."))
+        if (node := self._find_labels(labels)) is None:
+            return
+        if source is not None:
+            if (mask := self._sources.get(source)) is None:
+                return
+        else:
+            mask = -1
+        for name in self._walk(node, labels, mask):
+            if include_apex or len(name) > len(labels):
+                yield ".".join(reversed(name))
+
+    def _walk(
+        self, node: _Node, labels: list[str], mask: int = -1
+    ) -> Iterator[list[str]]:
+        """
+        Yield the labels, from the top-level domain down, of every name
+        at or below a node that was found by any of the sources in a
+        bitmask
+        """
+        stack = [(node, labels)]
+        while stack:
+            node, labels = stack.pop()
+            if node.sources & mask:
+                yield labels
+            if node.children:
+                stack.extend(
+                    (child, labels + [label]) for label, child in node.children.items()
+                )
+
+    def _find(self, name: str) -> Optional[_Node]:
+        return self._find_labels(self._split(name))
+
+    def _find_labels(self, labels: list[str]) -> Optional[_Node]:
+        node = self._root
+        for label in labels:
+            if not node.children or (node := node.children.get(label)) is None:
+                return None
+        return node
+
+    @staticmethod
+    def _split(name: str) -> list[str]:
+        return name.lower().rstrip(".").split(".")[::-1]
+
+    def _add_target(self, node: _Node, target: str) -> None:
+        """
+        Record a target for the name of a node, storing a single
+        identifier for names found for only one target
+        """
+        if (target_id := self._targets.get(target)) is None:
+            target_id = self._targets[target] = len(self._target_names)
+            self._target_names.append(target)
+        if node.targets is None:
+            node.targets = target_id
+        elif isinstance(node.targets, int):
+            if node.targets != target_id:
+                node.targets = {node.targets, target_id}
+        else:
+            node.targets.add(target_id)
+
+    @staticmethod
+    def _bit(registry: dict[str, int], key: str) -> int:
+        if (bit := registry.get(key)) is None:
+            bit = registry[key] = 1 << len(registry)
+        return bit
+
+    @staticmethod
+    def _decode(registry: dict[str, int], mask: int) -> set[str]:
+        return {key for key, bit in registry.items() if mask & bit}
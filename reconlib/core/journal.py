@@ -0,0 +1,175 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import json
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Iterable
+
+
+def _pack(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, default=str).encode("utf_8"), 1)
+
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob).decode("utf_8"))
+
+
+class ProgressJournal:
+    def __init__(self, path: [str, Path]):
+        """
+        Durable record of the progress of long sweeps. Every completed
+        (service, endpoint, target) tuple is stored along with its
+        result, so that a restarted sweep can skip finished work, and the
+        pages of paginated results are checkpointed as they arrive, so
+        that an interrupted pagination can resume from its last cursor.
+
+        :param path: Path to the SQLite database file. It is created if
+            it does not exist.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS completed ("
+                "service TEXT NOT NULL, endpoint TEXT NOT NULL, target TEXT NOT NULL, "
+                "result BLOB NOT NULL, PRIMARY KEY (service, endpoint, target))"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "service TEXT NOT NULL, target TEXT NOT NULL, page INTEGER NOT NULL, "
+                "cursor TEXT, result BLOB NOT NULL, "
+                "PRIMARY KEY (service, target, page))"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM completed").fetchone()[0]
+
+    def complete(self, service: str, endpoint: str, target: str, result: Any) -> None:
+        """
+        Record a finished (service, endpoint, target) tuple and discard
+        any page checkpointed for it
+
+        :param service: The name of the service
+        :param endpoint: The name of the endpoint or operation
+        :param target: The target queried
+        :param result: A JSON-serializable result. Sets are stored as
+            lists.
+        """
+        if isinstance(result, (set, frozenset)):
+            result = list(result)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO completed VALUES (?, ?, ?, ?)",
+                (service, endpoint, target, _pack(result)),
+            )
+            self._db.execute(
+                "DELETE FROM pages WHERE service = ? AND target = ?", (service, target)
+            )
+
+    def result(self, service: str, endpoint: str, target: str) -> Any:
+        """
+        Get the result of a finished (service, endpoint, target) tuple
+
+        :return: The stored result, or None if the tuple is not finished
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM completed "
+                "WHERE service = ? AND endpoint = ? AND target = ?",
+                (service, endpoint, target),
+            ).fetchone()
+        return None if row is None else _unpack(row[0])
+
+    def is_complete(self, service: str, endpoint: str, target: str) -> bool:
+        with self._lock:
+            return (
+                self._db.execute(
+                    "SELECT 1 FROM completed "
+                    "WHERE service = ? AND endpoint = ? AND target = ?",
+                    (service, endpoint, target),
+                ).fetchone()
+                is not None
+            )
+
+    def checkpoint_page(
+        self,
+        service: str,
+        target: str,
+        page: int,
+        cursor: [str, None],
+        result: Iterable,
+    ) -> None:
+        """
+        Record a page of paginated results
+
+        :param service: The name of the service
+        :param target: The target queried
+        :param page: The number of the page, starting at 1
+        :param cursor: The cursor of the next page, or None if the page
+            was the last one
+        :param result: The items found in the page
+        """
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (service, target, page, cursor, _pack(list(result))),
+            )
+
+    def resume_pages(
+        self, service: str, target: str
+    ) -> [tuple[int, [str, None], list], None]:
+        """
+        Get the progress of an interrupted pagination
+
+        :param service: The name of the service
+        :param target: The target queried
+        :return: A tuple containing the number of the last page
+            recorded, the cursor of the next page (None if there is no
+            next page) and the items of every page recorded, or None if
+            no page was recorded
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT page, cursor, result FROM pages "
+                "WHERE service = ? AND target = ? ORDER BY page",
+                (service, target),
+            ).fetchall()
+        if not rows:
+            return None
+        items = [item for *_, result in rows for item in _unpack(result)]
+        return rows[-1][0], rows[-1][1], items
+
+    def close(self) -> None:
+        """
+        Close the connection to the database
+        """
+        with self._lock:
+            self._db.close()
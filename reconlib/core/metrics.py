@@ -0,0 +1,356 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Callable
+from urllib.error import HTTPError
+
+# Upper bounds in seconds of the buckets of duration histograms
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# Phases of a request recorded by the transports and ExternalService
+PHASES = ("dns", "connect", "tls", "ttfb", "download", "total")
+
+
+class RequestTimings:
+    """
+    Details of a single HTTP request sent to an external service. The
+    duration of each phase is a number of seconds, or None if the phase
+    did not take place, such as DNS resolution, connection and TLS
+    handshake on a reused connection.
+    """
+
+    __slots__ = (
+        "service",
+        "endpoint",
+        "url",
+        "start",
+        "dns",
+        "connect",
+        "tls",
+        "ttfb",
+        "download",
+        "total",
+        "status",
+        "bytes",
+        "error",
+    )
+
+    def __init__(self, service: str, endpoint: str, url: str):
+        self.service = service
+        self.endpoint = endpoint
+        self.url = url
+        self.start = time.perf_counter()
+        self.dns = self.connect = self.tls = None
+        self.ttfb = self.download = self.total = None
+        self.status = None
+        self.bytes = 0
+        self.error = None
+
+    def __repr__(self):
+        attrs = (f"{attr}={getattr(self, attr)!r}" for attr in self.__slots__)
+        return f"{self.__class__.__name__}({', '.join(attrs)})"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {attr: getattr(self, attr) for attr in self.__slots__}
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Distribution of observed values over a fixed set of buckets
+
+        :param buckets: Sorted upper bounds of the buckets. A bucket
+            for any larger value is always added.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """
+        The number of values lower than or equal to the upper bound of
+        each bucket, as exported by Prometheus
+        """
+        total, cumulative = 0, []
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+
+class MetricsRegistry:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Counters and histograms of the requests sent by every service
+        instance given the registry, along with hooks called before and
+        after each request. Services without a registry skip every
+        measurement.
+
+        :param buckets: Upper bounds in seconds of the buckets of the
+            duration histograms
+        """
+        self.buckets = buckets
+        self.before_request: list[Callable[[RequestTimings], Any]] = []
+        self.after_request: list[Callable[[RequestTimings], Any]] = []
+        self._lock = threading.Lock()
+        self._requests = Counter()
+        self._errors = Counter()
+        self._bytes = Counter()
+        self._durations = {}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(requests={sum(self._requests.values())})"
+
+    def add_hooks(
+        self,
+        before: Callable[[RequestTimings], Any] = None,
+        after: Callable[[RequestTimings], Any] = None,
+    ) -> None:
+        """
+        Register callbacks receiving the RequestTimings of every request
+
+        :param before: Called once a request is about to be sent, with
+            only its service, endpoint and URL set
+        :param after: Called once the response body was read or the
+            request failed, with every measurement set
+        """
+        if before is not None:
+            self.before_request.append(before)
+        if after is not None:
+            self.after_request.append(after)
+
+    def request_started(self, service: str, endpoint: str, url: str) -> RequestTimings:
+        timings = RequestTimings(service, endpoint, url)
+        for hook in self.before_request:
+            hook(timings)
+        return timings
+
+    def request_finished(
+        self, timings: RequestTimings, error: Exception = None
+    ) -> None:
+        """
+        Record a request once its response body was read or it failed
+
+        :param timings: The RequestTimings returned by request_started
+            and filled in by the transport
+        :param error: The exception raised by the request, if any
+        """
+        timings.total = time.perf_counter() - timings.start
+        if error is not None:
+            timings.error = error
+            if isinstance(error, HTTPError):
+                timings.status = error.code
+        key = (timings.service, timings.endpoint)
+        with self._lock:
+            self._requests[(*key, timings.status)] += 1
+            self._bytes[key] += timings.bytes
+            if error is not None:
+                self._errors[(*key, type(error).__name__)] += 1
+            for phase in PHASES:
+                if (duration := getattr(timings, phase)) is not None:
+                    self._histogram(*key, phase).observe(duration)
+        for hook in self.after_request:
+            hook(timings)
+
+    def observe(self, service: str, endpoint: str, phase: str, seconds: float):
+        """
+        Record the duration of a phase that is not part of a request,
+        such as parsing a response
+        """
+        with self._lock:
+            self._histogram(service, endpoint, phase).observe(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._errors.clear()
+            self._bytes.clear()
+            self._durations.clear()
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        A dictionary of the current value of every metric, with one
+        entry for each combination of labels
+        """
+        with self._lock:
+            return {
+                "requests": [
+                    {"service": s, "endpoint": e, "status": status, "count": count}
+                    for (s, e, status), count in sorted(
+                        self._requests.items(), key=_sort_key
+                    )
+                ],
+                "errors": [
+                    {"service": s, "endpoint": e, "error": error, "count": count}
+                    for (s, e, error), count in sorted(self._errors.items())
+                ],
+                "bytes": [
+                    {"service": s, "endpoint": e, "count": count}
+                    for (s, e), count in sorted(self._bytes.items())
+                ],
+                "durations": [
+                    {
+                        "service": s,
+                        "endpoint": e,
+                        "phase": phase,
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "buckets": dict(histogram.cumulative()),
+                    }
+                    for (s, e, phase), histogram in sorted(self._durations.items())
+                ],
+            }
+
+    def to_prometheus(self, prefix: str = "reconlib") -> str:
+        """
+        Export every metric in the Prometheus text exposition format
+
+        :param prefix: Prefix of the name of every metric
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_requests_total HTTP requests sent to external services",
+            f"# TYPE {prefix}_requests_total counter",
+            *(
+                f"{prefix}_requests_total{_labels(item, 'status')} {item['count']}"
+                for item in snapshot["requests"]
+            ),
+            f"# HELP {prefix}_request_errors_total Failed HTTP requests",
+            f"# TYPE {prefix}_request_errors_total counter",
+            *(
+                f"{prefix}_request_errors_total{_labels(item, 'error')} "
+                f"{item['count']}"
+                for item in snapshot["errors"]
+            ),
+            f"# HELP {prefix}_response_bytes_total Bytes of response bodies read",
+            f"# TYPE {prefix}_response_bytes_total counter",
+            *(
+                f"{prefix}_response_bytes_total{_labels(item)} {item['count']}"
+                for item in snapshot["bytes"]
+            ),
+            f"# HELP {prefix}_phase_seconds Duration of each phase of requests",
+            f"# TYPE {prefix}_phase_seconds histogram",
+        ]
+        for item in snapshot["durations"]:
+            for bound, count in item["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"{prefix}_phase_seconds_bucket"
+                    f"{_labels(item, 'phase', le=le)} {count}"
+                )
+            lines.append(
+                f"{prefix}_phase_seconds_sum{_labels(item, 'phase')} {item['sum']}"
+            )
+            lines.append(
+                f"{prefix}_phase_seconds_count{_labels(item, 'phase')} "
+                f"{item['count']}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def _histogram(self, service: str, endpoint: str, phase: str) -> Histogram:
+        if (histogram := self._durations.get((service, endpoint, phase))) is None:
+            histogram = self._durations[service, endpoint, phase] = Histogram(
+                self.buckets
+            )
+        return histogram
+
+
+def _sort_key(item: tuple[tuple, int]) -> tuple:
+    (service, endpoint, status), _ = item
+    return service, endpoint, status if status is not None else -1
+
+
+def _labels(item: dict[str, Any], *names: str, **extra: str) -> str:
+    labels = {
+        "service": item["service"],
+        "endpoint": item["endpoint"],
+        **{name: item[name] for name in names},
+        **extra,
+    }
+    formatted = ",".join(
+        f'{name}="{_escape("" if value is None else str(value))}"'
+        for name, value in labels.items()
+    )
+    return f"{{{formatted}}}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def timed_parser(endpoint: str):
+    """
+    Decorate a method of a service parsing the responses of an endpoint
+    so that its duration is recorded as the "parse" phase of the
+    endpoint. Nothing is measured if the service has no registry.
+
+    :param endpoint: The name of the endpoint whose responses are parsed
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.metrics is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.metrics.observe(
+                    self.service_name,
+                    endpoint,
+                    "parse",
+                    time.perf_counter() - start,
+                )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,170 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import math
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Thread-safe token bucket limiting the rate at which requests are
+        sent. Both threads and asyncio tasks can wait on the same bucket.
+
+        :param rate: Number of tokens (requests) added to the bucket per
+            second
+        :param capacity: Maximum number of tokens the bucket can hold,
+            i.e. the largest burst of requests sent without waiting
+            (defaults to None for the number of tokens added per second,
+            with a minimum of one)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(rate={self.rate}, capacity={self.capacity})"
+
+    @classmethod
+    def per_minute(cls, requests: float, capacity: float = None) -> "TokenBucket":
+        """
+        Build a bucket allowing a given number of requests per minute
+
+        :param requests: Number of requests allowed per minute
+        :param capacity: Maximum burst of requests (defaults to None for
+            the number of requests allowed per minute)
+        """
+        return cls(requests / 60, capacity if capacity is not None else requests)
+
+    def acquire(self) -> float:
+        """
+        Block the calling thread until a token is available
+
+        :return: The number of seconds spent waiting
+        """
+        if (delay := self._reserve()) > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """
+        Suspend the calling task until a token is available
+
+        :return: The number of seconds spent waiting
+        """
+        if (delay := self._reserve()) > 0:
+            import asyncio  # Deferred so that synchronous callers never load it
+
+            await asyncio.sleep(delay)
+        return delay
+
+    def penalize(self, delay: float) -> None:
+        """
+        Hold back every request for a number of seconds, for instance
+        after the service answered with HTTP 429 (Too Many Requests)
+
+        :param delay: Number of seconds during which no token is granted
+        """
+        with self._lock:
+            self._refill(now := time.monotonic())
+            self._tokens = min(self._tokens, 1.0)
+            self._updated = max(self._updated, now + delay)
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def _reserve(self) -> float:
+        """
+        Take a token from the bucket, going into debt if none is left
+
+        :return: The number of seconds to wait until the reserved token
+            becomes available
+        """
+        if math.isinf(self.rate):
+            # Unlimited buckets only hold back requests while penalized
+            return max(0.0, self._updated - time.monotonic())
+        with self._lock:
+            self._refill(now := time.monotonic())
+            self._tokens -= 1
+            ready = self._updated + max(0.0, -self._tokens) / self.rate
+            return max(0.0, ready - now)
+
+
+_shared_buckets: dict[str, TokenBucket] = {}
+_shared_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(service_name: str, requests_per_minute: float) -> TokenBucket:
+    """
+    Get the token bucket shared by every instance of a service
+
+    :param service_name: The name of the service
+    :param requests_per_minute: Number of requests per minute allowed
+        if the bucket has not been created yet. None disables rate
+        limiting for the service.
+    :return: A TokenBucket instance
+    """
+    with _shared_buckets_lock:
+        if (bucket := _shared_buckets.get(service_name)) is None:
+            bucket = _shared_buckets[service_name] = (
+                TokenBucket(math.inf)
+                if requests_per_minute is None
+                else TokenBucket.per_minute(requests_per_minute)
+            )
+        return bucket
+
+
+def parse_retry_after(value: [str, None], default: float = 1.0) -> float:
+    """
+    Parse the value of a Retry-After HTTP header
+
+    :param value: Either a number of seconds or an HTTP date
+    :param default: Number of seconds returned if the value is missing
+        or invalid
+    :return: The number of seconds to wait before retrying
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # Only imported for HTTP dates, which are rarely sent by the services
+    from datetime import datetime, timezone
+    from email.utils import parsedate_to_datetime
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,164 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator
+
+from reconlib.core.base import AsyncExternalService, ExternalService
+
+
+class Recon:
+    def __init__(
+        self,
+        services: Iterable[ExternalService],
+        *,
+        concurrency: [int, dict[str, int]] = 4,
+        raise_errors: bool = False,
+    ):
+        """
+        Engine that queries several external services concurrently and
+        merges their results
+
+        :param services: Instances of ExternalService subclasses to be
+            queried for each target. Asynchronous services are not
+            supported, as requests are sent from pools of threads.
+        :param concurrency: Maximum number of requests in flight for
+            each service. Either an integer applied to every service or
+            a dictionary mapping service names to their respective caps
+            (services absent from the dictionary default to 4).
+        :param raise_errors: Re-raise the first exception raised by a
+            service instead of recording it in the "errors" attribute
+            and carrying on with the remaining services
+        :raise: TypeError if any service is an AsyncExternalService
+        """
+        self.services = tuple(services)
+        for service in self.services:
+            if isinstance(service, AsyncExternalService):
+                raise TypeError(
+                    f"{service.__class__.__name__} is asynchronous and cannot be "
+                    f"run by {self.__class__.__name__}. Use its synchronous "
+                    f"counterpart instead."
+                )
+        self.concurrency = concurrency
+        self.raise_errors = raise_errors
+        self.subdomains = defaultdict(set)
+        self.errors = []
+
+    def __repr__(self):
+        services = ", ".join(service.service_name for service in self.services)
+        return f"{self.__class__.__name__}(services=[{services}])"
+
+    def _cap(self, service: ExternalService) -> int:
+        if isinstance(self.concurrency, dict):
+            return self.concurrency.get(service.service_name, 4)
+        return self.concurrency
+
+    def run(
+        self, targets: Iterable[str], *, retain: bool = True
+    ) -> Iterator[tuple[str, str, set[str]]]:
+        """
+        Query every service for each target and yield results as soon
+        as each service answers
+
+        :param targets: An iterable of domain names. Targets are
+            consumed lazily so that only a bounded number of requests is
+            scheduled at any given time.
+        :param retain: Keep the results of each target, both in the
+            "subdomains" attribute and in the services, once every
+            service has answered for it. Setting it to False bounds
+            memory usage on very long runs.
+        :return: A generator of tuples containing a target, the name of
+            the service that answered and the subdomains it found that
+            had not been reported yet for that target by any service
+        """
+        caps = {service: self._cap(service) for service in self.services}
+        executors = {
+            service: ThreadPoolExecutor(
+                max_workers=cap, thread_name_prefix=f"{service.service_name}-worker"
+            )
+            for service, cap in caps.items()
+        }
+        # Keep every worker busy while bounding the number of scheduled
+        # but unfinished jobs
+        window = 2 * sum(caps.values())
+        pending: dict[Future, tuple[str, ExternalService]] = {}
+        jobs = ((target, service) for target in targets for service in self.services)
+        unanswered = defaultdict(lambda: len(self.services))
+
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < window:
+                    if (job := next(jobs, None)) is None:
+                        exhausted = True
+                        break
+                    target, service = job
+                    future = executors[service].submit(service._fetch_journaled, target)
+                    pending[future] = job
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    target, service = pending.pop(future)
+                    try:
+                        new = set(future.result()) - self.subdomains[target]
+                    except Exception as error:
+                        if self.raise_errors:
+                            raise
+                        self.errors.append((service.service_name, target, error))
+                        new = None
+                    else:
+                        self.subdomains[target].update(new)
+                    if not retain:
+                        unanswered[target] -= 1
+                        if unanswered[target] == 0:
+                            del unanswered[target]
+                            self._discard(target)
+                    if new is not None:
+                        yield target, service.service_name, new
+        finally:
+            for future in pending:
+                future.cancel()
+            for executor in executors.values():
+                executor.shutdown(wait=False)
+
+    def _discard(self, target: str) -> None:
+        self.subdomains.pop(target, None)
+        for service in self.services:
+            service.discard(target)
+
+    def fetch_subdomains(self, targets: Iterable[str]) -> dict[str, set[str]]:
+        """
+        Query every service for each target and return the merged
+        results once every service has answered
+
+        :param targets: An iterable of domain names
+        :return: A dictionary mapping each target to the union of the
+            subdomains found by all services
+        """
+        for _ in self.run(targets):
+            pass
+        return self.subdomains
@@ -0,0 +1,218 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import http.client
+import random
+import sys
+import threading
+import time
+from urllib.error import HTTPError
+
+from reconlib.core.exceptions import ServiceUnavailableError
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRYABLE_EXCEPTIONS = (
+    OSError,  # Connection, timeout, DNS resolution and SSL errors
+    http.client.HTTPException,
+    EOFError,
+)
+# asyncio.TimeoutError is an alias of the built-in TimeoutError, and thus
+# an OSError, since Python 3.11. Only import asyncio for older versions.
+if sys.version_info < (3, 11):
+    from asyncio import TimeoutError as _AsyncTimeoutError
+
+    RETRYABLE_EXCEPTIONS += (_AsyncTimeoutError,)
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        *,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        retry_on_status: frozenset[int] = RETRYABLE_STATUS_CODES,
+        retry_on_exceptions: tuple[type[BaseException], ...] = RETRYABLE_EXCEPTIONS,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+    ):
+        """
+        Policy deciding which failed requests are retried and how long
+        to wait before each new attempt
+
+        :param max_retries: Maximum number of retries of a request
+        :param backoff_factor: Base delay in seconds of the exponential
+            backoff. The n-th retry waits up to backoff_factor * 2 ** n
+            seconds.
+        :param max_backoff: Upper bound in seconds of the delay between
+            two attempts
+        :param jitter: Wait for a random delay between zero and the
+            exponential backoff ("full jitter") so that concurrent
+            workers do not retry in lockstep
+        :param retry_on_status: HTTP status codes of responses that are
+            retried
+        :param retry_on_exceptions: Types of exceptions that are retried.
+            HTTP errors are only retried if their status code is part of
+            "retry_on_status".
+        :param failure_threshold: Number of consecutive failures after
+            which the circuit breaker of a host opens
+        :param recovery_timeout: Number of seconds an open circuit
+            breaker rejects requests before letting a trial one through
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_on_status = retry_on_status
+        self.retry_on_exceptions = retry_on_exceptions
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(max_retries={self.max_retries}, "
+            f"backoff_factor={self.backoff_factor}, max_backoff={self.max_backoff})"
+        )
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """
+        Check whether a failed request should be attempted again
+        """
+        if isinstance(error, HTTPError):
+            return error.code in self.retry_on_status
+        return isinstance(error, self.retry_on_exceptions)
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """
+        Check whether a request that failed on a given attempt (starting
+        at zero) should be attempted again
+        """
+        return attempt < self.max_retries and self.is_retryable(error)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Get the number of seconds to wait before retrying a request that
+        failed on a given attempt (starting at zero)
+        """
+        delay = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def circuit_breaker(self, host: str) -> "CircuitBreaker":
+        """
+        Get the circuit breaker shared by every request sent to a host
+        """
+        return get_circuit_breaker(host, self.failure_threshold, self.recovery_timeout)
+
+
+class CircuitBreaker:
+    def __init__(self, host: str, failure_threshold: int, recovery_timeout: float):
+        """
+        Thread-safe circuit breaker failing requests to a host fast after
+        too many consecutive failures
+
+        :param host: Network location guarded by the breaker
+        :param failure_threshold: Number of consecutive failures after
+            which the breaker opens
+        :param recovery_timeout: Number of seconds during which an open
+            breaker rejects requests before letting a trial one through
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(host={self.host}, state={self.state})"
+
+    @property
+    def state(self) -> str:
+        """
+        One of "closed" (requests flow), "open" (requests are rejected)
+        or "half-open" (a trial request is allowed through)
+        """
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.recovery_timeout:
+            return "open"
+        return "half-open"
+
+    def before_request(self) -> None:
+        """
+        Check whether a request may be sent to the host
+
+        :raise: ServiceUnavailableError if the breaker is open or if a
+            trial request is already in flight
+        """
+        with self._lock:
+            if (state := self.state) == "closed":
+                return
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        raise ServiceUnavailableError(
+            f"{self.host} failed {self.failures} consecutive times. Requests are "
+            f"suspended for up to {self.recovery_timeout} seconds."
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+    host: str, failure_threshold: int = 5, recovery_timeout: float = 30.0
+) -> CircuitBreaker:
+    """
+    Get the circuit breaker shared by every request sent to a host
+
+    :param host: Network location of the host
+    :param failure_threshold: Failure threshold used if the breaker has
+        not been created yet
+    :param recovery_timeout: Recovery timeout used if the breaker has
+        not been created yet
+    """
+    with _breakers_lock:
+        if (breaker := _breakers.get(host)) is None:
+            breaker = _breakers[host] = CircuitBreaker(
+                host, failure_threshold, recovery_timeout
+            )
+        return breaker
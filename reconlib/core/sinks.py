@@ -0,0 +1,193 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import csv
+import json
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable
+
+# Fields common to every record written by the services
+FIELDS = ("service", "target", "type", "name", "value")
+
+
+class ResultSink(ABC):
+    def __init__(self, batch_size: int = 1000):
+        """
+        Destination to which services write their results as soon as
+        they are parsed. Records are buffered and written in batches.
+
+        :param batch_size: Number of records buffered before they are
+            written and flushed
+        """
+        self.batch_size = batch_size
+        self.records = 0
+        self._batch = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, record: dict) -> None:
+        """
+        Add a record to the sink
+
+        :param record: A dictionary containing at least the keys defined
+            in FIELDS
+        """
+        with self._lock:
+            self._batch.append(record)
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+
+    def flush(self) -> None:
+        """
+        Write every buffered record
+        """
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """
+        Write every buffered record and release the resources of the sink
+        """
+        with self._lock:
+            self._flush()
+            self._close()
+
+    def _flush(self) -> None:
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self._write_batch(batch)
+            self.records += len(batch)
+
+    @abstractmethod
+    def _write_batch(self, records: list[dict]) -> None:
+        """
+        Write a batch of records to the destination of the sink
+        """
+
+    def _close(self) -> None:
+        pass
+
+
+class NDJSONSink(ResultSink):
+    def __init__(self, file_path: [str, Path], batch_size: int = 1000):
+        """
+        Sink appending each record to a file as a line of JSON
+
+        :param file_path: Path of the file to append to
+        :param batch_size: Number of records buffered before they are
+            written and flushed
+        """
+        super().__init__(batch_size)
+        self._file = open(file_path, "a", encoding="utf_8")
+
+    def _write_batch(self, records: list[dict]) -> None:
+        self._file.writelines(
+            json.dumps(record, default=str) + "\n" for record in records
+        )
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class CSVSink(ResultSink):
+    def __init__(
+        self,
+        file_path: [str, Path],
+        batch_size: int = 1000,
+        fields: tuple[str] = FIELDS,
+    ):
+        """
+        Sink appending each record to a CSV file. A header is written
+        only if the file is empty.
+
+        :param file_path: Path of the file to append to
+        :param batch_size: Number of records buffered before they are
+            written and flushed
+        :param fields: Keys of the records written as columns. Any other
+            key is ignored.
+        """
+        super().__init__(batch_size)
+        self._file = open(file_path, "a", encoding="utf_8", newline="")
+        self._writer = csv.DictWriter(self._file, fields, extrasaction="ignore")
+        if self._file.tell() == 0:
+            self._writer.writeheader()
+
+    def _write_batch(self, records: list[dict]) -> None:
+        self._writer.writerows(records)
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class ColumnarSink(ResultSink):
+    def __init__(
+        self,
+        file_path: [str, Path] = None,
+        batch_size: int = 10_000,
+        fields: tuple[str] = FIELDS,
+        on_batch: Callable[[dict[str, list]], None] = None,
+    ):
+        """
+        Sink converting batches of records into columns, a layout that
+        can be handed directly to columnar formats such as Parquet or
+        Arrow (e.g. with pyarrow.Table.from_pydict)
+
+        :param file_path: Path of a file to which each batch is appended
+            as a line of JSON mapping each field to a list of values
+            (defaults to None for no file)
+        :param batch_size: Number of records per batch
+        :param fields: Keys of the records converted into columns
+        :param on_batch: Callable receiving each batch as a dictionary
+            mapping each field to a list of values
+        """
+        super().__init__(batch_size)
+        self.fields = fields
+        self.on_batch = on_batch
+        self._file = (
+            open(file_path, "a", encoding="utf_8") if file_path is not None else None
+        )
+
+    def _write_batch(self, records: list[dict]) -> None:
+        columns = {
+            field: [record.get(field) for record in records] for field in self.fields
+        }
+        if self._file is not None:
+            self._file.write(json.dumps(columns, default=str) + "\n")
+            self._file.flush()
+        if self.on_batch is not None:
+            self.on_batch(columns)
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
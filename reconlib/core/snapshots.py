@@ -0,0 +1,162 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+
+class Snapshot(NamedTuple):
+    names: frozenset[str]
+    watermark: [int, None]  # Highest item identifier seen by the service
+    updated: [float, None]  # Unix time the snapshot was taken
+
+
+class SubdomainDiff(NamedTuple):
+    added: set[str]
+    removed: set[str]
+
+
+_EMPTY_SNAPSHOT = Snapshot(frozenset(), None, None)
+
+
+class SnapshotStore:
+    def __init__(self, path: [str, Path]):
+        """
+        Thread-safe on-disk store of the subdomains known for each pair
+        of service and target as of the last run. Names are stored as a
+        single compressed blob per pair, so that loading and saving even
+        very large snapshots costs a single row access.
+
+        :param path: Path to the SQLite database file. It is created if
+            it does not exist.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "service TEXT NOT NULL, target TEXT NOT NULL, names BLOB NOT NULL, "
+                "watermark INTEGER, updated REAL NOT NULL, "
+                "PRIMARY KEY (service, target))"
+            )
+
+    def load(self, service: str, target: str) -> Snapshot:
+        """
+        Get the last snapshot taken for a service and target
+
+        :param service: The name of the service
+        :param target: The target queried
+        :return: The snapshot, which contains no names if none was taken
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT names, watermark, updated FROM snapshots "
+                "WHERE service = ? AND target = ?",
+                (service, target),
+            ).fetchone()
+        if row is None:
+            return _EMPTY_SNAPSHOT
+        names = zlib.decompress(row[0]).decode("utf_8")
+        return Snapshot(frozenset(names.split("\n") if names else ()), *row[1:])
+
+    def save(
+        self,
+        service: str,
+        target: str,
+        names: Iterable[str],
+        watermark: int = None,
+    ) -> None:
+        """
+        Replace the snapshot of a service and target
+
+        :param service: The name of the service
+        :param target: The target queried
+        :param names: Every subdomain currently known for the target
+        :param watermark: Highest identifier of the items seen by the
+            service, used to skip them on the next run
+        """
+        # Names are never sorted: set order is enough to diff snapshots
+        blob = zlib.compress("\n".join(names).encode("utf_8"), 1)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)",
+                (service, target, blob, watermark, time.time()),
+            )
+
+    def diff(
+        self,
+        service: str,
+        target: str,
+        names: Iterable[str],
+        *,
+        watermark: int = None,
+        incremental: bool = False,
+        save: bool = True,
+        snapshot: Snapshot = None,
+    ) -> SubdomainDiff:
+        """
+        Compare subdomains with the last snapshot of a service and target
+
+        :param service: The name of the service
+        :param target: The target queried
+        :param names: The subdomains found by the current run
+        :param watermark: Highest identifier of the items seen by the
+            current run
+        :param incremental: Whether the names were found only among
+            items newer than the watermark of the last snapshot, in which
+            case they are added to the snapshot and no name is considered
+            removed
+        :param save: Replace the snapshot with the current names if any
+            of them changed
+        :param snapshot: The last snapshot, if already loaded
+        :return: The names added and removed since the last snapshot
+        """
+        if snapshot is None:
+            snapshot = self.load(service, target)
+        previous = snapshot.names
+        if not isinstance(names, (set, frozenset)):
+            names = set(names)
+        if incremental:
+            diff = SubdomainDiff(names - previous, set())
+            names = previous.union(diff.added)
+        else:
+            diff = SubdomainDiff(names - previous, previous - names)
+        changed = diff.added or diff.removed or watermark != snapshot.watermark
+        if save and (changed or snapshot.updated is None):
+            self.save(service, target, names, watermark)
+        return diff
+
+    def close(self) -> None:
+        """
+        Close the connection to the database
+        """
+        with self._lock:
+            self._db.close()
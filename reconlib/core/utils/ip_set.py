@@ -0,0 +1,234 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import heapq
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping, MutableSet
+from ipaddress import ip_address, IPv4Address, IPv6Address
+from operator import itemgetter
+from typing import Any, Iterable, Iterator
+
+
+class PackedIPSet(MutableSet):
+    def __init__(self, ip_addresses: Iterable = ()):
+        """
+        Set of IP addresses stored as integers instead of ipaddress
+        objects. IPv4 addresses are kept in a sorted array of 32-bit
+        integers (4 bytes each) and IPv6 addresses in a set of integers.
+        Addresses are converted back into IPv4Address/IPv6Address objects
+        only when iterated over.
+
+        :param ip_addresses: An iterable of IP addresses, either as
+            objects or strings
+        """
+        self._ipv4 = array("I")
+        self._pending = set()  # IPv4 addresses not yet merged into the array
+        self._ipv6 = set()
+        for ip_addr in ip_addresses:
+            self.add(ip_addr)
+
+    def __contains__(self, ip_addr: Any) -> bool:
+        try:
+            ip_addr = _parse(ip_addr)
+        except ValueError:
+            return False
+        if ip_addr.version == 6:
+            return int(ip_addr) in self._ipv6
+        value = int(ip_addr)
+        return value in self._pending or _search(self._ipv4, value) is not None
+
+    def __iter__(self) -> Iterator[[IPv4Address, IPv6Address]]:
+        self._merge()
+        yield from map(IPv4Address, self._ipv4)
+        yield from map(IPv6Address, sorted(self._ipv6))
+
+    def __len__(self) -> int:
+        return len(self._ipv4) + len(self._pending) + len(self._ipv6)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({[str(ip_addr) for ip_addr in self]})"
+
+    def __sizeof__(self) -> int:
+        return sum(map(sys.getsizeof, (self._ipv4, self._pending, self._ipv6))) + sum(
+            map(sys.getsizeof, self._ipv6)
+        )
+
+    def add(self, ip_addr: Any) -> None:
+        """
+        Add an IP address to the set
+
+        :param ip_addr: An IPv4/IPv6 address or its string representation
+        """
+        ip_addr = _parse(ip_addr)
+        if ip_addr.version == 6:
+            self._ipv6.add(int(ip_addr))
+        elif (value := int(ip_addr)) not in self._pending and (
+            _search(self._ipv4, value) is None
+        ):
+            self._pending.add(value)
+            # Merging in batches keeps the amortized cost of an insertion
+            # low without holding many addresses outside of the array
+            if len(self._pending) >= max(1024, len(self._ipv4) // 8):
+                self._merge()
+
+    def update(self, *ip_addresses: Iterable) -> None:
+        """
+        Add the IP addresses of one or more iterables to the set
+        """
+        for iterable in ip_addresses:
+            for ip_addr in iterable:
+                self.add(ip_addr)
+
+    def discard(self, ip_addr: Any) -> None:
+        """
+        Remove an IP address from the set if it is present
+
+        :param ip_addr: An IPv4/IPv6 address or its string representation
+        """
+        ip_addr = _parse(ip_addr)
+        if ip_addr.version == 6:
+            self._ipv6.discard(int(ip_addr))
+        elif (value := int(ip_addr)) in self._pending:
+            self._pending.discard(value)
+        elif (index := _search(self._ipv4, value)) is not None:
+            del self._ipv4[index]
+
+    def _merge(self) -> None:
+        if self._pending:
+            self._ipv4 = array("I", heapq.merge(self._ipv4, sorted(self._pending)))
+            self._pending.clear()
+
+
+class PackedIPMap(MutableMapping):
+    def __init__(self, items: Any = ()):
+        """
+        Mapping of IP addresses to values with keys stored as integers
+        instead of ipaddress objects. IPv4 addresses are kept in a sorted
+        array of 32-bit integers along with a list of their values and
+        IPv6 addresses in a dictionary keyed by integers. Keys are
+        converted back into IPv4Address/IPv6Address objects only when
+        iterated over.
+
+        :param items: A mapping or an iterable of (IP address, value)
+            pairs, with addresses either as objects or strings
+        """
+        self._ipv4 = array("I")
+        self._values = []  # Values of the addresses of the array
+        self._pending = {}  # IPv4 addresses not yet merged into the array
+        self._ipv6 = {}
+        self.update(items)
+
+    def __getitem__(self, ip_addr: Any) -> Any:
+        try:
+            parsed = _parse(ip_addr)
+        except ValueError:
+            raise KeyError(ip_addr) from None
+        value = int(parsed)
+        if parsed.version == 6:
+            if value in self._ipv6:
+                return self._ipv6[value]
+        elif value in self._pending:
+            return self._pending[value]
+        elif (index := _search(self._ipv4, value)) is not None:
+            return self._values[index]
+        raise KeyError(ip_addr)
+
+    def __setitem__(self, ip_addr: Any, item: Any) -> None:
+        ip_addr = _parse(ip_addr)
+        if ip_addr.version == 6:
+            self._ipv6[int(ip_addr)] = item
+        elif (index := _search(self._ipv4, value := int(ip_addr))) is not None:
+            self._values[index] = item
+        else:
+            self._pending[value] = item
+            if len(self._pending) >= max(1024, len(self._ipv4) // 8):
+                self._merge()
+
+    def __delitem__(self, ip_addr: Any) -> None:
+        try:
+            parsed = _parse(ip_addr)
+        except ValueError:
+            raise KeyError(ip_addr) from None
+        value = int(parsed)
+        if parsed.version == 6:
+            if value in self._ipv6:
+                del self._ipv6[value]
+                return
+        elif value in self._pending:
+            del self._pending[value]
+            return
+        elif (index := _search(self._ipv4, value)) is not None:
+            del self._ipv4[index]
+            del self._values[index]
+            return
+        raise KeyError(ip_addr)
+
+    def __iter__(self) -> Iterator[[IPv4Address, IPv6Address]]:
+        self._merge()
+        yield from map(IPv4Address, self._ipv4)
+        yield from map(IPv6Address, sorted(self._ipv6))
+
+    def __len__(self) -> int:
+        return len(self._ipv4) + len(self._pending) + len(self._ipv6)
+
+    def __repr__(self) -> str:
+        items = ", ".join(f"'{ip_addr}': {item!r}" for ip_addr, item in self.items())
+        return f"{self.__class__.__name__}({{{items}}})"
+
+    def __sizeof__(self) -> int:
+        return sum(
+            map(sys.getsizeof, (self._ipv4, self._values, self._pending, self._ipv6))
+        ) + sum(map(sys.getsizeof, self._ipv6))
+
+    def _merge(self) -> None:
+        if self._pending:
+            ipv4, values = array("I"), []
+            for value, item in heapq.merge(
+                zip(self._ipv4, self._values),
+                sorted(self._pending.items()),
+                key=itemgetter(0),
+            ):
+                ipv4.append(value)
+                values.append(item)
+            self._ipv4, self._values = ipv4, values
+            self._pending.clear()
+
+
+def _search(ipv4: array, value: int) -> [int, None]:
+    """
+    Get the index of an IPv4 address in a sorted array of integers
+    """
+    index = bisect_left(ipv4, value)
+    if index < len(ipv4) and ipv4[index] == value:
+        return index
+    return None
+
+
+def _parse(ip_addr: Any) -> [IPv4Address, IPv6Address]:
+    if isinstance(ip_addr, (IPv4Address, IPv6Address)):
+        return ip_addr
+    return ip_address(ip_addr)
@@ -0,0 +1,134 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayParser:
+    def __init__(self, encoding: str = "utf_8"):
+        """
+        Push parser that decodes the items of a top-level JSON array as
+        soon as each of them has been entirely received. Only the bytes
+        of the item being currently received are kept in memory.
+
+        :param encoding: Encoding of the bytes fed to the parser
+        """
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+
+    def feed(self, data: bytes) -> list[Any]:
+        """
+        Feed a chunk of the document to the parser
+
+        :param data: The next chunk of bytes of the JSON document
+        :return: A list of the array items completed by this chunk
+        """
+        self._buffer += self._decoder.decode(data)
+        return self._parse()
+
+    def close(self) -> list[Any]:
+        """
+        Signal the end of the document
+
+        :return: A list of any remaining array items
+        :raise: json.JSONDecodeError if the document is incomplete or is
+            not a JSON array
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        items = self._parse()
+        if not self._finished:
+            raise json.JSONDecodeError(
+                "Unterminated JSON array", self._buffer, len(self._buffer)
+            )
+        return items
+
+    def _parse(self) -> list[Any]:
+        buffer, pos, items = self._buffer, 0, []
+        while not self._finished:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if not self._started:
+                if char != "[":
+                    raise json.JSONDecodeError("Expecting '['", buffer, pos)
+                self._started, pos = True, pos + 1
+            elif char == "]":
+                self._finished, pos = True, pos + 1
+            elif char == ",":
+                pos += 1
+            else:
+                try:
+                    item, end = self._json.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # Incomplete item. Wait for more data.
+                if end == len(buffer) and not isinstance(item, (dict, list, str)):
+                    break  # A number at the end of a chunk may be truncated
+                items.append(item)
+                pos = end
+        self._buffer = buffer[pos:]
+        return items
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: str = "utf_8") -> Iterator[Any]:
+    """
+    Lazily decode the items of a JSON array received in chunks
+
+    :param chunks: An iterable of byte strings forming a JSON array
+    :param encoding: Encoding of the byte strings
+    :return: A generator of the decoded array items
+    """
+    parser = JSONArrayParser(encoding)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def aiter_json_array(
+    chunks: AsyncIterable[bytes], encoding: str = "utf_8"
+) -> AsyncIterator[Any]:
+    """
+    Lazily decode the items of a JSON array received in chunks from an
+    asynchronous iterable
+
+    :param chunks: An asynchronous iterable of byte strings forming a
+        JSON array
+    :param encoding: Encoding of the byte strings
+    :return: An asynchronous generator of the decoded array items
+    """
+    parser = JSONArrayParser(encoding)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
@@ -23,31 +23,134 @@ Contact: https://www.twitter.com/eon_raider
     <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
 """
 
+import random
+import threading
+from enum import Enum
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
-from random import randrange
-from typing import TextIO
+from typing import Sequence
 
+DEFAULT_USER_AGENTS_FILE = (
+    Path(__file__).parent.absolute().joinpath("user_agents_list.txt")
+)
 
-def _get_random_line(fd: TextIO, line_num: int = None) -> str:
-    """
-    Get a random line from a file
 
-    :param fd: File descriptor pointing to a file containing lines of
-        text
-    :param line_num: Number of a line to select in the file. Defaults to
-        a random line if None
-    :return: A string containing a line selected from the file
+class Rotation(Enum):
+    """
+    Enumeration of strategies for selecting a user-agent from a pool
     """
-    line = line_num
-    for i, aline in enumerate(fd, start=1):
-        if randrange(i) == 0:  # random int [0..i)
-            line = aline
-    return line.strip()
+
+    RANDOM = "random"  # Uniformly random user-agent on every request
+    WEIGHTED = "weighted"  # Random user-agent drawn according to weights
+    STICKY = "sticky"  # Random user-agent kept for all requests to a host
+
+
+class UserAgentPool:
+    def __init__(
+        self,
+        file_path: [str, Path] = None,
+        *,
+        rotation: Rotation = Rotation.RANDOM,
+        weights: Sequence[float] = None,
+    ):
+        """
+        Immutable pool of user-agent strings loaded lazily from a file
+        the first time a user-agent is selected
+
+        :param file_path: Path to a file containing line-separated
+            user-agent strings (defaults to None for the list bundled
+            with ReconLib)
+        :param rotation: Strategy used to select a user-agent from the
+            pool
+        :param weights: Relative weights of each user-agent in the file,
+            in the same order, used by the WEIGHTED rotation strategy
+            (defaults to None for uniform weights)
+        """
+        self.file_path = Path(file_path) if file_path is not None else None
+        self.rotation = rotation
+        self.weights = weights
+        self._agents: tuple[str, ...] = ()
+        self._cum_weights = None
+        self._sticky: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(file_path={self.file_path}, "
+            f"rotation={self.rotation})"
+        )
+
+    def __len__(self):
+        return len(self.agents)
+
+    @property
+    def agents(self) -> tuple[str, ...]:
+        """
+        A tuple of every user-agent string in the pool
+        """
+        if not self._agents:
+            self.reload()
+        return self._agents
+
+    def reload(self, file_path: [str, Path] = None) -> None:
+        """
+        Read the user-agent strings of the pool from a file
+
+        :param file_path: Path to a file containing line-separated
+            user-agent strings (defaults to None to read the file the
+            pool was initialized with)
+        """
+        if file_path is not None:
+            self.file_path = Path(file_path)
+        with open(self.file_path or DEFAULT_USER_AGENTS_FILE, encoding="utf_8") as file:
+            agents = tuple(line.strip() for line in file if line.strip())
+        if not agents:
+            raise ValueError(f"No user-agent strings found in {file.name}")
+        if self.weights is not None and len(self.weights) != len(agents):
+            raise ValueError(
+                f"Expected {len(agents)} weights, one for each user-agent, but got "
+                f"{len(self.weights)}"
+            )
+        with self._lock:
+            self._agents = agents
+            self._cum_weights = (
+                tuple(accumulate(self.weights)) if self.weights is not None else None
+            )
+            self._sticky.clear()
+
+    def select(self, host: str = None) -> str:
+        """
+        Select a user-agent according to the rotation strategy of the
+        pool
+
+        :param host: The host the request will be sent to. Used by the
+            STICKY rotation strategy to keep the same user-agent for all
+            requests to a host.
+        :return: A user-agent string
+        """
+        agents = self.agents
+        if self.rotation is Rotation.STICKY:
+            if (agent := self._sticky.get(host)) is None:
+                agent = self._sticky.setdefault(host, random.choice(agents))
+            return agent
+        if self.rotation is Rotation.WEIGHTED and self._cum_weights is not None:
+            return random.choices(agents, cum_weights=self._cum_weights)[0]
+        return random.choice(agents)
+
+
+DEFAULT_USER_AGENTS = UserAgentPool()
+
+
+@lru_cache(maxsize=16)
+def _pool_for(file_path: str) -> UserAgentPool:
+    return UserAgentPool(file_path)
 
 
 def random_user_agent(file_path: [str, Path] = None) -> str:
     """
-    Get a random user-agent from a text file
+    Get a random user-agent from a text file. The contents of the file
+    are read once and kept in memory for subsequent calls.
 
     :param file_path: Path to a file containing line-separated
         user-agent strings
@@ -55,6 +158,5 @@ def random_user_agent(file_path: [str, Path] = None) -> str:
         file
     """
     if file_path is None:
-        file_path = Path(__file__).parent.absolute().joinpath("user_agents_list.txt")
-    with open(file_path) as file:
-        return _get_random_line(file)
+        return DEFAULT_USER_AGENTS.select()
+    return _pool_for(str(Path(file_path).absolute())).select()
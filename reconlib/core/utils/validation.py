@@ -23,7 +23,14 @@ Contact: https://www.twitter.com/eon_raider
     <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
 """
 
-from ipaddress import ip_address, IPv6Address, IPv4Address
+from ipaddress import (
+    ip_address,
+    ip_network,
+    IPv6Address,
+    IPv4Address,
+    IPv4Network,
+    IPv6Network,
+)
 from typing import Any
 
 from reconlib.core.exceptions import InvalidTargetError
@@ -34,3 +41,10 @@ def validate_ip_address(ip_addr: Any) -> [IPv4Address, IPv6Address]:
         return ip_address(ip_addr)
     except ValueError as e:
         raise InvalidTargetError(str(e))
+
+
+def validate_ip_network(network: Any) -> [IPv4Network, IPv6Network]:
+    try:
+        return ip_network(network, strict=False)
+    except ValueError as e:
+        raise InvalidTargetError(str(e))
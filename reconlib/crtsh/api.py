@@ -26,8 +26,28 @@ Contact: https://www.twitter.com/eon_raider
 import json
 from collections import defaultdict
 from enum import Enum
+from typing import AsyncIterator, Iterator, TYPE_CHECKING
 
-from reconlib.core.base import ExternalService
+from reconlib.core.base import AsyncExternalService, ExternalService
+from reconlib.core.metrics import timed_parser
+from reconlib.core.rate_limit import TokenBucket
+from reconlib.core.retry import RetryPolicy
+from reconlib.core.transport import ConnectionPool
+from reconlib.core.utils.user_agents import UserAgentPool
+from reconlib.core.utils.json_stream import aiter_json_array, iter_json_array
+from reconlib.crtsh.names import SubdomainExtractor
+from reconlib.crtsh.parsing import ParsedResponse, parse_response
+from reconlib.crtsh.results import CertificateTable
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+    from reconlib.core.cache import ResponseCache
+    from reconlib.core.index import SubdomainIndex
+    from reconlib.core.journal import ProgressJournal
+    from reconlib.core.metrics import MetricsRegistry
+    from reconlib.core.sinks import ResultSink
+    from reconlib.core.snapshots import Snapshot
 
 
 class CRTSh(Enum):
@@ -40,34 +60,94 @@ class CRTSh(Enum):
 
 class CRTShAPI(ExternalService):
     service_name = "CRTSh"
+    cache_ttl = 6 * 3600
+    requests_per_minute = 60
 
     def __init__(
         self,
         *,
-        user_agent: str = None,
+        user_agent: [str, UserAgentPool] = None,
         wildcard: bool = True,
         include_expired: bool = True,
+        compact_results: bool = False,
+        parse_executor: "Executor" = None,
         encoding: str = "utf_8",
+        transport: ConnectionPool = None,
+        cache: "ResponseCache" = None,
+        rate_limiter: TokenBucket = None,
+        retry_policy: RetryPolicy = None,
+        index: "SubdomainIndex" = None,
+        sink: "ResultSink" = None,
+        journal: "ProgressJournal" = None,
+        metrics: "MetricsRegistry" = None,
     ):
         """
         Wrapper for HTTP requests for domain information to the crt.sh
         service
 
         :param user_agent: User-agent string to use when querying the
-            crt.sh service (defaults to None for a random user-agent
-            string to be used at each new request)
+            crt.sh service, or a UserAgentPool from which a user-agent is
+            selected at each new request (defaults to None for a random
+            user-agent string to be used at each new request)
         :param wildcard: Prepend a wildcard to the domain when querying
             the crt.sh service (defaults to True)
         :param include_expired: Include expired certificates in search
             results (defaults to True)
+        :param compact_results: Store the certificates of each target in
+            a columnar CertificateTable instead of a list of dictionaries
+            in the "results" attribute (defaults to False)
+        :param parse_executor: Executor, such as a ProcessPoolExecutor,
+            to which raw responses are handed for decoding and subdomain
+            extraction, so that parsing large responses scales across
+            CPU cores. Only subdomains, and certificates if compact
+            results are enabled, are sent back, and "results" is only
+            filled in for compact results (defaults to None for parsing
+            in the calling thread).
         :param encoding: Encoding used on responses provided by crt.sh
+        :param transport: Connection pool used to send requests to
+            crt.sh (defaults to None for the pool shared by all services)
+        :param cache: Cache in which responses from crt.sh are stored
+            and looked up (defaults to None for no caching)
+        :param rate_limiter: Token bucket limiting the rate of requests
+            to crt.sh (defaults to None for a bucket shared by all
+            CRTShAPI instances)
+        :param retry_policy: Policy defining how requests to crt.sh
+            that failed or timed out, as it often does on domains with
+            many certificates, are retried (defaults to None for the
+            default RetryPolicy)
+        :param index: SubdomainIndex into which the names extracted from
+            certificates are also written (defaults to None)
+        :param sink: ResultSink to which every subdomain is written as
+            soon as it is extracted from a certificate (defaults to None)
+        :param journal: ProgressJournal recording the targets whose
+            certificates were already fetched, so that a sweep resumed
+            after an interruption skips them (defaults to None)
+        :param metrics: MetricsRegistry recording the duration, status
+            and size of every request sent to crt.sh along with the time
+            spent parsing certificates (defaults to None)
         """
-        super().__init__(user_agent, encoding)
+        super().__init__(
+            user_agent,
+            encoding,
+            transport=transport,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            index=index,
+            sink=sink,
+            journal=journal,
+            metrics=metrics,
+        )
         self.wildcard = wildcard
         self.include_expired = include_expired
+        self.compact_results = compact_results
+        self.parse_executor = parse_executor
         self.subdomains = defaultdict(set)
         self.results = defaultdict(dict)
 
+    def _endpoint_name(self, url: str) -> str:
+        return "certificates"
+
     def get_query_url(self, target: str) -> str:
         """
         A string defining the URL to be fetched based on user-supplied
@@ -90,7 +170,7 @@ class CRTShAPI(ExternalService):
 
         return url
 
-    def fetch_certificates(self, target: str) -> list[dict]:
+    def fetch_certificates(self, target: str) -> [list[dict], CertificateTable]:
         """
         Fetch certificate information for a given domain from crt.sh
 
@@ -98,19 +178,272 @@ class CRTShAPI(ExternalService):
 
         :return A list of dictionaries in JSON format, each containing
         certificate information of a subdomain known by crt.sh to
-        belong to the target domain
+        belong to the target domain, or a CertificateTable if compact
+        results are enabled
         """
-        response = json.loads(self._query_service(url=self.get_query_url(target)))
-        self.results[target] = response
-        self.subdomains[target].update(host["common_name"] for host in response)
-        return response
+        if self.parse_executor is not None and self.compact_results is True:
+            return self._fetch_offloaded(target).certificates
+        return self._process_certificates(
+            target, self._query_service(url=self.get_query_url(target))
+        )
 
     def fetch_subdomains(self, target: str) -> set[str]:
         """
         Utility method that executes a request to crt.sh, processes the
-        response and returns a set of known subdomains for a given target
+        response and returns a set of known subdomains for a given target.
+        Subdomains are extracted from the common names and the subject
+        alternative names of all certificates.
 
         :param target: A domain name to search for in crt.sh
         """
-        self.fetch_certificates(target)
+        if self.parse_executor is None:
+            self.fetch_certificates(target)
+        else:
+            self._fetch_offloaded(target)
         return self.subdomains[target]
+
+    def stream_certificates(self, target: str) -> Iterator[dict]:
+        """
+        Fetch certificate information for a given domain from crt.sh and
+        yield each certificate as soon as it is received. Certificates
+        are not stored in the "results" attribute, which keeps memory
+        usage constant regardless of the size of the response.
+
+        :param target: A domain name to search for in crt.sh
+
+        :return: A generator of dictionaries, each containing
+            certificate information of a subdomain known by crt.sh to
+            belong to the target domain
+        """
+        extractor = SubdomainExtractor(target, self.subdomains[target])
+        chunks = self._stream_service(url=self.get_query_url(target))
+        for certificate in iter_json_array(chunks, self.encoding):
+            self._record_subdomains(target, extractor.add(certificate))
+            yield certificate
+
+    def stream_subdomains(self, target: str) -> Iterator[str]:
+        """
+        Fetch certificate information for a given domain from crt.sh and
+        yield each subdomain the first time it is found
+
+        :param target: A domain name to search for in crt.sh
+        """
+        extractor = SubdomainExtractor(target, self.subdomains[target])
+        chunks = self._stream_service(url=self.get_query_url(target))
+        for certificate in iter_json_array(chunks, self.encoding):
+            self._record_subdomains(target, names := extractor.add(certificate))
+            yield from names
+
+    def _fetch_since(
+        self, target: str, snapshot: "Snapshot"
+    ) -> tuple[set[str], [int, None], bool]:
+        self.discard(target)
+        if self.parse_executor is None:
+            return self._process_delta(
+                target, snapshot, self._query_service(url=self.get_query_url(target))
+            )
+        since_id = self._since_id(snapshot)
+        parsed = self._fetch_offloaded(target, since_id=since_id)
+        return self._delta(target, since_id, parsed.last_id)
+
+    def _fetch_offloaded(self, target: str, since_id: int = None) -> ParsedResponse:
+        """
+        Fetch a response from crt.sh and wait for the parse executor to
+        parse it. The calling thread releases the GIL while waiting.
+        """
+        body = self._fetch(url=self.get_query_url(target))
+        return self._process_parsed(
+            target, self._offload(target, body, since_id=since_id).result()
+        )
+
+    def _offload(self, target: str, body: bytes, since_id: int = None) -> "Future":
+        """
+        Hand a raw response to the parse executor
+        :return: A Future of the ParsedResponse of the executor
+        """
+        return self.parse_executor.submit(
+            parse_response,
+            body,
+            target,
+            self.encoding,
+            compact_results=self.compact_results,
+            since_id=since_id,
+        )
+
+    def _process_parsed(self, target: str, parsed: ParsedResponse) -> ParsedResponse:
+        """
+        Merge a response parsed by the parse executor into the results
+        of a target
+        """
+        new_subdomains = parsed.subdomains - self.subdomains[target]
+        self.subdomains[target].update(new_subdomains)
+        self._record_subdomains(target, new_subdomains)
+        if parsed.certificates is not None:
+            self.results[target] = parsed.certificates
+        return parsed
+
+    def _process_delta(
+        self, target: str, snapshot: "Snapshot", response: str
+    ) -> tuple[set[str], [int, None], bool]:
+        """
+        Parse a response from crt.sh for comparison with a snapshot
+        """
+        since_id = self._since_id(snapshot)
+        certificates = self._process_certificates(target, response, since_id=since_id)
+        if isinstance(certificates, CertificateTable):
+            ids = certificates.column("id")
+        else:
+            ids = [certificate["id"] for certificate in certificates]
+        return self._delta(target, since_id, max(ids, default=None))
+
+    def _since_id(self, snapshot: "Snapshot") -> [int, None]:
+        """
+        Identifier up to which certificates can be skipped when fetching
+        results for comparison with a snapshot. The identifiers assigned
+        by crt.sh only ever increase, so when expired certificates are
+        included (and certificates therefore never disappear from
+        results) every certificate up to the highest identifier of the
+        snapshot is skipped.
+        """
+        return snapshot.watermark if self.include_expired is True else None
+
+    def _delta(
+        self, target: str, since_id: [int, None], last_id: [int, None]
+    ) -> tuple[set[str], [int, None], bool]:
+        """
+        :return: A tuple containing the subdomains of a target, the
+            highest certificate identifier seen so far and whether
+            certificates up to "since_id" were skipped
+        """
+        watermark = last_id if last_id is not None else since_id
+        return self.subdomains[target], watermark, since_id is not None
+
+    @timed_parser("certificates")
+    def _process_certificates(
+        self, target: str, response: str, since_id: int = None
+    ) -> [list[dict], CertificateTable]:
+        """
+        Parse a response from crt.sh and store its results
+
+        :param target: The domain name the response refers to
+        :param response: A string containing the JSON response of crt.sh
+        :param since_id: Ignore every certificate with an identifier up
+            to this value (defaults to None to keep all certificates)
+        :return: A list of dictionaries containing certificate
+            information, or a CertificateTable if compact results are
+            enabled
+        """
+        certificates = json.loads(response)
+        if since_id is not None:
+            certificates = [c for c in certificates if c["id"] > since_id]
+        extractor = SubdomainExtractor(target, self.subdomains[target])
+        if self.compact_results is True:
+            certificates = CertificateTable(certificates)
+            subdomains = [
+                name
+                for names in zip(
+                    certificates.column("common_name"),
+                    certificates.column("name_value"),
+                )
+                for name in extractor.feed(*names)
+            ]
+        else:
+            subdomains = extractor.update(certificates)
+        self._record_subdomains(target, subdomains)
+        self.results[target] = certificates
+        return certificates
+
+
+class AsyncCRTShAPI(AsyncExternalService, CRTShAPI):
+    """
+    Asynchronous wrapper for HTTP requests for domain information to the
+    crt.sh service. Accepts the same arguments as CRTShAPI, with
+    "transport" set to an AsyncConnectionPool if supplied.
+    """
+
+    async def fetch_certificates(self, target: str) -> [list[dict], CertificateTable]:
+        """
+        Fetch certificate information for a given domain from crt.sh
+
+        :param target: A domain name to search for in crt.sh
+
+        :return A list of dictionaries in JSON format, each containing
+        certificate information of a subdomain known by crt.sh to
+        belong to the target domain, or a CertificateTable if compact
+        results are enabled
+        """
+        if self.parse_executor is not None and self.compact_results is True:
+            return (await self._fetch_offloaded(target)).certificates
+        return self._process_certificates(
+            target, await self._query_service(url=self.get_query_url(target))
+        )
+
+    async def fetch_subdomains(self, target: str) -> set[str]:
+        """
+        Execute a request to crt.sh, process the response and return a
+        set of known subdomains for a given target
+
+        :param target: A domain name to search for in crt.sh
+        """
+        if self.parse_executor is None:
+            await self.fetch_certificates(target)
+        else:
+            await self._fetch_offloaded(target)
+        return self.subdomains[target]
+
+    async def _fetch_offloaded(
+        self, target: str, since_id: int = None
+    ) -> ParsedResponse:
+        """
+        Fetch a response from crt.sh and wait for the parse executor to
+        parse it without blocking the event loop
+        """
+        import asyncio
+
+        body = await self._fetch(url=self.get_query_url(target))
+        parsed = await asyncio.wrap_future(
+            self._offload(target, body, since_id=since_id)
+        )
+        return self._process_parsed(target, parsed)
+
+    async def stream_certificates(self, target: str) -> AsyncIterator[dict]:
+        """
+        Fetch certificate information for a given domain from crt.sh and
+        yield each certificate as soon as it is received. Certificates
+        are not stored in the "results" attribute.
+
+        :param target: A domain name to search for in crt.sh
+        """
+        extractor = SubdomainExtractor(target, self.subdomains[target])
+        chunks = self._stream_service(url=self.get_query_url(target))
+        async for certificate in aiter_json_array(chunks, self.encoding):
+            self._record_subdomains(target, extractor.add(certificate))
+            yield certificate
+
+    async def stream_subdomains(self, target: str) -> AsyncIterator[str]:
+        """
+        Fetch certificate information for a given domain from crt.sh and
+        yield each subdomain the first time it is found
+
+        :param target: A domain name to search for in crt.sh
+        """
+        extractor = SubdomainExtractor(target, self.subdomains[target])
+        chunks = self._stream_service(url=self.get_query_url(target))
+        async for certificate in aiter_json_array(chunks, self.encoding):
+            self._record_subdomains(target, names := extractor.add(certificate))
+            for name in names:
+                yield name
+
+    async def _fetch_since(
+        self, target: str, snapshot: "Snapshot"
+    ) -> tuple[set[str], [int, None], bool]:
+        self.discard(target)
+        if self.parse_executor is None:
+            return self._process_delta(
+                target,
+                snapshot,
+                await self._query_service(url=self.get_query_url(target)),
+            )
+        since_id = self._since_id(snapshot)
+        parsed = await self._fetch_offloaded(target, since_id=since_id)
+        return self._delta(target, since_id, parsed.last_id)
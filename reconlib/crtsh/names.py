@@ -0,0 +1,114 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+from typing import Iterable, Optional
+
+
+def target_suffix(target: str) -> Optional[str]:
+    """
+    Get the domain name all subdomains of a target must end with
+
+    :param target: A domain name as passed to crt.sh, optionally
+        prepended with a "%." wildcard
+    :return: The normalized domain name, or None if the target is a
+        pattern that cannot be used to filter subdomains
+    """
+    suffix = target.strip().lower().rstrip(".").removeprefix("%.")
+    return None if "%" in suffix or not suffix else suffix
+
+
+class SubdomainExtractor:
+    def __init__(self, target: str, subdomains: set[str] = None):
+        """
+        Single-pass extractor of the subdomains of a target found in the
+        common names and lists of subject alternative names of
+        certificates returned by crt.sh. Names are lowercased, stripped
+        of trailing dots and wildcard labels, filtered to the target
+        domain and deduplicated as they are found.
+
+        :param target: The domain name the certificates refer to
+        :param subdomains: A set in which known subdomains are stored
+            (defaults to None for a new empty set)
+        """
+        self.subdomains = set() if subdomains is None else subdomains
+        self.suffix = target_suffix(target)
+        self._dotted_suffix = None if self.suffix is None else f".{self.suffix}"
+
+    def add(self, certificate: dict) -> list[str]:
+        """
+        Extract the subdomains of a single certificate
+
+        :param certificate: A dictionary in the format returned by crt.sh
+        :return: A list of the subdomains not previously known
+        """
+        return self.feed(certificate.get("common_name"), certificate.get("name_value"))
+
+    def update(self, certificates: Iterable[dict]) -> list[str]:
+        """
+        Extract the subdomains of every certificate of an iterable
+
+        :param certificates: An iterable of dictionaries in the format
+            returned by crt.sh
+        :return: A list of the subdomains not previously known
+        """
+        new_subdomains = []
+        for certificate in certificates:
+            new_subdomains += self.feed(
+                certificate.get("common_name"), certificate.get("name_value")
+            )
+        return new_subdomains
+
+    def feed(self, *values: Optional[str]) -> list[str]:
+        """
+        Extract the subdomains found in strings containing one or more
+        newline-separated names
+
+        :param values: Strings such as the "common_name" and
+            "name_value" fields of a certificate
+        :return: A list of the subdomains not previously known
+        """
+        subdomains, suffix, dotted_suffix = (
+            self.subdomains,
+            self.suffix,
+            self._dotted_suffix,
+        )
+        new_subdomains = []
+        for value in values:
+            if not value:
+                continue
+            for name in value.lower().split("\n"):
+                name = name.strip().rstrip(".")
+                if name.startswith("*."):
+                    name = name[2:]
+                if not name or name in subdomains:
+                    continue
+                if suffix is None:
+                    if "@" in name or " " in name:
+                        continue  # E-mail addresses and organization names
+                elif name != suffix and not name.endswith(dotted_suffix):
+                    continue
+                subdomains.add(name)
+                new_subdomains.append(name)
+        return new_subdomains
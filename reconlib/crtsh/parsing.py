@@ -0,0 +1,75 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import json
+from typing import NamedTuple
+
+from reconlib.crtsh.names import SubdomainExtractor
+from reconlib.crtsh.results import CertificateTable
+
+
+class ParsedResponse(NamedTuple):
+    subdomains: set[str]
+    certificates: [CertificateTable, None]  # Only kept for compact results
+    last_id: [int, None]  # Highest identifier among the certificates
+
+
+def parse_response(
+    body: bytes,
+    target: str,
+    encoding: str = "utf_8",
+    *,
+    compact_results: bool = False,
+    since_id: int = None,
+) -> ParsedResponse:
+    """
+    Decode a response from crt.sh and extract the subdomains of a target
+    from its certificates. Being a module-level function of a module
+    free of network code, it can be run in the worker processes of a
+    ProcessPoolExecutor, to which only the raw response is sent and from
+    which only the compact result comes back.
+
+    :param body: The raw bytes of the JSON response of crt.sh
+    :param target: The domain name the response refers to
+    :param encoding: Encoding of the response
+    :param compact_results: Return the certificates in a columnar
+        CertificateTable. Certificates are discarded otherwise.
+    :param since_id: Ignore every certificate with an identifier up to
+        this value (defaults to None to keep all certificates)
+    :return: A ParsedResponse containing the subdomains found and, if
+        compact results are enabled, the certificates
+    """
+    certificates = json.loads(body.decode(encoding))
+    if since_id is not None:
+        certificates = [c for c in certificates if c["id"] > since_id]
+    last_id = max((c["id"] for c in certificates), default=None)
+    extractor = SubdomainExtractor(target)
+    if compact_results is True:
+        table = CertificateTable(certificates)
+        for names in zip(table.column("common_name"), table.column("name_value")):
+            extractor.feed(*names)
+        return ParsedResponse(extractor.subdomains, table, last_id)
+    extractor.update(certificates)
+    return ParsedResponse(extractor.subdomains, None, last_id)
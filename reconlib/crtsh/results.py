@@ -0,0 +1,267 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NULL = -(2**63)  # Marks missing integers and timestamps
+_ABSENT = object()  # Marks rows lacking a key stored in an extra column
+
+
+def parse_timestamp(value: Optional[str]) -> int:
+    """
+    Convert a timestamp in the format used by crt.sh (ISO 8601 without a
+    timezone and with up to six fractional digits) into microseconds
+    since the Unix epoch
+
+    :param value: The timestamp string, or None
+    :return: The number of microseconds since the epoch
+    """
+    if value is None:
+        return _NULL
+    seconds, _, fraction = value.partition(".")
+    moment = (datetime.fromisoformat(seconds) - _EPOCH) // _MICROSECOND
+    return moment + int(fraction.ljust(6, "0")) if fraction else moment
+
+
+def format_timestamp(value: int) -> Optional[str]:
+    """
+    Convert microseconds since the Unix epoch back into a timestamp
+    string formatted exactly like crt.sh does
+
+    :param value: The number of microseconds since the epoch
+    :return: The timestamp string, or None for a missing timestamp
+    """
+    if value == _NULL:
+        return None
+    seconds, micro = divmod(value, 1_000_000)
+    moment = (_EPOCH + timedelta(seconds=seconds)).isoformat()
+    return f"{moment}.{micro:06d}".rstrip("0") if micro else moment
+
+
+class CertificateTable:
+    """
+    Compact, column-oriented container of certificates returned by
+    crt.sh. Identifiers are kept in arrays of 64-bit integers,
+    timestamps are stored as microseconds since the epoch and issuer
+    names are stored once and referenced by index. Keys unknown to the
+    table, such as "result_count", are kept in extra columns of their
+    own. Rows are converted back into the dictionaries returned by
+    crt.sh only when accessed.
+    """
+
+    _INT_COLUMNS = ("issuer_ca_id", "id")
+    _TIME_COLUMNS = ("entry_timestamp", "not_before", "not_after")
+    _STR_COLUMNS = ("common_name", "name_value", "serial_number")
+    fields = (
+        "issuer_ca_id",
+        "issuer_name",
+        "common_name",
+        "name_value",
+        "id",
+        "entry_timestamp",
+        "not_before",
+        "not_after",
+        "serial_number",
+    )
+
+    def __init__(self, certificates: Iterable[dict] = ()):
+        """
+        :param certificates: An iterable of dictionaries in the format
+            returned by crt.sh to initialize the table with
+        """
+        self._columns = {
+            **{name: array("q") for name in self._INT_COLUMNS + self._TIME_COLUMNS},
+            **{name: [] for name in self._STR_COLUMNS},
+        }
+        self._issuers = array("I")
+        self._issuer_names = []
+        self._issuer_index = {}
+        self._extra = {}
+        self.extend(certificates)
+
+    def __len__(self) -> int:
+        return len(self._issuers)
+
+    def __iter__(self) -> Iterator[dict]:
+        return (self._row(index) for index in range(len(self)))
+
+    def __getitem__(self, index: int) -> dict:
+        return self._row(range(len(self))[index])
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CertificateTable):
+            return self.to_dicts() == other.to_dicts()
+        if isinstance(other, list):
+            return self.to_dicts() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(certificates={len(self)}, "
+            f"issuers={len(self._issuer_names)})"
+        )
+
+    @property
+    def issuers(self) -> tuple[str]:
+        """The distinct issuer names found in the table"""
+        return tuple(self._issuer_names)
+
+    def append(self, certificate: dict) -> None:
+        """
+        Add a certificate to the table
+
+        :param certificate: A dictionary in the format returned by crt.sh
+        """
+        index, columns = len(self), self._columns
+        for name in self._INT_COLUMNS:
+            value = certificate.get(name)
+            columns[name].append(_NULL if value is None else value)
+        for name in self._TIME_COLUMNS:
+            columns[name].append(parse_timestamp(certificate.get(name)))
+        for name in self._STR_COLUMNS:
+            columns[name].append(certificate.get(name))
+        self._issuers.append(self._intern_issuer(certificate.get("issuer_name")))
+        for name, value in certificate.items():
+            if name not in self.fields:
+                if (column := self._extra.get(name)) is None:
+                    column = self._extra[name] = [_ABSENT] * index
+                column.append(value)
+        for column in self._extra.values():
+            if len(column) == index:
+                column.append(_ABSENT)
+
+    def extend(self, certificates: Iterable[dict]) -> None:
+        """
+        Add every certificate of an iterable to the table
+
+        :param certificates: An iterable of dictionaries in the format
+            returned by crt.sh
+        """
+        for certificate in certificates:
+            self.append(certificate)
+
+    def column(self, name: str) -> [array, list]:
+        """
+        Get the values of a single column without building any rows.
+        Timestamps are returned as microseconds since the epoch.
+
+        :param name: The name of a key of the certificates
+        :return: An array or list containing the values of the column
+        """
+        if name == "issuer_name":
+            return [self._issuer_names[index] for index in self._issuers]
+        if name in self._extra:
+            return [None if v is _ABSENT else v for v in self._extra[name]]
+        return self._columns[name]
+
+    def filter(
+        self,
+        predicate: Callable[[dict], bool] = None,
+        *,
+        issuer_name: str = None,
+        since: [datetime, str] = None,
+        until: [datetime, str] = None,
+    ) -> "CertificateTable":
+        """
+        Get a new table containing only the certificates matching every
+        supplied condition. Conditions on issuers and entry timestamps
+        are evaluated on the columns without building any rows.
+
+        :param predicate: A callable receiving a certificate as a
+            dictionary and returning True if it must be kept
+        :param issuer_name: Keep only certificates issued by this issuer
+        :param since: Keep only certificates logged at or after this
+            moment
+        :param until: Keep only certificates logged before this moment
+        :return: A new CertificateTable instance
+        """
+        indexes = range(len(self))
+        if issuer_name is not None:
+            if (issuer := self._issuer_index.get(issuer_name)) is None:
+                return self.__class__()
+            indexes = [i for i in indexes if self._issuers[i] == issuer]
+        timestamps = self._columns["entry_timestamp"]
+        if since is not None:
+            since = self._to_epoch(since)
+            indexes = [i for i in indexes if timestamps[i] >= since]
+        if until is not None:
+            until = self._to_epoch(until)
+            indexes = [i for i in indexes if _NULL < timestamps[i] < until]
+        if predicate is not None:
+            indexes = [i for i in indexes if predicate(self._row(i))]
+        return self._take(indexes)
+
+    def to_dicts(self) -> list[dict]:
+        """
+        Convert the table back into the list of dictionaries originally
+        returned by crt.sh
+        """
+        return list(self)
+
+    def _intern_issuer(self, issuer_name: Optional[str]) -> int:
+        if (index := self._issuer_index.get(issuer_name)) is None:
+            index = self._issuer_index[issuer_name] = len(self._issuer_names)
+            self._issuer_names.append(issuer_name)
+        return index
+
+    def _take(self, indexes: Iterable[int]) -> "CertificateTable":
+        table, indexes = self.__class__(), list(indexes)
+        for index in indexes:
+            for name, column in self._columns.items():
+                table._columns[name].append(column[index])
+            issuer_name = self._issuer_names[self._issuers[index]]
+            table._issuers.append(table._intern_issuer(issuer_name))
+        for name, column in self._extra.items():
+            table._extra[name] = [column[index] for index in indexes]
+        return table
+
+    def _row(self, index: int) -> dict:
+        columns = self._columns
+        row = {}
+        for name in self.fields:
+            if name == "issuer_name":
+                row[name] = self._issuer_names[self._issuers[index]]
+            elif name in self._TIME_COLUMNS:
+                row[name] = format_timestamp(columns[name][index])
+            elif (value := columns[name][index]) != _NULL:
+                row[name] = value
+            else:
+                row[name] = None
+        for name, column in self._extra.items():
+            if (value := column[index]) is not _ABSENT:
+                row[name] = value
+        return row
+
+    @staticmethod
+    def _to_epoch(moment: [datetime, str]) -> int:
+        if isinstance(moment, str):
+            return parse_timestamp(moment)
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return (moment - _EPOCH) // _MICROSECOND
@@ -24,14 +24,64 @@ Contact: https://www.twitter.com/eon_raider
 """
 
 import re
+import threading
 from collections import defaultdict
 from enum import Enum
-from ipaddress import ip_address, IPv6Address, IPv4Address, IPv4Network
-from typing import Any
+from ipaddress import (
+    ip_address,
+    ip_network,
+    IPv6Address,
+    IPv4Address,
+    IPv4Network,
+    IPv6Network,
+)
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, TYPE_CHECKING
 from urllib.parse import urlencode, urlparse, urlunparse
 
-from reconlib.core.base import ExternalService
-from reconlib.core.utils.validation import validate_ip_address
+from reconlib.core.asn import ASNCache
+from reconlib.core.base import AsyncExternalService, ExternalService
+from reconlib.core.exceptions import QuotaExceededError, ServiceResponseError
+from reconlib.core.metrics import timed_parser
+from reconlib.core.rate_limit import TokenBucket
+from reconlib.core.retry import RetryPolicy
+from reconlib.core.transport import ConnectionPool
+from reconlib.core.utils.ip_set import PackedIPMap, PackedIPSet
+from reconlib.core.utils.user_agents import UserAgentPool
+from reconlib.core.utils.validation import validate_ip_address, validate_ip_network
+from reconlib.hackertarget.parser import (
+    HackerTargetParser,
+    QUOTA_EXCEEDED_PREFIX,
+    is_error_message,
+    iter_lines,
+)
+
+if TYPE_CHECKING:
+    from reconlib.core.cache import ResponseCache
+    from reconlib.core.index import SubdomainIndex
+    from reconlib.core.journal import ProgressJournal
+    from reconlib.core.metrics import MetricsRegistry
+    from reconlib.core.sinks import ResultSink
+
+
+def expand_ip_targets(targets: Iterable) -> Iterator[str]:
+    """
+    Lazily expand an iterable of IP addresses and networks into the
+    string representation of every single address
+
+    :param targets: An iterable of IP addresses and networks, either as
+        objects or strings (networks in CIDR notation)
+    :return: A generator of IP addresses as strings. Networks yield
+        their usable host addresses.
+    :raise: InvalidTargetError if any target is not a valid IP address
+        or network
+    """
+    for target in targets:
+        if isinstance(target, (IPv4Network, IPv6Network)) or (
+            isinstance(target, str) and "/" in target
+        ):
+            yield from map(str, validate_ip_network(target).hosts())
+        else:
+            yield str(validate_ip_address(target))
 
 
 class HackerTarget(Enum):
@@ -48,23 +98,95 @@ class HackerTarget(Enum):
 
 class HackerTargetAPI(ExternalService):
     service_name = "HackerTarget"
-
-    def __init__(self, *, user_agent: str = None, encoding: str = "utf_8"):
+    requests_per_minute = 30
+    _target_attributes = (
+        "subdomains",
+        "results",
+        "ip_addresses",
+        "dns_records",
+        "errors",
+    )
+
+    def __init__(
+        self,
+        *,
+        user_agent: [str, UserAgentPool] = None,
+        encoding: str = "utf_8",
+        transport: ConnectionPool = None,
+        cache: "ResponseCache" = None,
+        rate_limiter: TokenBucket = None,
+        retry_policy: RetryPolicy = None,
+        index: "SubdomainIndex" = None,
+        sink: "ResultSink" = None,
+        journal: "ProgressJournal" = None,
+        metrics: "MetricsRegistry" = None,
+        asn_cache: ASNCache = None,
+        packed_ips: bool = False,
+    ):
         """
         Wrapper for HTTP requests to the API of HackerTarget
 
         :param user_agent: User-agent string to use when querying the
-            HackerTarget API (defaults to None for a random user-agent
-            string to be used at each new request)
+            HackerTarget API, or a UserAgentPool from which a user-agent
+            is selected at each new request (defaults to None for a
+            random user-agent string to be used at each new request)
         :param encoding: Encoding used on responses provided by the
             HackerTarget API
+        :param transport: Connection pool used to send requests to the
+            HackerTarget API (defaults to None for the pool shared by all
+            services)
+        :param cache: Cache in which responses from the HackerTarget API
+            are stored and looked up (defaults to None for no caching)
+        :param rate_limiter: Token bucket limiting the rate of requests
+            to the HackerTarget API (defaults to None for a bucket shared
+            by all HackerTargetAPI instances)
+        :param retry_policy: Policy defining how failed requests are
+            retried. Error messages sent by HackerTarget with a success
+            status, such as an exceeded quota, are raised rather than
+            retried (defaults to None for the default RetryPolicy).
+        :param index: SubdomainIndex into which the subdomains found by
+            "hostsearch" and "reverse_dns" are also written (defaults to
+            None)
+        :param sink: ResultSink to which hosts, DNS records, hostnames
+            and autonomous systems are written as soon as each line of
+            a response is parsed (defaults to None)
+        :param journal: ProgressJournal recording the targets already
+            answered by "hostsearch", so that a sweep resumed after an
+            interruption skips them. Targets answered with error
+            messages are left pending (defaults to None).
+        :param metrics: MetricsRegistry recording the duration, status
+            and size of every request along with the time spent parsing
+            each endpoint (defaults to None)
+        :param asn_cache: ASNCache used to answer "aslookup" requests for
+            addresses within known networks (defaults to None for a new
+            empty cache)
+        :param packed_ips: Store the IP addresses of each target in a
+            PackedIPSet and the results and hostnames keyed by IP address
+            in PackedIPMap objects, which take a fraction of the memory
+            of sets and dictionaries of ipaddress objects (defaults to
+            False)
         """
-        super().__init__(user_agent, encoding)
-        self.ip_addresses = defaultdict(set)
+        super().__init__(
+            user_agent,
+            encoding,
+            transport=transport,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            index=index,
+            sink=sink,
+            journal=journal,
+            metrics=metrics,
+        )
+        self.ip_addresses = defaultdict(PackedIPSet if packed_ips else set)
         self.subdomains = defaultdict(set)
-        self.results = defaultdict(dict)
+        self.results = defaultdict(PackedIPMap if packed_ips else dict)
         self.dns_records = defaultdict(dict)
         self.asn = defaultdict(dict)
+        self.hostnames = PackedIPMap() if packed_ips else {}
+        self.errors = defaultdict(list)
+        self.asn_cache = asn_cache if asn_cache is not None else ASNCache()
+        self._parser = HackerTargetParser(intern_ip_addresses=not packed_ips)
 
     def get_query_url(self, endpoint: HackerTarget, params: dict = None) -> str:
         """
@@ -100,13 +222,7 @@ class HackerTargetAPI(ExternalService):
         query_url = self.get_query_url(
             endpoint=HackerTarget.HOSTSEARCH, params={"q": target}
         )
-        for result in self._query_service(url=query_url).rstrip().split("\n"):
-            domain, ip_addr = result.split(",")
-            ip_addr = ip_address(ip_addr)
-            self.results[target].update({ip_addr: domain})
-            self.subdomains[target].add(domain)
-            self.ip_addresses[target].add(ip_addr)
-        return self.results
+        return self._process_hostsearch(target, self._query_service(url=query_url))
 
     def fetch_subdomains(self, target: str) -> set[str]:
         """
@@ -132,11 +248,7 @@ class HackerTargetAPI(ExternalService):
         query_url = self.get_query_url(
             endpoint=HackerTarget.DNSLOOKUP, params={"q": target}
         )
-        self.dns_records.update({target: defaultdict(list)})
-        for entry in self._query_service(url=query_url).rstrip().split("\n"):
-            record, value = entry.split(" : ")
-            self.dns_records[target][record].append(value)
-        return self.dns_records
+        return self._process_dnslookup(target, self._query_service(url=query_url))
 
     def reverse_dns(self, target: str) -> dict[[IPv4Address, IPv6Address], str]:
         """
@@ -154,18 +266,16 @@ class HackerTargetAPI(ExternalService):
             endpoint=HackerTarget.REVERSEDNS,
             params={"q": validate_ip_address(target)},
         )
-        ip_addr, domain = self._query_service(url=query_url).rstrip().split(" ")
-        ip_addr = ip_address(ip_addr)
-        self.subdomains[target].add(domain)
-        self.ip_addresses[target].add(ip_addr)
-        return {ip_addr: domain}
+        return self._process_reverse_dns(target, self._query_service(url=query_url))
 
     def aslookup(self, target: str) -> dict[str, Any]:
         """
         Send an HTTP request to HackerTarget's "aslookup" API endpoint
         and fetch the results
 
-        :param target: A domain name to search for in api.hackertarget.com
+        :param target: An IP address to search for in api.hackertarget.com.
+            Addresses within a network already found in the ASN cache are
+            answered without sending a request.
 
         :return: A dictionary mapping the lookup results (IP address,
             ASN, network address space and owner) to their respective
@@ -173,29 +283,431 @@ class HackerTargetAPI(ExternalService):
         :raise: InvalidTargetError if set to a target that cannot be
             cast into an IPv4/IPv6 address
         """
+        ip_addr = validate_ip_address(target)
+        if (known := self.asn_cache.lookup(ip_addr)) is not None:
+            return known
         query_url = self.get_query_url(
-            endpoint=HackerTarget.ASLOOKUP,
-            params={"q": validate_ip_address(target)},
+            endpoint=HackerTarget.ASLOOKUP, params={"q": ip_addr}
         )
+        return self._process_aslookup(self._query_service(url=query_url))
+
+    def reverse_dns_many(
+        self,
+        targets: Iterable,
+        concurrency: int = 4,
+        *,
+        return_exceptions: bool = False,
+    ) -> Iterator[tuple[str, [dict[[IPv4Address, IPv6Address], str], Exception]]]:
+        """
+        Resolve the hostnames of many IP addresses concurrently and
+        yield the results of each address as soon as they are available.
+        Addresses already resolved by this instance, or being resolved
+        for another target of the batch, are answered without a new
+        request.
+
+        :param targets: An iterable of IP addresses and networks. Networks
+            are expanded lazily into their host addresses.
+        :param concurrency: Maximum number of addresses queried at the
+            same time. Requests are still subject to the rate limiter.
+        :param return_exceptions: Yield the exception raised for an
+            address in place of its result instead of raising it
+        :return: A generator of tuples containing an IP address and a
+            dictionary mapping it to its hostname
+        """
+        resolve = _InFlight(validate_ip_address, self._coalesced_reverse_dns)
+        for target, future in self._map_concurrently(
+            resolve, expand_ip_targets(targets), concurrency
+        ):
+            yield self._batch_result(target, future, True, return_exceptions)
+
+    def aslookup_many(
+        self,
+        targets: Iterable,
+        concurrency: int = 4,
+        *,
+        return_exceptions: bool = False,
+    ) -> Iterator[tuple[str, [dict[str, Any], Exception]]]:
+        """
+        Look up the autonomous systems of many IP addresses concurrently
+        and yield the results of each address as soon as they are
+        available. Addresses within the network of an already known ASN
+        are answered without a new request, and addresses sharing the
+        /24 (IPv4) or /48 (IPv6) network of a lookup in flight wait for
+        it so that they can be answered from the ASN cache as well.
+
+        :param targets: An iterable of IP addresses and networks. Networks
+            are expanded lazily into their host addresses.
+        :param concurrency: Maximum number of addresses queried at the
+            same time. Requests are still subject to the rate limiter.
+        :param return_exceptions: Yield the exception raised for an
+            address in place of its result instead of raising it
+        :return: A generator of tuples containing an IP address and its
+            lookup results
+        """
+        lookup = _InFlight(_routed_network, self.aslookup)
+        for target, future in self._map_concurrently(
+            lookup, expand_ip_targets(targets), concurrency
+        ):
+            yield self._batch_result(target, future, True, return_exceptions)
+
+    def _coalesced_reverse_dns(
+        self, target: str
+    ) -> dict[[IPv4Address, IPv6Address], str]:
+        if (known := self._known_hostname(target)) is not None:
+            return known
+        return self.reverse_dns(target)
+
+    def _known_hostname(self, target: str) -> [dict[IPv4Address, str], None]:
+        """
+        Get the result of a previous reverse DNS lookup of an address
+        """
+        ip_addr = ip_address(target)
+        if (hostname := self.hostnames.get(ip_addr)) is None:
+            return None
+        return {ip_addr: hostname}
 
-        # Query the API and split the response into four pre-defined
-        # groups: IP Address, ASN, IP Address Space (Network) and Owner
-        # name
-        response = re.match(
-            r"^\"(?P<ip_addr>.+)\",\"(?P<asn>.+)\",\"(?P<network>.+)\","
-            r"\"(?P<owner>.+)\"$",
-            self._query_service(url=query_url).rstrip(),
+    @timed_parser("hostsearch")
+    def _process_hostsearch(self, target: str, response: str) -> defaultdict[str, dict]:
+        """
+        Parse a response from the "hostsearch" endpoint and store its
+        results
+        """
+        results, subdomains, ip_addresses = (
+            self.results[target],
+            self.subdomains[target],
+            self.ip_addresses[target],
         )
+        new_subdomains, errors, found = [], [], False
+        lines = iter_lines(response, self.encoding)
+        for domain, ip_addr in self._parser.hostsearch(lines, errors):
+            found = True
+            results[ip_addr] = domain
+            if domain not in subdomains:
+                subdomains.add(domain)
+                new_subdomains.append(domain)
+            ip_addresses.add(ip_addr)
+            self._emit(target, "host", domain, ip_addr)
+        self._record_errors(target, errors, found)
+        self._record_subdomains(target, new_subdomains)
+        return self.results
+
+    @timed_parser("dnslookup")
+    def _process_dnslookup(self, target: str, response: str) -> dict[str, dict]:
+        """
+        Parse a response from the "dnslookup" endpoint and store its
+        results
+        """
+        records, errors = defaultdict(list), []
+        self.dns_records[target] = records
+        lines = iter_lines(response, self.encoding)
+        for record, value in self._parser.dnslookup(lines, errors):
+            records[record].append(value)
+            self._emit(target, "dns_record", record, value)
+        self._record_errors(target, errors, bool(records))
+        return self.dns_records
+
+    @timed_parser("reversedns")
+    def _process_reverse_dns(
+        self, target: str, response: str
+    ) -> dict[[IPv4Address, IPv6Address], str]:
+        """
+        Parse a response from the "reversedns" endpoint and store its
+        results
+        """
+        resolved, errors = {}, []
+        lines = iter_lines(response, self.encoding)
+        for ip_addr, domain in self._parser.reverse_dns(lines, errors):
+            resolved[ip_addr] = domain
+            self.subdomains[target].add(domain)
+            self.ip_addresses[target].add(ip_addr)
+            self.hostnames[ip_addr] = domain
+            self._emit(target, "reverse_dns", domain, ip_addr)
+        self._record_errors(target, errors, bool(resolved))
+        self._record_subdomains(target, resolved.values())
+        return resolved
+
+    def _is_cacheable(self, body: bytes) -> bool:
+        """
+        Keep the error messages sent by HackerTarget in place of results,
+        such as "API count exceeded", out of the response cache
+        """
+        return not is_error_message(body, self.encoding)
 
-        self.asn[(asn := int(response.group("asn")))].update(
+    def _error_count(self, target: str) -> int:
+        return len(self.errors.get(target, ()))
+
+    def _record_errors(self, target: str, errors: list[str], found: bool) -> None:
+        """
+        Store the lines of a response that could not be parsed, such as
+        error messages sent in place of results
+
+        :param found: Whether any line of the response was parsed
+        :raise: QuotaExceededError if the response only holds the message
+            sent once the API quota is exhausted, or ServiceResponseError
+            if it only holds other lines that could not be parsed
+        """
+        if not errors:
+            return
+        self.errors[target].extend(errors)
+        if not found:
+            _raise_error_message(errors[0])
+
+    @timed_parser("aslookup")
+    def _process_aslookup(self, response: str) -> dict[str, Any]:
+        """
+        Parse a response from the "aslookup" endpoint and store its
+        results
+        """
+        # Split the response into four pre-defined groups: IP Address,
+        # ASN, IP Address Space (Network) and Owner name
+        if (
+            match := re.match(
+                r"^\"(?P<ip_addr>.+)\",\"(?P<asn>.+)\",\"(?P<network>.+)\","
+                r"\"(?P<owner>.+)\"$",
+                response.strip(),
+            )
+        ) is None:
+            _raise_error_message(response.strip())
+
+        self.asn[(asn := int(match.group("asn")))].update(
             {
-                "NETWORK": IPv4Network(response.group("network")),
-                "OWNER": response.group("owner"),
+                "NETWORK": ip_network(match.group("network"), strict=False),
+                "OWNER": match.group("owner"),
             }
         )
+        self.asn_cache.add(self.asn[asn]["NETWORK"], asn, self.asn[asn]["OWNER"])
+        ip_addr = ip_address(match.group("ip_addr"))
+        self._emit(
+            str(ip_addr),
+            "asn",
+            self.asn[asn]["NETWORK"],
+            asn,
+            owner=self.asn[asn]["OWNER"],
+        )
+
+        return {"IP_ADDRESS": ip_addr, "ASN": asn, **self.asn[asn]}
+
+
+def _raise_error_message(message: str) -> None:
+    """
+    Raise the exception matching an error message sent by HackerTarget
+    in place of results
+    """
+    if message.startswith(QUOTA_EXCEEDED_PREFIX):
+        raise QuotaExceededError(message)
+    raise ServiceResponseError(f"Unexpected response from HackerTarget: {message}")
+
+
+def _routed_network(target: str) -> [IPv4Network, IPv6Network]:
+    """
+    Get the /24 (IPv4) or /48 (IPv6) network of an address. Longer
+    prefixes are not routed on the internet, so the addresses of such a
+    network belong to the same autonomous system.
+    """
+    ip_addr = validate_ip_address(target)
+    prefix = 24 if ip_addr.version == 4 else 48
+    return ip_network(f"{ip_addr}/{prefix}", strict=False)
+
+
+class _InFlight:
+    """
+    Wrapper of a lookup function called concurrently for the targets of
+    a batch. A call whose key matches the key of a call in flight waits
+    for that call to end before being made, so that it is answered from
+    the results stored by the first call instead of sending a request
+    of its own.
+    """
+
+    def __init__(self, key: Callable, function: Callable):
+        """
+        :param key: A callable mapping a target to the key shared by
+            every target answered by the same request
+        :param function: The lookup function called with each target
+        """
+        self.key = key
+        self.function = function
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, target: str) -> Any:
+        key = self.key(target)
+        while True:
+            with self._lock:
+                if (done := self._calls.get(key)) is None:
+                    done = self._calls[key] = threading.Event()
+                    break
+            done.wait()
+        try:
+            return self.function(target)
+        finally:
+            with self._lock:
+                del self._calls[key]
+            done.set()
+
+
+class _AsyncInFlight(_InFlight):
+    async def __call__(self, target: str) -> Any:
+        import asyncio
+
+        key = self.key(target)
+        while (done := self._calls.get(key)) is not None:
+            await done.wait()
+        done = self._calls[key] = asyncio.Event()
+        try:
+            return await self.function(target)
+        finally:
+            del self._calls[key]
+            done.set()
+
+
+class AsyncHackerTargetAPI(AsyncExternalService, HackerTargetAPI):
+    """
+    Asynchronous wrapper for HTTP requests to the API of HackerTarget.
+    Accepts the same arguments as HackerTargetAPI, with "transport" set
+    to an AsyncConnectionPool if supplied.
+    """
+
+    async def hostsearch(self, target: str) -> defaultdict[str, dict]:
+        """
+        Send an HTTP request to HackerTarget's "hostsearch" API endpoint
+        and fetch the results
+
+        :param target: A domain name to search for in api.hackertarget.com
+
+        :return: A dictionary mapping each known IP address from the
+            target to a given subdomain
+        """
+        query_url = self.get_query_url(
+            endpoint=HackerTarget.HOSTSEARCH, params={"q": target}
+        )
+        return self._process_hostsearch(
+            target, await self._query_service(url=query_url)
+        )
+
+    async def fetch_subdomains(self, target: str) -> set[str]:
+        """
+        Execute a request to HackerTarget, process the response and
+        return a set of known subdomains for a given target
+
+        :param target: A domain name to search for in HackerTarget
+        """
+        await self.hostsearch(target)
+        return self.subdomains[target]
+
+    async def dnslookup(self, target: str) -> dict[str, dict]:
+        """
+        Send an HTTP request to HackerTarget's "dnslookup" API endpoint
+        and fetch the results
+
+        :param target: A domain name to search for in api.hackertarget.com
+
+        :return: A dictionary mapping each known DNS registry entry to
+            a list of known values.
+        """
+        query_url = self.get_query_url(
+            endpoint=HackerTarget.DNSLOOKUP, params={"q": target}
+        )
+        return self._process_dnslookup(target, await self._query_service(url=query_url))
+
+    async def reverse_dns(self, target: str) -> dict[[IPv4Address, IPv6Address], str]:
+        """
+        Send an HTTP request to HackerTarget's "reverse_dns" API endpoint
+        and fetch the results
+
+        :param target: An IP address to search for in api.hackertarget.com
+
+        :return: A dictionary mapping the supplied IP address to a
+            resolved hostname
+        :raise: InvalidTargetError if set to a target that cannot be
+            cast into an IPv4/IPv6 address
+        """
+        query_url = self.get_query_url(
+            endpoint=HackerTarget.REVERSEDNS,
+            params={"q": validate_ip_address(target)},
+        )
+        return self._process_reverse_dns(
+            target, await self._query_service(url=query_url)
+        )
 
-        return {
-            "IP_ADDRESS": ip_address(response.group("ip_addr")),
-            "ASN": asn,
-            **self.asn[asn],
-        }
+    async def aslookup(self, target: str) -> dict[str, Any]:
+        """
+        Send an HTTP request to HackerTarget's "aslookup" API endpoint
+        and fetch the results
+
+        :param target: An IP address to search for in api.hackertarget.com.
+            Addresses within a network already found in the ASN cache are
+            answered without sending a request.
+
+        :return: A dictionary mapping the lookup results (IP address,
+            ASN, network address space and owner) to their respective
+            values
+        :raise: InvalidTargetError if set to a target that cannot be
+            cast into an IPv4/IPv6 address
+        """
+        ip_addr = validate_ip_address(target)
+        if (known := self.asn_cache.lookup(ip_addr)) is not None:
+            return known
+        query_url = self.get_query_url(
+            endpoint=HackerTarget.ASLOOKUP, params={"q": ip_addr}
+        )
+        return self._process_aslookup(await self._query_service(url=query_url))
+
+    async def reverse_dns_many(
+        self,
+        targets: Iterable,
+        concurrency: int = 4,
+        *,
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[tuple[str, [dict[[IPv4Address, IPv6Address], str], Exception]]]:
+        """
+        Resolve the hostnames of many IP addresses concurrently and
+        yield the results of each address as soon as they are available.
+        Addresses already resolved by this instance, or being resolved
+        for another target of the batch, are answered without a new
+        request.
+
+        :param targets: An iterable of IP addresses and networks
+        :param concurrency: Maximum number of addresses queried at the
+            same time
+        :param return_exceptions: Yield the exception raised for an
+            address in place of its result instead of raising it
+        """
+        resolve = _AsyncInFlight(validate_ip_address, self._coalesced_reverse_dns)
+        async for target, task in self._map_concurrently(
+            resolve, expand_ip_targets(targets), concurrency
+        ):
+            yield self._batch_result(target, task, True, return_exceptions)
+
+    async def aslookup_many(
+        self,
+        targets: Iterable,
+        concurrency: int = 4,
+        *,
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[tuple[str, [dict[str, Any], Exception]]]:
+        """
+        Look up the autonomous systems of many IP addresses concurrently
+        and yield the results of each address as soon as they are
+        available. Addresses within the network of an already known ASN
+        are answered without a new request, and addresses sharing the
+        /24 (IPv4) or /48 (IPv6) network of a lookup in flight wait for
+        it so that they can be answered from the ASN cache as well.
+
+        :param targets: An iterable of IP addresses and networks
+        :param concurrency: Maximum number of addresses queried at the
+            same time
+        :param return_exceptions: Yield the exception raised for an
+            address in place of its result instead of raising it
+        """
+        lookup = _AsyncInFlight(_routed_network, self.aslookup)
+        async for target, task in self._map_concurrently(
+            lookup, expand_ip_targets(targets), concurrency
+        ):
+            yield self._batch_result(target, task, True, return_exceptions)
+
+    async def _coalesced_reverse_dns(
+        self, target: str
+    ) -> dict[[IPv4Address, IPv6Address], str]:
+        if (known := self._known_hostname(target)) is not None:
+            return known
+        return await self.reverse_dns(target)
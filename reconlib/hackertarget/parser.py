@@ -0,0 +1,166 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import io
+from ipaddress import ip_address, IPv4Address, IPv6Address
+from typing import Iterator
+
+# Beginning of the messages sent by HackerTarget with a 200 status code
+# in place of results
+ERROR_PREFIXES = ("API count exceeded", "error ")
+QUOTA_EXCEEDED_PREFIX = ERROR_PREFIXES[0]
+
+
+def is_error_message(response: [str, bytes], encoding: str = "utf_8") -> bool:
+    """
+    Check whether a response is an error message sent by HackerTarget
+    in place of results. Only the first line is inspected, as error
+    messages are never preceded by results.
+
+    :param response: The body of a response, either decoded or as bytes
+    :param encoding: Encoding of the response if supplied as bytes
+    """
+    return next(iter_lines(response, encoding), "").startswith(ERROR_PREFIXES)
+
+
+def iter_lines(response: [str, bytes], encoding: str = "utf_8") -> Iterator[str]:
+    """
+    Iterate over the non-empty lines of a response without splitting it
+    into a list of lines first
+
+    :param response: The body of a response, either decoded or as bytes
+    :param encoding: Encoding of the response if supplied as bytes
+    :return: A generator of lines stripped of surrounding whitespace
+    """
+    if isinstance(response, str):
+        lines = io.StringIO(response)
+    else:
+        lines = io.TextIOWrapper(io.BytesIO(response), encoding=encoding)
+    for line in lines:
+        if line := line.strip():
+            yield line
+
+
+class HackerTargetParser:
+    def __init__(self, max_interned: int = 65536, intern_ip_addresses: bool = True):
+        """
+        Line-by-line parser of the plain-text responses of HackerTarget.
+        IP addresses and domain names repeated across lines and responses
+        are parsed and stored only once. Lines that do not match the
+        format of an endpoint, such as "API count exceeded" messages, are
+        collected instead of raising exceptions.
+
+        :param max_interned: Maximum number of IP addresses and domain
+            names kept for reuse before the tables are cleared
+        :param intern_ip_addresses: Keep parsed IP addresses for reuse.
+            Callers storing addresses as integers turn it off, as the
+            table would then hold the only references to the objects.
+        """
+        self.max_interned = max_interned
+        self.intern_ip_addresses = intern_ip_addresses
+        self._ip_addresses = {}
+        self._names = {}
+
+    def hostsearch(
+        self, lines: Iterator[str], errors: list[str]
+    ) -> Iterator[tuple[str, [IPv4Address, IPv6Address]]]:
+        """
+        Parse "domain,ip_address" lines
+
+        :param lines: The lines of a response from the endpoint
+        :param errors: A list to which malformed lines are appended
+        :return: A generator of tuples of a domain and its IP address
+        """
+        for line in lines:
+            domain, separator, ip_addr = line.partition(",")
+            if not separator or (ip_addr := self.ip_address(ip_addr)) is None:
+                errors.append(line)
+                continue
+            yield self.name(domain), ip_addr
+
+    def dnslookup(
+        self, lines: Iterator[str], errors: list[str]
+    ) -> Iterator[tuple[str, str]]:
+        """
+        Parse "record : value" lines
+
+        :param lines: The lines of a response from the endpoint
+        :param errors: A list to which malformed lines are appended
+        :return: A generator of tuples of a record type and its value
+        """
+        for line in lines:
+            record, separator, value = line.partition(" : ")
+            if not separator:
+                errors.append(line)
+                continue
+            yield self.name(record), value
+
+    def reverse_dns(
+        self, lines: Iterator[str], errors: list[str]
+    ) -> Iterator[tuple[[IPv4Address, IPv6Address], str]]:
+        """
+        Parse "ip_address hostname" lines
+
+        :param lines: The lines of a response from the endpoint
+        :param errors: A list to which malformed lines are appended
+        :return: A generator of tuples of an IP address and its hostname
+        """
+        for line in lines:
+            ip_addr, separator, domain = line.partition(" ")
+            if not separator or (ip_addr := self.ip_address(ip_addr)) is None:
+                errors.append(line)
+                continue
+            yield ip_addr, self.name(domain)
+
+    def ip_address(self, value: str) -> [IPv4Address, IPv6Address, None]:
+        """
+        Parse an IP address, reusing the object of a previous occurrence
+
+        :param value: The string representation of an IP address
+        :return: The IP address, or None if the string is not valid
+        """
+        if (ip_addr := self._ip_addresses.get(value)) is None:
+            try:
+                ip_addr = ip_address(value)
+            except ValueError:
+                return None
+            if not self.intern_ip_addresses:
+                return ip_addr
+            if len(self._ip_addresses) >= self.max_interned:
+                self._ip_addresses.clear()
+            self._ip_addresses[value] = ip_addr
+        return ip_addr
+
+    def name(self, value: str) -> str:
+        """
+        Get a single shared copy of a repeated string
+
+        :param value: A domain name or record type
+        """
+        if (name := self._names.get(value)) is None:
+            if len(self._names) >= self.max_interned:
+                self._names.clear()
+            name = self._names[value] = value
+        return name
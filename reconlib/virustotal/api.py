@@ -24,14 +24,37 @@ Contact: https://www.twitter.com/eon_raider
 """
 
 import json
+import re
 import urllib.error
 from collections import defaultdict
 from enum import Enum
 from pathlib import Path
+from typing import AsyncIterator, Iterator, TYPE_CHECKING
 from urllib.parse import urlunparse, urlencode, urlparse
 
-from reconlib.core.base import AuthenticatedExternalService
+from reconlib.core.base import AsyncExternalService, AuthenticatedExternalService
+from reconlib.core.metrics import timed_parser
 from reconlib.core.exceptions import APIKeyError
+from reconlib.core.rate_limit import TokenBucket
+from reconlib.core.retry import RetryPolicy
+from reconlib.core.transport import ConnectionPool
+from reconlib.core.utils.user_agents import UserAgentPool
+
+if TYPE_CHECKING:
+    from reconlib.core.cache import ResponseCache
+    from reconlib.core.index import SubdomainIndex
+    from reconlib.core.journal import ProgressJournal
+    from reconlib.core.metrics import MetricsRegistry
+    from reconlib.core.sinks import ResultSink
+
+# The "meta" object of a relationship response only holds scalar values
+# and the pagination cursor, so it can be located without parsing the
+# whole page
+_META_CURSOR = re.compile(r'"meta"\s*:\s*\{[^{}]*?"cursor"\s*:\s*"([^"]*)"')
+
+
+def _below(page: int, max_pages: [int, None]) -> bool:
+    return max_pages is None or page < max_pages
 
 
 class VirusTotal(Enum):
@@ -45,21 +68,32 @@ class VirusTotal(Enum):
 
 class VirusTotalAPI(AuthenticatedExternalService):
     service_name = "VirusTotal"
+    cache_ttl = 12 * 3600
+    requests_per_minute = 4  # Quota of the public API
 
     def __init__(
         self,
         *,
-        user_agent: str = None,
+        user_agent: [str, UserAgentPool] = None,
         encoding: str = "utf_8",
         api_key: [str, Path] = None,
         api_key_env_name: str = "VIRUSTOTAL_API_KEY",
+        transport: ConnectionPool = None,
+        cache: "ResponseCache" = None,
+        rate_limiter: TokenBucket = None,
+        retry_policy: RetryPolicy = None,
+        index: "SubdomainIndex" = None,
+        sink: "ResultSink" = None,
+        journal: "ProgressJournal" = None,
+        metrics: "MetricsRegistry" = None,
     ):
         """
         Wrapper for HTTP requests to the API of VirusTotal
 
         :param user_agent: User-agent string to use when querying the
-            VirusTotal API (defaults to None for a random user-agent
-            string to be used at each new request)
+            VirusTotal API, or a UserAgentPool from which a user-agent
+            is selected at each new request (defaults to None for a
+            random user-agent string to be used at each new request)
         :param encoding: Encoding used on responses provided by the
             VirusTotal API
         :param api_key: A string containing an API key for use in
@@ -68,8 +102,44 @@ class VirusTotalAPI(AuthenticatedExternalService):
         :param api_key_env_name: String representing the expected name
             of the environment variable from which the API key value
             will be read. Defaults to VIRUSTOTAL_API_KEY.
+        :param transport: Connection pool used to send requests to the
+            VirusTotal API (defaults to None for the pool shared by all
+            services)
+        :param cache: Cache in which responses from the VirusTotal API
+            are stored and looked up (defaults to None for no caching)
+        :param rate_limiter: Token bucket limiting the rate of requests
+            to the VirusTotal API (defaults to None for a bucket shared by
+            all VirusTotalAPI instances)
+        :param retry_policy: Policy defining how failed requests are
+            retried. Requests rejected for an invalid API key are raised
+            as APIKeyError without being retried (defaults to None for
+            the default RetryPolicy).
+        :param index: SubdomainIndex into which the subdomains of every
+            page of results are also written (defaults to None)
+        :param sink: ResultSink to which the subdomains of each page are
+            written as soon as the page is parsed (defaults to None)
+        :param journal: ProgressJournal recording every page fetched
+            along with the cursor of the next one, so that an
+            interrupted pagination resumes where it stopped and targets
+            already exhausted are skipped (defaults to None)
+        :param metrics: MetricsRegistry recording the duration, status
+            and size of every request along with the time spent parsing
+            each page (defaults to None)
         """
-        super().__init__(user_agent, encoding, api_key, api_key_env_name)
+        super().__init__(
+            user_agent,
+            encoding,
+            api_key,
+            api_key_env_name,
+            transport=transport,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            index=index,
+            sink=sink,
+            journal=journal,
+            metrics=metrics,
+        )
         self.results = defaultdict(dict)
         self.subdomains = defaultdict(set)
 
@@ -104,29 +174,272 @@ class VirusTotalAPI(AuthenticatedExternalService):
             )
         )
 
-    def fetch_subdomains(self, target: str, limit: int = 1000) -> set[str]:
+    def fetch_subdomains(
+        self, target: str, limit: int = 1000, max_pages: int = None
+    ) -> set[str]:
         """
-        Send an HTTP request to VirusTotal's "domains" API endpoint
-        and fetch the results from is "subdomains" relationship
+        Send HTTP requests to VirusTotal's "domains" API endpoint and
+        fetch every page of results from its "subdomains" relationship
 
         :param target: A domain name to search for in VirusTotal API
         :param limit: Maximum number of subdomains to retrieve per
             request
+        :param max_pages: Maximum number of pages to retrieve (defaults
+            to None to follow the pagination cursors until the
+            relationship is exhausted)
 
         :return: A set of strings containing each known subdomain
+        :raise: APIKeyError if the API key was rejected by VirusTotal
         """
-        query_url = self.get_query_url(
-            target=target, endpoint=VirusTotal.SUBDOMAINS, params={"limit": limit}
-        )
+        for _ in self.iter_subdomain_pages(target, limit, max_pages):
+            pass
+        return self.subdomains[target]
+
+    def iter_subdomain_pages(
+        self, target: str, limit: int = 1000, max_pages: int = None
+    ) -> Iterator[set[str]]:
+        """
+        Follow the pagination cursors of the "subdomains" relationship
+        and yield the subdomains of each page as soon as it arrives. The
+        next page is fetched in the background while the current one is
+        parsed and processed by the caller.
+
+        :param target: A domain name to search for in VirusTotal API
+        :param limit: Maximum number of subdomains to retrieve per
+            request
+        :param max_pages: Maximum number of pages to retrieve (defaults
+            to None to follow the pagination cursors until the
+            relationship is exhausted)
 
+        :return: A generator of sets of subdomains, one for each page
+        :raise: APIKeyError if the API key was rejected by VirusTotal
+
+        If the instance has a progress journal, every page is recorded
+        as it arrives and an interrupted pagination resumes from the
+        cursor of the last page recorded. A pagination stopped early by
+        "max_pages" is left unfinished in the journal in the same way.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            page, cursor, unfinished = self._resume_pagination(target)
+            future = (
+                prefetcher.submit(self._fetch_subdomains_page, target, limit, cursor)
+                if unfinished
+                else None
+            )
+            while future is not None:
+                response = future.result()
+                page += 1
+                next_cursor = self._next_cursor(response, cursor)
+                future = (
+                    prefetcher.submit(
+                        self._fetch_subdomains_page, target, limit, next_cursor
+                    )
+                    if next_cursor is not None and _below(page, max_pages)
+                    else None
+                )
+                subdomains = self._process_subdomains(
+                    target, response, first_page=page == 1
+                )
+                self._checkpoint_page(target, page, next_cursor, subdomains)
+                yield subdomains
+                cursor = next_cursor
+        if cursor is None:  # Not stopped early by max_pages
+            self._finish_pagination(target)
+
+    def _resume_pagination(self, target: str) -> tuple[int, [str, None], bool]:
+        """
+        Restore the pages of an interrupted pagination recorded in the
+        progress journal
+
+        :return: A tuple containing the number of pages already fetched,
+            the cursor of the next page and whether any page is left
+        """
+        if (
+            self.journal is None
+            or (progress := self.journal.resume_pages(self.service_name, target))
+            is None
+        ):
+            return 0, None, True
+        page, cursor, subdomains = progress
+        self.subdomains[target].update(subdomains)
+        return page, cursor, cursor is not None
+
+    def _checkpoint_page(
+        self, target: str, page: int, cursor: [str, None], subdomains: set[str]
+    ) -> None:
+        if self.journal is not None:
+            self.journal.checkpoint_page(
+                self.service_name, target, page, cursor, subdomains
+            )
+
+    def _finish_pagination(self, target: str) -> None:
+        if self.journal is not None:
+            self.journal.complete(
+                self.service_name, "subdomains", target, self.subdomains[target]
+            )
+
+    def _fetch_subdomains_page(
+        self, target: str, limit: int, cursor: str = None
+    ) -> str:
+        """
+        Fetch a single page of the "subdomains" relationship
+        """
         try:
-            response = self._query_service(url=query_url, headers=self.headers)
-            parsed_response = json.loads(response)
-        except urllib.error.HTTPError:
-            raise APIKeyError("Unauthorized. Check the API key settings and try again.")
+            return self._query_service(
+                url=self._subdomains_url(target, limit, cursor), headers=self.headers
+            )
+        except urllib.error.HTTPError as e:
+            if e.code in (401, 403):
+                raise APIKeyError(
+                    "Unauthorized. Check the API key settings and try again."
+                ) from e
+            raise
 
-        self.results[target].update(parsed_response)
-        subdomains = {host["id"] for host in parsed_response["data"]}
-        self.subdomains[target] = subdomains
+    def _subdomains_url(self, target: str, limit: int, cursor: str = None) -> str:
+        params = {"limit": limit}
+        if cursor is not None:
+            params["cursor"] = cursor
+        return self.get_query_url(
+            target=target, endpoint=VirusTotal.SUBDOMAINS, params=params
+        )
+
+    @staticmethod
+    def _next_cursor(response: str, cursor: [str, None]) -> [str, None]:
+        """
+        Extract the cursor of the page following a given response
+
+        :return: The cursor string or None if the relationship is
+            exhausted
+        """
+        if (match := _META_CURSOR.search(response)) is None:
+            return None
+        # Stop if the service hands back the cursor that was just used
+        if not (next_cursor := match.group(1)) or next_cursor == cursor:
+            return None
+        return next_cursor
 
+    @timed_parser("subdomains")
+    def _process_subdomains(
+        self, target: str, response: str, first_page: bool = True
+    ) -> set[str]:
+        """
+        Parse a page of the "subdomains" relationship and store its
+        results. The first page of a target replaces any previous
+        results and each subsequent page is appended to them.
+
+        :return: The set of subdomains found in the page
+        """
+        parsed_response = json.loads(response)
+        subdomains = {host["id"] for host in parsed_response["data"]}
+        if first_page:
+            self.results[target] = parsed_response
+            self.subdomains[target] = set(subdomains)
+        else:
+            results = self.results[target]
+            results.setdefault("data", []).extend(parsed_response["data"])
+            results.update(
+                (key, value) for key, value in parsed_response.items() if key != "data"
+            )
+            self.subdomains[target].update(subdomains)
+        self._record_subdomains(target, subdomains)
         return subdomains
+
+
+class AsyncVirusTotalAPI(AsyncExternalService, VirusTotalAPI):
+    """
+    Asynchronous wrapper for HTTP requests to the API of VirusTotal.
+    Accepts the same arguments as VirusTotalAPI, with "transport" set to
+    an AsyncConnectionPool if supplied.
+    """
+
+    async def fetch_subdomains(
+        self, target: str, limit: int = 1000, max_pages: int = None
+    ) -> set[str]:
+        """
+        Send HTTP requests to VirusTotal's "domains" API endpoint and
+        fetch every page of results from its "subdomains" relationship
+
+        :param target: A domain name to search for in VirusTotal API
+        :param limit: Maximum number of subdomains to retrieve per
+            request
+        :param max_pages: Maximum number of pages to retrieve (defaults
+            to None to follow the pagination cursors until the
+            relationship is exhausted)
+
+        :return: A set of strings containing each known subdomain
+        :raise: APIKeyError if the API key was rejected by VirusTotal
+        """
+        async for _ in self.iter_subdomain_pages(target, limit, max_pages):
+            pass
+        return self.subdomains[target]
+
+    async def iter_subdomain_pages(
+        self, target: str, limit: int = 1000, max_pages: int = None
+    ) -> AsyncIterator[set[str]]:
+        """
+        Follow the pagination cursors of the "subdomains" relationship
+        and yield the subdomains of each page as soon as it arrives. The
+        next page is fetched concurrently while the current one is
+        parsed and processed by the caller.
+
+        :param target: A domain name to search for in VirusTotal API
+        :param limit: Maximum number of subdomains to retrieve per
+            request
+        :param max_pages: Maximum number of pages to retrieve (defaults
+            to None to follow the pagination cursors until the
+            relationship is exhausted)
+
+        :return: An asynchronous generator of sets of subdomains, one
+            for each page
+        :raise: APIKeyError if the API key was rejected by VirusTotal
+        """
+        import asyncio
+
+        page, cursor, unfinished = self._resume_pagination(target)
+        task = (
+            asyncio.create_task(self._fetch_subdomains_page(target, limit, cursor))
+            if unfinished
+            else None
+        )
+        try:
+            while task is not None:
+                response = await task
+                page += 1
+                next_cursor = self._next_cursor(response, cursor)
+                task = (
+                    asyncio.create_task(
+                        self._fetch_subdomains_page(target, limit, next_cursor)
+                    )
+                    if next_cursor is not None and _below(page, max_pages)
+                    else None
+                )
+                subdomains = self._process_subdomains(
+                    target, response, first_page=page == 1
+                )
+                self._checkpoint_page(target, page, next_cursor, subdomains)
+                yield subdomains
+                cursor = next_cursor
+        finally:
+            if task is not None:
+                task.cancel()
+        if cursor is None:  # Not stopped early by max_pages
+            self._finish_pagination(target)
+
+    async def _fetch_subdomains_page(
+        self, target: str, limit: int, cursor: str = None
+    ) -> str:
+        """
+        Fetch a single page of the "subdomains" relationship
+        """
+        try:
+            return await self._query_service(
+                url=self._subdomains_url(target, limit, cursor), headers=self.headers
+            )
+        except urllib.error.HTTPError as e:
+            if e.code in (401, 403):
+                raise APIKeyError(
+                    "Unauthorized. Check the API key settings and try again."
+                ) from e
+            raise
@@ -0,0 +1,101 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import time
+
+import pytest
+
+from reconlib.crtsh.names import SubdomainExtractor
+
+
+@pytest.fixture
+def certificates() -> list[dict]:
+    return [
+        {
+            "common_name": f"*.Host{i % 5000}.example.com",
+            "name_value": f"*.host{i % 5000}.example.com\nhost{i % 5000}.example.com."
+            f"\nwww.host{i}.example.com\nhost{i}.example.net\nadmin@example.com",
+        }
+        for i in range(100_000)
+    ]
+
+
+def _best_of(function, *args, rounds: int = 3) -> tuple[float, set]:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def _common_names(certificates: list[dict]) -> set[str]:
+    return {certificate["common_name"] for certificate in certificates}
+
+
+def _multi_pass(certificates: list[dict]) -> set[str]:
+    names = [
+        name
+        for certificate in certificates
+        for field in (certificate["common_name"], certificate["name_value"])
+        for name in field.split("\n")
+    ]
+    names = [name.strip().lower().rstrip(".") for name in names]
+    names = [name[2:] if name.startswith("*.") else name for name in names]
+    return {
+        name for name in names if name == "example.com" or name.endswith(".example.com")
+    }
+
+
+def _extractor(certificates: list[dict]) -> set[str]:
+    (extractor := SubdomainExtractor("example.com")).update(certificates)
+    return extractor.subdomains
+
+
+@pytest.mark.benchmark
+class TestSubdomainExtractionBenchmark:
+    def test_extraction(self, certificates):
+        """
+        GIVEN a large number of certificates containing lists of
+            subject alternative names
+        WHEN subdomains are extracted by collecting common names only,
+            by normalizing every name in several passes and by a
+            SubdomainExtractor
+        THEN the SubdomainExtractor must find the same subdomains as the
+            multi-pass normalization
+        """
+        common_names_time, common_names = _best_of(_common_names, certificates)
+        multi_pass_time, multi_pass = _best_of(_multi_pass, certificates)
+        extractor_time, extracted = _best_of(_extractor, certificates)
+
+        print(
+            f"\ncommon names only: {common_names_time:.3f}s "
+            f"({len(common_names)} names)"
+            f"\nmulti-pass normalization: {multi_pass_time:.3f}s "
+            f"({len(multi_pass)} names)"
+            f"\nSubdomainExtractor: {extractor_time:.3f}s ({len(extracted)} names)"
+        )
+        assert extracted == multi_pass
+        assert len(extracted) > len(common_names)
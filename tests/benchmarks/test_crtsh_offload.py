@@ -0,0 +1,102 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from reconlib import CRTShAPI
+from reconlib.core.rate_limit import TokenBucket
+from tests.mock_server import MockServiceServer
+
+TARGETS = [f"target{i}.com" for i in range(12)]
+
+
+class _Heartbeat(threading.Thread):
+    """
+    Thread waking up every millisecond to measure the longest time it
+    was kept from running, e.g. by another thread holding the GIL
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.longest_stall = 0.0
+        self._stopped = threading.Event()
+
+    def run(self):
+        last = time.perf_counter()
+        while not self._stopped.wait(0.001):
+            now = time.perf_counter()
+            self.longest_stall = max(self.longest_stall, now - last)
+            last = now
+
+    def stop(self) -> float:
+        self._stopped.set()
+        self.join()
+        return self.longest_stall
+
+
+def _sweep(server: MockServiceServer, executor=None) -> tuple[dict, float, float]:
+    crtsh = CRTShAPI(
+        transport=server.connection_pool(),
+        rate_limiter=TokenBucket(math.inf),
+        parse_executor=executor,
+    )
+    heartbeat = _Heartbeat()
+    heartbeat.start()
+    start = time.perf_counter()
+    results = dict(crtsh.fetch_subdomains_many(TARGETS, concurrency=4))
+    return results, time.perf_counter() - start, heartbeat.stop()
+
+
+@pytest.mark.benchmark
+class TestCRTShOffloadBenchmark:
+    def test_process_pool_parsing(self):
+        """
+        GIVEN crt.sh responses of 10,000 certificates each
+        WHEN the subdomains of many targets are fetched concurrently,
+            first parsing responses in-process and then in a process
+            pool
+        THEN both sweeps must find the same subdomains and the wall time
+            and the longest stall of other threads must be reported
+        """
+        workers = max(2, os.cpu_count() or 1)
+        with MockServiceServer(records=10_000) as server:
+            _sweep(server)  # Warm up the responses generated by the server
+            in_process, elapsed, stall = _sweep(server)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                offloaded, offloaded_elapsed, offloaded_stall = _sweep(server, executor)
+
+        print(
+            f"\nin-process: {elapsed:.2f}s (longest stall {stall * 1000:.0f}ms)"
+            f"\nprocess pool of {workers}: {offloaded_elapsed:.2f}s "
+            f"(longest stall {offloaded_stall * 1000:.0f}ms)"
+        )
+        assert offloaded == in_process
+        assert all(len(names) == 20_000 for names in offloaded.values())
@@ -0,0 +1,90 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import time
+from collections import defaultdict
+from ipaddress import ip_address
+
+import pytest
+
+from reconlib.hackertarget.parser import HackerTargetParser, iter_lines
+
+
+@pytest.fixture
+def hostsearch_response() -> str:
+    return "".join(
+        f"host{i}.example.com,10.{i % 7}.{i % 13}.{i % 23}\n" for i in range(100_000)
+    )
+
+
+def _best_of(function, *args, rounds: int = 3) -> tuple[float, tuple]:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def _split_lines(response: str) -> tuple:
+    results, subdomains = defaultdict(dict), defaultdict(set)
+    ip_addresses = defaultdict(set)
+    for result in response.rstrip().split("\n"):
+        domain, ip_addr = result.split(",")
+        ip_addr = ip_address(ip_addr)
+        results["example.com"].update({ip_addr: domain})
+        subdomains["example.com"].add(domain)
+        ip_addresses["example.com"].add(ip_addr)
+    return results["example.com"], subdomains["example.com"]
+
+
+def _line_parser(response: str) -> tuple:
+    results, subdomains, ip_addresses, errors = {}, set(), set(), []
+    lines = iter_lines(response)
+    for domain, ip_addr in HackerTargetParser().hostsearch(lines, errors):
+        results[ip_addr] = domain
+        subdomains.add(domain)
+        ip_addresses.add(ip_addr)
+    return results, subdomains
+
+
+@pytest.mark.benchmark
+class TestHackerTargetParserBenchmark:
+    def test_hostsearch(self, hostsearch_response):
+        """
+        GIVEN a "hostsearch" response of 100,000 lines
+        WHEN it is parsed by splitting it into lines and by the
+            HackerTargetParser
+        THEN both parsers must produce the same results
+        """
+        split_time, split_results = _best_of(_split_lines, hostsearch_response)
+        parser_time, parser_results = _best_of(_line_parser, hostsearch_response)
+
+        print(
+            f"\nsplit lines: {split_time:.3f}s"
+            f"\nHackerTargetParser: {parser_time:.3f}s "
+            f"({split_time / parser_time:.1f}x)"
+        )
+        assert parser_results == split_results
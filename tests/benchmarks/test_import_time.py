@@ -0,0 +1,78 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import compileall
+import subprocess
+import sys
+import time
+
+import pytest
+
+
+def _startup_time(code: str, cwd, runs: int = 10) -> float:
+    """
+    Get the shortest time taken by a fresh interpreter to run some code
+    """
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=cwd, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.fixture
+def compiled_package(root_dir):
+    """
+    Compile the package to bytecode as installers do, so that the time
+    taken to compile sources is not measured when the interpreter is
+    not allowed to write bytecode itself
+    """
+    compileall.compile_dir(root_dir.joinpath("reconlib"), quiet=1)
+
+
+@pytest.mark.benchmark
+class TestImportTimeBenchmark:
+    # Limits sit slightly above the times measured on a single-core
+    # machine: about 0.5ms, 43ms and 46ms respectively. Most of the
+    # time of a service is spent importing http.client and ssl.
+    @pytest.mark.parametrize(
+        "code, limit",
+        [
+            ("import reconlib", 0.005),
+            ("from reconlib import HackerTargetAPI", 0.05),
+            ("from reconlib import CRTShAPI, HackerTargetAPI, VirusTotalAPI", 0.055),
+        ],
+    )
+    def test_import_time(self, root_dir, compiled_package, code, limit):
+        """
+        GIVEN a fresh Python interpreter
+        WHEN the package or some of its services are imported
+        THEN the time added to the start-up of the interpreter must stay
+            below a fixed limit
+        """
+        elapsed = _startup_time(code, root_dir) - _startup_time("pass", root_dir)
+        print(f"\n{code}: {elapsed * 1000:.1f}ms")
+        assert elapsed < limit
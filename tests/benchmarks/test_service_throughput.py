@@ -0,0 +1,193 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import asyncio
+import functools
+import math
+import multiprocessing
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from reconlib import (
+    AsyncCRTShAPI,
+    AsyncHackerTargetAPI,
+    AsyncVirusTotalAPI,
+    CRTShAPI,
+    HackerTargetAPI,
+    VirusTotalAPI,
+)
+from reconlib.core.async_transport import AsyncConnectionPool
+from reconlib.core.rate_limit import TokenBucket
+from reconlib.core.transport import ConnectionPool
+from tests.mock_server import MockServiceServer
+
+TARGETS = [f"target{i}.com" for i in range(300)]
+SERVICES = {
+    "CRTSh": (CRTShAPI, AsyncCRTShAPI),
+    "HackerTarget": (HackerTargetAPI, AsyncHackerTargetAPI),
+    "VirusTotal": (VirusTotalAPI, AsyncVirusTotalAPI),
+}
+
+
+@pytest.fixture(scope="module")
+def mock_server():
+    with MockServiceServer(records=200, latency=0.005, jitter=0.005, seed=0) as server:
+        yield server
+
+
+def _service(cls, transport, api_key):
+    kwargs = {"api_key": api_key} if "VirusTotal" in cls.__name__ else {}
+    return cls(transport=transport, rate_limiter=TokenBucket(math.inf), **kwargs)
+
+
+def _timed(fetch, latencies: list[float]):
+    """
+    Wrap the fetch_subdomains method of a service so that the duration
+    of every call is appended to a list
+    """
+    if asyncio.iscoroutinefunction(fetch):
+
+        @functools.wraps(fetch)
+        async def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fetch(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+    else:
+
+        @functools.wraps(fetch)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fetch(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+    return timed
+
+
+def _run(mode: str, sync_cls, async_cls, origins, api_key, latencies) -> int:
+    if mode == "async":
+
+        async def fetch_all():
+            pool = AsyncConnectionPool(origins=origins)
+            service = _service(async_cls, pool, api_key)
+            service.fetch_subdomains = _timed(service.fetch_subdomains, latencies)
+            return [
+                result
+                async for result in service.fetch_subdomains_many(
+                    TARGETS, concurrency=16, retain=False
+                )
+            ]
+
+        return len(asyncio.run(fetch_all()))
+
+    pool = ConnectionPool(origins=origins, max_size=16)
+    service = _service(sync_cls, pool, api_key)
+    service.fetch_subdomains = _timed(service.fetch_subdomains, latencies)
+    if mode == "sequential":
+        for target in TARGETS:
+            service.fetch_subdomains(target)
+            service.discard(target)
+        return len(TARGETS)
+    return sum(
+        1 for _ in service.fetch_subdomains_many(TARGETS, concurrency=16, retain=False)
+    )
+
+
+def _peak_rss() -> float:
+    """
+    Get the peak resident set size of the current process in MiB. On
+    Linux, ru_maxrss also accounts for the process this one was forked
+    from, so the high-water mark of the process itself is read instead.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 2**10
+    except OSError:
+        pass
+    import resource
+
+    # Kilobytes on Linux, bytes on macOS
+    unit = 2**20 if sys.platform == "darwin" else 2**10
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit
+
+
+def _client_memory(mode: str, service_name: str, origins, api_key) -> tuple:
+    """
+    Run the client of a case in a process of its own, apart from the
+    mock server, and get its peak resident set size along with the
+    growth of that peak during the run, both in MiB
+    """
+    before = _peak_rss()
+    _run(mode, *SERVICES[service_name], origins, api_key, [])
+    peak = _peak_rss()
+    return peak, peak - before
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("mode", ["sequential", "threaded", "async"])
+@pytest.mark.parametrize("service_name", SERVICES)
+def test_throughput(mock_server, api_key, service_name, mode):
+    """
+    GIVEN a local MockServiceServer answering with some latency
+    WHEN the subdomains of many targets are fetched from a service in
+        each execution mode
+    THEN the requests per second, the latency percentiles and the peak
+        memory of the client must be reported. Memory is measured in a
+        second run in a fresh process, so that it excludes the mock
+        server and the cases run before.
+    """
+    latencies = []
+    requests = sum(mock_server.statistics.get(service_name, {}).values())
+    start = time.perf_counter()
+    fetched = _run(
+        mode, *SERVICES[service_name], mock_server.origins, api_key, latencies
+    )
+    elapsed = time.perf_counter() - start
+    requests = sum(mock_server.statistics[service_name].values()) - requests
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    assert fetched == len(TARGETS)
+    assert len(latencies) == len(TARGETS)
+
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+        peak_memory, growth = pool.submit(
+            _client_memory, mode, service_name, mock_server.origins, api_key
+        ).result()
+    print(
+        f"\n{service_name:<12} {mode:<10} {requests / elapsed:8.0f} req/s  "
+        f"p50 {percentiles[49] * 1000:6.1f}ms  p99 {percentiles[98] * 1000:6.1f}ms  "
+        f"peak RSS {peak_memory:.1f} MiB (+{growth:.1f} MiB)"
+    )
@@ -0,0 +1,57 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import time
+
+import pytest
+
+from reconlib.core.snapshots import SnapshotStore
+
+
+@pytest.mark.benchmark
+class TestSnapshotDiffBenchmark:
+    def test_diff_one_million_names(self, tmp_path):
+        """
+        GIVEN a snapshot of 1,000,000 subdomains
+        WHEN it is compared with a new run in which 1% of the names
+            changed
+        THEN the diff, including loading and saving the snapshot, must
+            take less than a second
+        """
+        names = {f"host{i}.api{i % 100}.example.com" for i in range(1_000_000)}
+        store = SnapshotStore(tmp_path.joinpath("snapshots.db"))
+        store.save("CRTSh", "example.com", names)
+
+        current = {name for i, name in enumerate(names) if i % 100}
+        current.update(f"new{i}.example.com" for i in range(10_000))
+
+        start = time.perf_counter()
+        diff = store.diff("CRTSh", "example.com", current)
+        elapsed = time.perf_counter() - start
+
+        print(f"\ndiff of 1,000,000 names: {elapsed:.3f}s")
+        assert len(diff.added) == 10_000
+        assert len(diff.removed) == 10_000
+        assert elapsed < 1
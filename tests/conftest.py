@@ -0,0 +1,105 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import time
+
+import pytest
+
+from reconlib.core.base import ExternalService
+from reconlib.core.transport import ConnectionPool
+
+
+class LocalService(ExternalService):
+    """
+    Service sending its requests to the local server of the tests, which
+    answers each request with its path. The body of "/error" is treated
+    as an error message that must not be cached.
+    """
+
+    service_name = "Local"
+
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(user_agent=None, encoding="utf_8", **kwargs)
+        self.base_url = base_url
+
+    def get_query_url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def fetch_subdomains(self, target: str) -> set[str]:
+        return set()
+
+    def _is_cacheable(self, body: bytes) -> bool:
+        return body != b"/error"
+
+
+class StubService(ExternalService):
+    """
+    Service answering from memory after a delay instead of sending
+    requests. Targets are answered from "answers", if supplied, or with
+    a single "www" subdomain. Targets starting with "invalid" or absent
+    from the answers raise ConnectionError.
+    """
+
+    def __init__(
+        self, name: str = "Stub", delay: float = 0.0, answers: dict = None
+    ):
+        self.service_name = name
+        super().__init__(user_agent=None, encoding="utf_8")
+        self.delay = delay
+        self.answers = answers
+        self.subdomains, self.results = {}, {}
+
+    def get_query_url(self, target: str) -> str:
+        return f"https://{self.service_name.lower()}.test/{target}"
+
+    def fetch_subdomains(self, target: str) -> set[str]:
+        time.sleep(self.delay)
+        self.subdomains[target] = self._answer(target)
+        return self.subdomains[target]
+
+    def _answer(self, target: str) -> set[str]:
+        if target.startswith("invalid") or (
+            self.answers is not None and target not in self.answers
+        ):
+            raise ConnectionError(f"{self.service_name} failed")
+        return {f"www.{target}"} if self.answers is None else self.answers[target]
+
+
+@pytest.fixture
+def local_service(local_server):
+    """
+    Factory of LocalService instances, each sending its requests to the
+    local server through a ConnectionPool of its own
+    """
+    services = []
+
+    def build(**kwargs) -> LocalService:
+        service = LocalService(local_server, transport=ConnectionPool(), **kwargs)
+        services.append(service)
+        return service
+
+    yield build
+    for service in services:
+        service.transport.clear()
@@ -25,7 +25,7 @@ Contact: https://www.twitter.com/eon_raider
 
 import pytest
 
-from reconlib import CRTShAPI, HackerTargetAPI, VirusTotalAPI
+from reconlib import CRTShAPI, HackerTargetAPI, Recon, VirusTotalAPI
 
 
 @pytest.mark.external_fetch
@@ -39,10 +39,9 @@ class TestFetchFromAll:
             retrieved without errors
         """
         """
-        Execute a live fetch from all available APIs on ReconLib. This
-        test is single-threaded, possibly consumes API usage quotas,
-        will perform external HTTP requests and takes several seconds
-        to complete.
+        Execute a live fetch from all available APIs on ReconLib. All
+        services are queried concurrently, possibly consuming API usage
+        quotas, and external HTTP requests are performed.
         """
         # A file named .env located at the project root and defining
         # an API key for VirusTotal is required for this test
@@ -54,8 +53,6 @@ class TestFetchFromAll:
             VirusTotalAPI(api_key=virus_total_api_key),
         )
 
-        subdomains = set().union(
-            *(api.fetch_subdomains(target="nmap.com") for api in all_apis)
-        )
+        subdomains = Recon(all_apis).fetch_subdomains(targets=["nmap.com"])
 
-        assert subdomains  # <-- Add breakpoint here to inspect results
+        assert subdomains["nmap.com"]  # <-- Add breakpoint here to inspect results
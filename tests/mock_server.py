@@ -0,0 +1,321 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from ipaddress import IPv4Address, ip_network
+from urllib.parse import parse_qs, urlsplit
+
+from reconlib.core.async_transport import AsyncConnectionPool
+from reconlib.core.transport import ConnectionPool
+
+# Origins of the services imitated by MockServiceServer
+MOCKED_ORIGINS = (
+    "https://crt.sh",
+    "https://api.hackertarget.com",
+    "https://www.virustotal.com",
+)
+
+_HACKERTARGET_ENDPOINTS = frozenset(
+    {"/hostsearch/", "/dnslookup/", "/reversedns/", "/aslookup/"}
+)
+_VIRUSTOTAL_PREFIX = "/api/v3/domains/"
+
+
+class _MockServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send the headers and the body of responses without waiting for
+    # acknowledgements, which would otherwise dominate measured latency
+    disable_nagle_algorithm = True
+    server: "_MockHTTPServer"
+
+    def do_GET(self):
+        mock = self.server.mock
+        parts = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        if parts.path == "/" and "q" in query:
+            service, respond = "CRTSh", mock.crtsh_response
+        elif parts.path in _HACKERTARGET_ENDPOINTS:
+            service, respond = "HackerTarget", mock.hackertarget_response
+        elif parts.path.startswith(_VIRUSTOTAL_PREFIX):
+            service, respond = "VirusTotal", mock.virustotal_response
+        else:
+            return self._send(404, "Unknown", b"")
+
+        mock.delay()
+        if (status := mock.injected_status()) is not None:
+            return self._send(status, service, b"")
+        if service == "VirusTotal" and "x-apikey" not in self.headers:
+            return self._send(
+                401, service, b'{"error": {"code": "WrongCredentialsError"}}'
+            )
+        return self._send(200, service, respond(parts.path, query))
+
+    def _send(self, status: int, service: str, body: bytes) -> None:
+        self.server.mock.record(service, status)
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", str(self.server.mock.retry_after))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # Many clients may connect at once
+    mock: "MockServiceServer"
+
+
+class MockServiceServer:
+    def __init__(
+        self,
+        *,
+        records: int = 100,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.0,
+        seed: int = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Local HTTP server imitating the crt.sh, HackerTarget and
+        VirusTotal endpoints used by ReconLib, so that transport,
+        parsing and concurrency can be exercised without network access.
+        Services are pointed at the server through the "origins" of a
+        connection pool. Responses are generated deterministically from
+        the target, so that the same target always yields the same
+        subdomains.
+
+        :param records: Number of records (certificates, hosts or
+            subdomains) returned for each target
+        :param latency: Number of seconds every response is delayed
+        :param jitter: Maximum number of seconds randomly added to the
+            latency of each response
+        :param error_rate: Fraction of requests answered with a 503
+            status code
+        :param throttle_rate: Fraction of requests answered with a 429
+            status code
+        :param retry_after: Value of the Retry-After header sent with
+            429 responses
+        :param seed: Seed of the random number generator deciding which
+            requests fail
+        :param host: Address the server binds to
+        :param port: Port the server binds to (defaults to 0 for any
+            free port)
+        """
+        self.records = records
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = Counter()
+        self._bodies = {}
+        self._server = _MockHTTPServer((host, port), _MockServiceHandler)
+        self._server.mock = self
+        self._thread = None
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(url={self.url}, records={self.records}, "
+            f"latency={self.latency}, error_rate={self.error_rate}, "
+            f"throttle_rate={self.throttle_rate})"
+        )
+
+    def __enter__(self) -> "MockServiceServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def origins(self) -> dict[str, str]:
+        """
+        A dictionary mapping the origin of each mocked service to the
+        URL of the server, as expected by connection pools
+        """
+        return {origin: self.url for origin in MOCKED_ORIGINS}
+
+    @property
+    def statistics(self) -> dict[str, dict[int, int]]:
+        """
+        A dictionary mapping the name of each service to the number of
+        responses sent with each status code
+        """
+        statistics = {}
+        with self._lock:
+            for (service, status), count in sorted(self._requests.items()):
+                statistics.setdefault(service, {})[status] = count
+        return statistics
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                kwargs={"poll_interval": 0.05},
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def connection_pool(self, **kwargs) -> ConnectionPool:
+        """
+        Create a connection pool sending the requests of every mocked
+        service to the server
+
+        :param kwargs: Any additional arguments of ConnectionPool
+        """
+        return ConnectionPool(origins=self.origins, **kwargs)
+
+    def async_connection_pool(self, **kwargs) -> AsyncConnectionPool:
+        """
+        Create an asyncio connection pool sending the requests of every
+        mocked service to the server
+
+        :param kwargs: Any additional arguments of AsyncConnectionPool
+        """
+        return AsyncConnectionPool(origins=self.origins, **kwargs)
+
+    def delay(self) -> None:
+        if delay := self.latency + (self._uniform(self.jitter) if self.jitter else 0):
+            time.sleep(delay)
+
+    def injected_status(self) -> [int, None]:
+        """
+        Decide whether a request must fail
+        :return: The status code of the failure or None
+        """
+        if not (self.error_rate or self.throttle_rate):
+            return None
+        roll = self._uniform(1.0)
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 503
+        return None
+
+    def record(self, service: str, status: int) -> None:
+        with self._lock:
+            self._requests[service, status] += 1
+
+    def crtsh_response(self, path: str, query: dict[str, str]) -> bytes:
+        target = query["q"].removeprefix("%.").lower()
+        return self._cached("crtsh", target, self._certificates)
+
+    def hackertarget_response(self, path: str, query: dict[str, str]) -> bytes:
+        endpoint, target = path.strip("/"), query.get("q", "")
+        return self._cached(endpoint, target, getattr(self, f"_{endpoint}"))
+
+    def virustotal_response(self, path: str, query: dict[str, str]) -> bytes:
+        target = path.removeprefix(_VIRUSTOTAL_PREFIX).split("/", 1)[0].lower()
+        limit = int(query.get("limit", 10))
+        offset = int(query.get("cursor", 0))
+        names = self._names(target)
+        page = names[offset : offset + limit]
+        meta = {"count": len(names)}
+        if offset + limit < len(names):
+            meta["cursor"] = str(offset + limit)
+        return json.dumps(
+            {
+                "meta": meta,
+                "data": [{"id": name, "type": "domain"} for name in page],
+            }
+        ).encode()
+
+    def _uniform(self, upper: float) -> float:
+        with self._lock:
+            return self._random.uniform(0, upper)
+
+    def _cached(self, kind: str, target: str, build) -> bytes:
+        if (body := self._bodies.get((kind, target))) is None:
+            body = self._bodies[kind, target] = build(target).encode()
+        return body
+
+    def _names(self, target: str) -> list[str]:
+        return [f"host{i}.{target}" for i in range(self.records)]
+
+    def _certificates(self, target: str) -> str:
+        return json.dumps(
+            [
+                {
+                    "issuer_ca_id": 185756,
+                    "issuer_name": "C=US, O=Mock CA, CN=Mock TLS CA",
+                    "common_name": name,
+                    "name_value": f"{name}\nwww.{name}",
+                    "id": i + 1,
+                    "entry_timestamp": "2023-01-01T00:00:00.123",
+                    "not_before": "2023-01-01T00:00:00",
+                    "not_after": "2024-01-01T00:00:00",
+                    "serial_number": f"{i:032x}",
+                }
+                for i, name in enumerate(self._names(target))
+            ]
+        )
+
+    def _hostsearch(self, target: str) -> str:
+        return "".join(
+            f"{name},{IPv4Address(0x0A000000 + i)}\n"
+            for i, name in enumerate(self._names(target))
+        )
+
+    def _dnslookup(self, target: str) -> str:
+        return (
+            "A : 10.0.0.1\n"
+            f"MX : 10 mail.{target}.\n"
+            f"NS : ns1.{target}.\n"
+            f"NS : ns2.{target}.\n"
+        )
+
+    def _reversedns(self, target: str) -> str:
+        return f"{target} host-{target.replace('.', '-')}.example.com\n"
+
+    def _aslookup(self, target: str) -> str:
+        network = ip_network(f"{target}/24", strict=False)
+        return f'"{target}","64512","{network}","MOCK-AS, ZZ"\n'
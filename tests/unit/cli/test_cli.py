@@ -0,0 +1,124 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import io
+import json
+
+import pytest
+
+from reconlib import cli
+from reconlib.cli import main, read_targets
+
+RESULTS = {
+    "CRTShAPI": {
+        "github.com": {"api.github.com", "www.github.com"},
+        "nmap.org": {"svn.nmap.org"},
+    },
+    "HackerTargetAPI": {
+        "github.com": {"www.github.com", "gist.github.com"},
+        "nmap.org": {"svn.nmap.org", "scanme.nmap.org"},
+    },
+}
+
+
+@pytest.fixture
+def services(mocker):
+    def fake_fetch(name):
+        def fetch_subdomains(self, target):
+            if target not in RESULTS[name]:
+                raise ConnectionError("unreachable")
+            return RESULTS[name][target]
+
+        return fetch_subdomains
+
+    mocker.patch("reconlib.crtsh.api.CRTShAPI.fetch_subdomains", fake_fetch("CRTShAPI"))
+    mocker.patch(
+        "reconlib.hackertarget.api.HackerTargetAPI.fetch_subdomains",
+        fake_fetch("HackerTargetAPI"),
+    )
+
+
+class TestCLI:
+    def test_read_targets(self):
+        file = io.StringIO("nmap.org\n\n# comment\n  example.com  \n")
+        assert list(read_targets(["github.com"], file)) == [
+            "github.com",
+            "nmap.org",
+            "example.com",
+        ]
+
+    def test_plain_output(self, services, capsys):
+        """
+        GIVEN targets passed as command-line arguments
+        WHEN the command is run with the default sources
+        THEN every subdomain found by any source must be written once
+            per line and the exit status must be 0
+        """
+        assert main(["github.com", "nmap.org", "-c", "2"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert sorted(lines) == sorted(
+            {
+                *RESULTS["CRTShAPI"]["github.com"],
+                *RESULTS["HackerTargetAPI"]["github.com"],
+                *RESULTS["CRTShAPI"]["nmap.org"],
+                *RESULTS["HackerTargetAPI"]["nmap.org"],
+            }
+        )
+
+    def test_ndjson_output_from_stdin(self, services, capsys, monkeypatch):
+        """
+        GIVEN targets written to the standard input
+        WHEN the command is run with a single source and NDJSON output
+        THEN one JSON object must be written for each target, source and
+            subdomain
+        """
+        monkeypatch.setattr("sys.stdin", io.StringIO("github.com\nnmap.org\n"))
+        assert main(["-s", "crtsh", "-o", "ndjson"]) == 0
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert {(r["target"], r["subdomain"]) for r in records} == {
+            ("github.com", "api.github.com"),
+            ("github.com", "www.github.com"),
+            ("nmap.org", "svn.nmap.org"),
+        }
+        assert {r["source"] for r in records} == {"CRTSh"}
+
+    def test_errors(self, mocker, services, capsys):
+        """
+        GIVEN a target for which every source fails
+        WHEN the command is run
+        THEN each failure must be reported to the standard error and
+            discarded once reported and the exit status must be 1
+        """
+        recon = mocker.spy(cli, "Recon")
+        assert main(["github.com", "invalid.test"]) == 1
+        captured = capsys.readouterr()
+        assert "gist.github.com" in captured.out.splitlines()
+        assert captured.err.count("failed for invalid.test") == 2
+        assert recon.spy_return.errors == []
+
+    def test_invalid_sources(self):
+        with pytest.raises(SystemExit) as e:
+            main(["-s", "crtsh,unknown", "github.com"])
+        assert e.value.code == 2
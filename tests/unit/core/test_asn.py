@@ -0,0 +1,136 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import threading
+from ipaddress import IPv4Address, IPv4Network, IPv6Network
+
+from reconlib import HackerTargetAPI
+from reconlib.core.asn import ASNCache
+
+
+class TestASNCache:
+    def test_longest_prefix_match(self):
+        """
+        GIVEN an ASNCache instance containing nested networks
+        WHEN addresses are looked up
+        THEN the most specific network containing each address must be
+            returned
+        """
+        cache = ASNCache()
+        cache.add("140.82.0.0/16", 36459, "GITHUB, US")
+        cache.add("140.82.114.0/24", 64512, "PRIVATE")
+        cache.add("2606:50c0::/32", 36459, "GITHUB, US")
+
+        assert cache.lookup("140.82.114.27") == {
+            "IP_ADDRESS": IPv4Address("140.82.114.27"),
+            "ASN": 64512,
+            "NETWORK": IPv4Network("140.82.114.0/24"),
+            "OWNER": "PRIVATE",
+        }
+        assert cache.lookup("140.82.121.9")["ASN"] == 36459
+        assert cache.lookup("2606:50c0:8000::153")["NETWORK"] == IPv6Network(
+            "2606:50c0::/32"
+        )
+        assert cache.lookup("10.0.0.1") is None
+        assert "140.82.1.1" in cache
+        assert len(cache) == 3
+
+    def test_concurrent_lookups(self):
+        """
+        GIVEN an ASNCache instance to which networks of new prefix
+            lengths are being added by another thread
+        WHEN addresses are looked up at the same time
+        THEN every lookup must find the network covering the address
+        """
+        cache = ASNCache()
+        cache.add("10.0.0.0/8", 64512)
+        stop, errors = threading.Event(), []
+
+        def look_up():
+            while not stop.is_set():
+                try:
+                    assert cache.lookup("10.1.2.3")["ASN"] in (64512, 64513)
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        readers = [threading.Thread(target=look_up) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for prefix_length in range(9, 33):
+            for _ in range(50):
+                cache.add(f"10.1.2.3/{prefix_length}", 64513)
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+        assert not errors
+        assert cache.lookup("10.1.2.3")["NETWORK"] == IPv4Network("10.1.2.3/32")
+
+    def test_save_and_load(self, tmp_path):
+        cache = ASNCache()
+        cache.add("140.82.114.0/24", 36459, "GITHUB, US")
+        cache.add("2606:50c0::/32", 36459)
+        cache.save(file_path := tmp_path.joinpath("asn.tsv"))
+
+        loaded = ASNCache.load(file_path)
+        assert sorted(map(str, loaded)) == sorted(map(str, cache))
+
+    def test_import_dump(self, tmp_path):
+        """
+        GIVEN a prefix-to-ASN dump containing networks and address ranges
+        WHEN it is imported into an ASNCache instance
+        THEN every announced network must be added to the cache
+        """
+        (dump := tmp_path.joinpath("dump.tsv")).write_text(
+            "# prefix/range\tasn\towner\n"
+            "1.0.0.0/24\t13335\n"
+            "1.0.4.0\t1.0.7.255\t38803\tAU\tGTELECOM-AUSTRALIA\n"
+            "1.0.8.0\t1.0.15.255\t0\tNone\tNot routed\n"
+            "\n"
+        )
+        cache = ASNCache()
+        assert cache.import_dump(dump) == 2
+        assert cache.lookup("1.0.0.1")["ASN"] == 13335
+        assert cache.lookup("1.0.0.1")["OWNER"] is None
+        assert cache.lookup("1.0.6.1")["NETWORK"] == IPv4Network("1.0.4.0/22")
+        assert cache.lookup("1.0.6.1")["OWNER"] == "GTELECOM-AUSTRALIA"
+        assert cache.lookup("1.0.9.1") is None
+
+    def test_aslookup_uses_cache(self, mocker, hackertarget_aslookup_github_response):
+        """
+        GIVEN a HackerTargetAPI instance
+        WHEN addresses within a network returned by a previous lookup are
+            looked up
+        THEN they must be answered without new requests
+        """
+        query_service = mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            return_value=hackertarget_aslookup_github_response,
+        )
+        hackertarget = HackerTargetAPI()
+        hackertarget.aslookup("140.82.114.27")
+        assert hackertarget.aslookup("140.82.114.200")["ASN"] == 36459
+        assert query_service.call_count == 1
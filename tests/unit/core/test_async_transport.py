@@ -0,0 +1,214 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import asyncio
+import http.client
+from urllib.error import HTTPError
+
+import pytest
+
+from reconlib.core.async_transport import AsyncConnectionPool
+from reconlib.core.metrics import RequestTimings
+
+
+class TestAsyncConnectionPool:
+    def test_connection_reuse(self, local_server):
+        """
+        GIVEN an AsyncConnectionPool instance
+        WHEN several sequential requests are sent to the same host
+        THEN a single connection must be opened and reused by all of
+            them
+        """
+        pool = AsyncConnectionPool()
+
+        async def fetch_all():
+            bodies = []
+            for i in range(5):
+                async with await pool.urlopen(f"{local_server}/path/{i}") as response:
+                    bodies.append(await response.read())
+            await pool.close()
+            return bodies
+
+        assert asyncio.run(fetch_all()) == [f"/path/{i}".encode() for i in range(5)]
+        assert pool.statistics["connections_opened"] == 1
+        assert pool.statistics["connections_reused"] == 4
+
+    def test_chunked_response(self, local_server):
+        """
+        GIVEN an AsyncConnectionPool instance
+        WHEN the server responds with a chunked transfer encoding
+        THEN the decoded body must be returned and the connection must
+            remain available for reuse
+        """
+        pool = AsyncConnectionPool()
+
+        async def fetch():
+            async with await pool.urlopen(f"{local_server}/chunked") as response:
+                body = await response.read()
+            async with await pool.urlopen(f"{local_server}/after") as response:
+                return body, await response.read()
+
+        assert asyncio.run(fetch()) == (b"/chunked", b"/after")
+        assert pool.statistics["connections_opened"] == 1
+
+    def test_concurrent_requests(self, local_server):
+        """
+        GIVEN an AsyncConnectionPool instance limited to two connections
+            per host
+        WHEN many requests are sent concurrently on the same event loop
+        THEN all of them must succeed without opening more than two
+            connections at the same time
+        """
+        pool = AsyncConnectionPool(max_connections=2)
+
+        async def fetch(i):
+            async with await pool.urlopen(f"{local_server}/{i}") as response:
+                return await response.read()
+
+        async def fetch_all():
+            return await asyncio.gather(*(fetch(i) for i in range(50)))
+
+        assert asyncio.run(fetch_all()) == [f"/{i}".encode() for i in range(50)]
+        assert pool.statistics["connections_opened"] <= 2
+
+    def test_http_error(self, local_server):
+        """
+        GIVEN an AsyncConnectionPool instance
+        WHEN the server responds with an error status code
+        THEN an HTTPError must be raised
+        """
+        pool = AsyncConnectionPool()
+        with pytest.raises(HTTPError) as e:
+            asyncio.run(pool.urlopen(f"{local_server}/missing"))
+        assert e.value.code == 404
+
+    def test_stalled_body_times_out(self):
+        """
+        GIVEN an AsyncConnectionPool instance with a short timeout
+        WHEN the server sends the response headers and then stops
+            sending the body
+        THEN reading the body must raise asyncio.TimeoutError and the
+            connection must not be reused
+        """
+        pool = AsyncConnectionPool(timeout=0.2)
+
+        async def stall(reader, writer):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nab")
+            await writer.drain()
+            await asyncio.sleep(5)
+
+        async def fetch():
+            server = await asyncio.start_server(stall, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                async with await pool.urlopen(f"http://127.0.0.1:{port}/") as response:
+                    assert await response.read(2) == b"ab"
+                    await response.read()
+            finally:
+                server.close()
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(fetch())
+        assert pool.statistics["idle_connections"] == 0
+
+    def test_truncated_chunked_body(self):
+        """
+        GIVEN an AsyncConnectionPool instance
+        WHEN the server closes the connection after sending a single
+            chunk and before the terminating zero-size chunk
+        THEN reading the body must raise IncompleteRead instead of
+            returning the truncated body
+        """
+        pool = AsyncConnectionPool()
+
+        async def truncate(reader, writer):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b"5\r\nhello\r\n"
+            )
+            await writer.drain()
+            writer.close()
+
+        async def fetch():
+            server = await asyncio.start_server(truncate, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                async with await pool.urlopen(f"http://127.0.0.1:{port}/") as response:
+                    return await response.read()
+            finally:
+                server.close()
+
+        with pytest.raises(http.client.IncompleteRead):
+            asyncio.run(fetch())
+        assert pool.statistics["idle_connections"] == 0
+
+    def test_no_address_found(self, mocker):
+        """
+        GIVEN an AsyncConnectionPool instance
+        WHEN the name of a host resolves to no address at all
+        THEN OSError must be raised
+        """
+        pool = AsyncConnectionPool()
+
+        async def connect():
+            mocker.patch.object(
+                asyncio.get_running_loop(), "getaddrinfo", return_value=[]
+            )
+            await pool._timed_open_connection(
+                "example.com", 80, "http", RequestTimings("Test", "/", "/")
+            )
+
+        with pytest.raises(OSError, match="No address found"):
+            asyncio.run(connect())
+
+    def test_http_proxy(self, local_server):
+        """
+        GIVEN an AsyncConnectionPool instance configured with an HTTP
+            proxy
+        WHEN a plain HTTP request is sent
+        THEN it must be sent to the proxy with the absolute URL of the
+            resource
+        """
+        pool = AsyncConnectionPool(proxies={"http": local_server})
+
+        async def fetch():
+            async with await pool.urlopen("http://example.test/path") as response:
+                return await response.read()
+
+        assert asyncio.run(fetch()) == b"http://example.test:80/path"
+
+    def test_https_proxy(self, local_server):
+        """
+        GIVEN an AsyncConnectionPool instance configured with an HTTPS
+            proxy
+        WHEN an HTTPS request is sent
+        THEN a tunnel must be requested from the proxy
+        """
+        pool = AsyncConnectionPool(proxies={"https": local_server})
+        # The local server does not support the CONNECT method
+        with pytest.raises(OSError, match="Tunnel connection failed: 501"):
+            asyncio.run(pool.urlopen("https://example.test/"))
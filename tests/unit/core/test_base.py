@@ -0,0 +1,115 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from reconlib.core.base import AsyncExternalService
+from tests.conftest import StubService
+
+
+class _AsyncStubService(AsyncExternalService, StubService):
+    async def fetch_subdomains(self, target: str) -> set[str]:
+        await asyncio.sleep(self.delay)
+        self.subdomains[target] = self._answer(target)
+        return self.subdomains[target]
+
+
+class TestFetchSubdomainsMany:
+    def test_concurrent_fetch(self):
+        """
+        GIVEN an ExternalService instance
+        WHEN its fetch_subdomains_many method is executed on a generator
+            of targets
+        THEN the results of every target must be yielded, targets must
+            be queried concurrently and only a bounded number of targets
+            must be consumed ahead of the results
+        """
+        consumed = 0
+
+        def targets():
+            nonlocal consumed
+            for i in range(40):
+                consumed += 1
+                yield f"{i}.com"
+
+        start, results = time.perf_counter(), {}
+        for target, subdomains in StubService(delay=0.05).fetch_subdomains_many(
+            targets(), concurrency=8
+        ):
+            assert consumed - len(results) <= 16
+            results[target] = subdomains
+        assert time.perf_counter() - start < 0.5
+        assert results == {f"{i}.com": {f"www.{i}.com"} for i in range(40)}
+
+    def test_retain_and_exceptions(self):
+        """
+        GIVEN an ExternalService instance
+        WHEN its fetch_subdomains_many method is executed with "retain"
+            set to False and "return_exceptions" set to True
+        THEN results must be discarded from the instance once yielded
+            and failed targets must be yielded with their exceptions
+        """
+        service = StubService()
+        results = dict(
+            service.fetch_subdomains_many(
+                ["a.com", "invalid.com"], retain=False, return_exceptions=True
+            )
+        )
+        assert results["a.com"] == {"www.a.com"}
+        assert isinstance(results["invalid.com"], ConnectionError)
+        assert service.subdomains == {}
+
+        with pytest.raises(ConnectionError):
+            list(service.fetch_subdomains_many(["invalid.com"]))
+
+    def test_async_concurrent_fetch(self):
+        """
+        GIVEN an AsyncExternalService instance
+        WHEN its fetch_subdomains_many method is executed on an
+            asynchronous generator of targets
+        THEN the results of every target must be yielded and targets
+            must be queried concurrently
+        """
+
+        async def targets():
+            for i in range(200):
+                yield f"{i}.com"
+
+        async def collect():
+            service = _AsyncStubService(delay=0.05)
+            return {
+                target: subdomains
+                async for target, subdomains in service.fetch_subdomains_many(
+                    targets(), concurrency=100
+                )
+            }
+
+        start = time.perf_counter()
+        results = asyncio.run(collect())
+        assert time.perf_counter() - start < 0.5
+        assert len(results) == 200
@@ -0,0 +1,123 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import time
+
+import pytest
+
+from reconlib.core.cache import MemoryCache, SQLiteCache, make_cache_key
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryCache(max_bytes=100)
+    else:
+        cache = SQLiteCache(tmp_path.joinpath("cache.db"), max_bytes=100)
+        yield cache
+        cache.close()
+
+
+class TestResponseCache:
+    def test_make_cache_key(self):
+        """
+        GIVEN two requests differing only in the order of query
+            parameters, the case of the host and the User-Agent header
+        WHEN cache keys are built for them
+        THEN both keys must be equal, but must differ from the key of a
+            request sent with a different API key
+        """
+        key = make_cache_key(
+            "https://API.example.com/a?q=1&limit=2",
+            {"User-Agent": "A", "x-apikey": "1"},
+        )
+        assert key == make_cache_key(
+            "https://api.example.com/a?limit=2&q=1",
+            {"User-Agent": "B", "x-apikey": "1"},
+        )
+        assert key != make_cache_key(
+            "https://api.example.com/a?limit=2&q=1", {"x-apikey": "2"}
+        )
+
+    def test_get_and_expire(self, cache):
+        """
+        GIVEN a cache instance
+        WHEN a response is stored and looked up before and after its TTL
+        THEN it must be returned only while it is still valid
+        """
+        cache.set("key", b"value", ttl=0.05)
+        assert cache.get("key") == b"value"
+        time.sleep(0.06)
+        assert cache.get("key") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_size_bounded_eviction(self, cache):
+        """
+        GIVEN a cache instance limited to 100 bytes
+        WHEN responses exceeding this limit are stored
+        THEN the least recently used responses must be evicted first
+        """
+        cache.set("a", b"a" * 40, ttl=60)
+        cache.set("b", b"b" * 40, ttl=60)
+        assert cache.get("a") is not None  # "b" is now the least recent
+        cache.set("c", b"c" * 40, ttl=60)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_sqlite_cache_persistence(self, tmp_path):
+        """
+        GIVEN a SQLiteCache instance
+        WHEN a new instance is created on the same database file
+        THEN responses stored by the first instance must be available
+        """
+        path = tmp_path.joinpath("cache.db")
+        (first := SQLiteCache(path)).set("key", b"value", ttl=60)
+        first.close()
+        assert SQLiteCache(path).get("key") == b"value"
+
+    def test_service_uses_cache(self, local_service):
+        """
+        GIVEN an ExternalService instance initialized with a cache
+        WHEN the same URL is queried twice
+        THEN only the first query must reach the network
+        """
+        service = local_service(cache=MemoryCache())
+        url = service.get_query_url("/target")
+        assert service._query_service(url) == service._query_service(url) == "/target"
+        assert service.transport.statistics["requests"] == 1
+
+    def test_service_vetoes_caching(self, local_service):
+        """
+        GIVEN an ExternalService instance initialized with a cache
+        WHEN the service rejects a response body as not cacheable
+        THEN the response must not be stored and every query of its URL
+            must reach the network
+        """
+        service = local_service(cache=(cache := MemoryCache()))
+        url = service.get_query_url("/error")
+        assert service._query_service(url) == service._query_service(url) == "/error"
+        assert service.transport.statistics["requests"] == 2
+        assert len(cache) == 0
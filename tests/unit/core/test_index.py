@@ -0,0 +1,141 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+from reconlib import CRTShAPI, HackerTargetAPI
+from reconlib.core.index import SubdomainIndex
+
+
+class TestSubdomainIndex:
+    def test_add(self):
+        """
+        GIVEN a SubdomainIndex instance
+        WHEN names are added to it by different sources
+        THEN each name must be stored once and normalized
+        """
+        index = SubdomainIndex()
+        assert index.add("www.example.com", "CRTSh") is True
+        assert index.add("WWW.example.com.", "VirusTotal") is False
+        assert index.update(["api.example.com", "www.example.com"]) == 1
+        assert len(index) == 2
+        assert "www.example.com" in index
+        assert "example.com" not in index
+        assert set(index) == {"www.example.com", "api.example.com"}
+
+    def test_zone(self):
+        """
+        GIVEN a SubdomainIndex instance
+        WHEN the names under a zone are enumerated
+        THEN only the names at or below the zone must be yielded
+        """
+        index = SubdomainIndex()
+        index.update(
+            [
+                "api.example.com",
+                "v1.api.example.com",
+                "v2.api.example.com",
+                "api.example.org",
+                "notapi.example.com",
+            ],
+            source="CRTSh",
+        )
+        index.add("v3.api.example.com", "VirusTotal")
+
+        assert set(index.zone("api.example.com")) == {
+            "api.example.com",
+            "v1.api.example.com",
+            "v2.api.example.com",
+            "v3.api.example.com",
+        }
+        assert set(index.zone("*.api.example.com", source="VirusTotal")) == {
+            "v3.api.example.com"
+        }
+        assert list(index.zone("example.net")) == []
+        assert list(index.zone("example.com", source="HackerTarget")) == []
+
+    def test_provenance(self):
+        """
+        GIVEN a SubdomainIndex instance
+        WHEN the same name is found by several sources for several targets
+        THEN every source and target must be recorded for the name
+        """
+        index = SubdomainIndex()
+        index.add("cdn.example.com", "CRTSh", "example.com")
+        index.add("cdn.example.com", "HackerTarget", "example.net")
+        assert index.sources("cdn.example.com") == {"CRTSh", "HackerTarget"}
+        assert index.targets("cdn.example.com") == {"example.com", "example.net"}
+        assert index.sources("unknown.example.com") == set()
+
+    def test_target_identifiers(self):
+        """
+        GIVEN a SubdomainIndex instance holding names of many targets
+        WHEN names are added for one or several targets
+        THEN each name must store only the identifiers of its own targets
+        """
+        index = SubdomainIndex()
+        for i in range(1000):
+            index.add(f"www.host{i}.com", "CRTSh", f"host{i}.com")
+        index.add("www.host1.com", "CRTSh", "host1.com")
+        index.add("www.host2.com", "CRTSh", "other.com")
+        assert index._find("www.host1.com").targets == 1
+        assert index._find("www.host2.com").targets == {2, 1000}
+        assert index.targets("www.host2.com") == {"host2.com", "other.com"}
+        assert index.targets("www.host999.com") == {"host999.com"}
+
+    def test_interned_labels(self):
+        index = SubdomainIndex()
+        index.update(f"www.host{i}.example.com" for i in range(100))
+        assert len(index._labels) == 103  # com, example, www and 100 hosts
+
+    def test_services_write_into_index(
+        self,
+        mocker,
+        crtsh_github_response,
+        crtsh_github_domains,
+        hackertarget_hostsearch_github_response,
+        hackertarget_github_subdomains,
+    ):
+        """
+        GIVEN a SubdomainIndex shared by CRTShAPI and HackerTargetAPI
+        WHEN subdomains are fetched by both services
+        THEN every subdomain must be written into the index along with
+            the service and target it was found by
+        """
+        mocker.patch(
+            "reconlib.crtsh.api.CRTShAPI._query_service",
+            return_value=crtsh_github_response,
+        )
+        mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            return_value=hackertarget_hostsearch_github_response,
+        )
+
+        index = SubdomainIndex()
+        CRTShAPI(index=index).fetch_subdomains("github.com")
+        HackerTargetAPI(index=index).fetch_subdomains("github.com")
+
+        assert set(index) == crtsh_github_domains | hackertarget_github_subdomains
+        name = next(iter(hackertarget_github_subdomains))
+        assert "HackerTarget" in index.sources(name)
+        assert index.targets(name) == {"github.com"}
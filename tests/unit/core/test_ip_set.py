@@ -0,0 +1,154 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import sys
+from ipaddress import IPv4Address, IPv6Address
+
+import pytest
+
+from reconlib import HackerTargetAPI
+from reconlib.core.utils.ip_set import PackedIPMap, PackedIPSet
+
+
+class TestPackedIPSet:
+    def test_set_semantics(self):
+        """
+        GIVEN a PackedIPSet instance
+        WHEN IPv4 and IPv6 addresses are added to and removed from it
+        THEN it must behave like a set of ipaddress objects
+        """
+        ip_set = PackedIPSet(["10.0.0.2", "10.0.0.1", "::1", IPv4Address("10.0.0.1")])
+        assert len(ip_set) == 3
+        assert "10.0.0.1" in ip_set
+        assert IPv6Address("::1") in ip_set
+        assert "10.0.0.3" not in ip_set
+        assert "not-an-ip" not in ip_set
+        assert list(ip_set) == [
+            IPv4Address("10.0.0.1"),
+            IPv4Address("10.0.0.2"),
+            IPv6Address("::1"),
+        ]
+
+        ip_set.discard("10.0.0.1")
+        ip_set.discard("::1")
+        ip_set.discard("10.0.0.9")
+        assert ip_set == {IPv4Address("10.0.0.2")}
+
+    def test_merges_pending_addresses(self):
+        """
+        GIVEN a PackedIPSet instance
+        WHEN more addresses than the merge threshold are added
+        THEN they must be moved into the sorted array without losing
+            any address
+        """
+        ip_set = PackedIPSet(IPv4Address(i) for i in range(5000, 0, -1))
+        ip_set.update([IPv4Address(1), "0.0.0.0"])
+        assert len(ip_set) == 5001
+        assert len(ip_set._pending) < 1024
+        assert list(ip_set) == [IPv4Address(i) for i in range(5001)]
+
+    def test_memory_usage(self):
+        ip_addresses = {IPv4Address(i * 7919) for i in range(10_000)}
+        packed_size = sys.getsizeof(PackedIPSet(ip_addresses))
+        objects_size = sys.getsizeof(ip_addresses) + sum(
+            map(sys.getsizeof, ip_addresses)
+        )
+        assert packed_size * 10 < objects_size
+
+    def test_packed_hostsearch(
+        self,
+        mocker,
+        hackertarget_hostsearch_github_response,
+        hackertarget_github_ip_addresses,
+    ):
+        mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            return_value=hackertarget_hostsearch_github_response,
+        )
+        (hackertarget := HackerTargetAPI(packed_ips=True)).hostsearch("github.com")
+        assert isinstance(hackertarget.ip_addresses["github.com"], PackedIPSet)
+        assert hackertarget.ip_addresses["github.com"] == (
+            hackertarget_github_ip_addresses
+        )
+        results = hackertarget.results["github.com"]
+        assert isinstance(results, PackedIPMap)
+        assert set(results) == hackertarget_github_ip_addresses
+        assert hackertarget._parser._ip_addresses == {}
+
+        mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            return_value="140.82.121.9 lb-140-82-121-9-fra.github.com",
+        )
+        hackertarget.reverse_dns("140.82.121.9")
+        assert isinstance(hackertarget.hostnames, PackedIPMap)
+        assert hackertarget._known_hostname("140.82.121.9") == {
+            IPv4Address("140.82.121.9"): "lb-140-82-121-9-fra.github.com"
+        }
+
+
+class TestPackedIPMap:
+    def test_mapping_semantics(self):
+        """
+        GIVEN a PackedIPMap instance
+        WHEN values are set, replaced and deleted for IPv4 and IPv6
+            addresses
+        THEN it must behave like a dictionary keyed by ipaddress objects
+        """
+        ip_map = PackedIPMap({"10.0.0.2": "b", "::1": "c"})
+        ip_map[IPv4Address("10.0.0.1")] = "a"
+        ip_map["10.0.0.2"] = "B"
+        assert len(ip_map) == 3
+        assert ip_map["10.0.0.2"] == "B"
+        assert ip_map.get(IPv6Address("::1")) == "c"
+        assert ip_map.get("10.0.0.3") is None
+        assert "not-an-ip" not in ip_map
+        assert dict(ip_map) == {
+            IPv4Address("10.0.0.1"): "a",
+            IPv4Address("10.0.0.2"): "B",
+            IPv6Address("::1"): "c",
+        }
+
+        del ip_map["10.0.0.1"]
+        del ip_map["::1"]
+        with pytest.raises(KeyError):
+            del ip_map["10.0.0.9"]
+        assert ip_map == {IPv4Address("10.0.0.2"): "B"}
+
+    def test_merges_pending_addresses(self):
+        ip_map = PackedIPMap((IPv4Address(i), i) for i in range(5000, 0, -1))
+        ip_map["0.0.0.0"] = 0
+        ip_map[IPv4Address(1)] = -1
+        assert len(ip_map) == 5001
+        assert len(ip_map._pending) < 1024
+        assert list(ip_map.values()) == [0, -1, *range(2, 5001)]
+
+    def test_memory_usage(self):
+        results = {IPv4Address(i * 7919): "host.example.com" for i in range(10_000)}
+        packed_size = sys.getsizeof(PackedIPMap(results))
+        # Each address object also holds an integer of its own
+        objects_size = sys.getsizeof(results) + sum(
+            sys.getsizeof(ip_addr) + sys.getsizeof(int(ip_addr)) for ip_addr in results
+        )
+        assert packed_size * 5 < objects_size
@@ -0,0 +1,168 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import json
+
+from reconlib import HackerTargetAPI, VirusTotalAPI
+from reconlib.core.exceptions import QuotaExceededError
+from reconlib.core.journal import ProgressJournal
+
+
+def _page(names: list[str], cursor: str = None) -> str:
+    meta = {"count": 5} if cursor is None else {"count": 5, "cursor": cursor}
+    return json.dumps(
+        {"meta": meta, "data": [{"id": name, "type": "domain"} for name in names]}
+    )
+
+
+class TestProgressJournal:
+    def test_complete_and_result(self, tmp_path):
+        journal = ProgressJournal(tmp_path.joinpath("journal.db"))
+        assert journal.result("CRTSh", "subdomains", "github.com") is None
+
+        journal.complete("CRTSh", "subdomains", "github.com", {"a.github.com"})
+        journal = ProgressJournal(journal.path)
+        assert journal.is_complete("CRTSh", "subdomains", "github.com")
+        assert journal.result("CRTSh", "subdomains", "github.com") == ["a.github.com"]
+        assert len(journal) == 1
+
+    def test_skip_completed_targets(
+        self, mocker, tmp_path, hackertarget_hostsearch_github_response
+    ):
+        """
+        GIVEN a HackerTargetAPI instance with a ProgressJournal
+        WHEN a sweep over several targets is restarted
+        THEN targets completed by the previous run must be restored from
+            the journal without querying the service again
+        """
+        query = mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            return_value=hackertarget_hostsearch_github_response,
+        )
+        journal = ProgressJournal(tmp_path.joinpath("journal.db"))
+        first = dict(
+            HackerTargetAPI(journal=journal).fetch_subdomains_many(["github.com"])
+        )
+        assert query.call_count == 1
+
+        second = dict(
+            HackerTargetAPI(journal=journal).fetch_subdomains_many(
+                ["github.com", "nmap.org"]
+            )
+        )
+        assert query.call_count == 2
+        assert second["github.com"] == first["github.com"]
+
+    def test_errors_leave_targets_pending(self, mocker, tmp_path):
+        """
+        GIVEN a HackerTargetAPI instance with a ProgressJournal
+        WHEN the service answers with an error message or with lines
+            that cannot be parsed
+        THEN the target must not be completed in the journal and a
+            restarted run must query the service again
+        """
+        query = mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            return_value="API count exceeded - Increase Quota with Membership",
+        )
+        journal = ProgressJournal(tmp_path.joinpath("journal.db"))
+        results = dict(
+            HackerTargetAPI(journal=journal).fetch_subdomains_many(
+                ["github.com"], return_exceptions=True
+            )
+        )
+        assert isinstance(results["github.com"], QuotaExceededError)
+        assert not journal.is_complete("HackerTarget", "subdomains", "github.com")
+
+        query.return_value = "a.github.com,140.82.112.3\nb.github.com,not-an-ip"
+        list(HackerTargetAPI(journal=journal).fetch_subdomains_many(["github.com"]))
+        assert not journal.is_complete("HackerTarget", "subdomains", "github.com")
+
+        query.return_value = "a.github.com,140.82.112.3"
+        list(HackerTargetAPI(journal=journal).fetch_subdomains_many(["github.com"]))
+        assert journal.is_complete("HackerTarget", "subdomains", "github.com")
+        assert query.call_count == 3
+
+    def test_resume_pagination(self, mocker, tmp_path, api_key):
+        """
+        GIVEN a VirusTotalAPI instance with a ProgressJournal
+        WHEN a pagination interrupted after its first page is restarted
+        THEN the pages already recorded must not be fetched again and
+            the pagination must continue from the last cursor recorded
+        """
+        journal = ProgressJournal(tmp_path.joinpath("journal.db"))
+        mocker.patch(
+            "reconlib.virustotal.api.VirusTotalAPI._query_service",
+            side_effect=[_page(["a.nmap.org", "b.nmap.org"], cursor="CURSOR-1")],
+        )
+        pages = VirusTotalAPI(api_key=api_key, journal=journal).iter_subdomain_pages(
+            target="nmap.org", limit=2
+        )
+        assert next(pages) == {"a.nmap.org", "b.nmap.org"}
+        del pages  # Interrupted before the second page is processed
+
+        query = mocker.patch(
+            "reconlib.virustotal.api.VirusTotalAPI._query_service",
+            side_effect=[_page(["c.nmap.org"])],
+        )
+        virustotal = VirusTotalAPI(api_key=api_key, journal=journal)
+        assert virustotal.fetch_subdomains(target="nmap.org", limit=2) == {
+            "a.nmap.org",
+            "b.nmap.org",
+            "c.nmap.org",
+        }
+        assert query.call_args.kwargs["url"].endswith("cursor=CURSOR-1")
+        assert journal.is_complete("VirusTotal", "subdomains", "nmap.org")
+        assert journal.resume_pages("VirusTotal", "nmap.org") is None
+
+    def test_max_pages_leave_targets_pending(self, mocker, tmp_path, api_key):
+        """
+        GIVEN a VirusTotalAPI instance with a ProgressJournal
+        WHEN a pagination is stopped early by its maximum number of
+            pages
+        THEN the target must not be marked as complete and a later run
+            must continue from the cursor of the last page fetched
+        """
+        journal = ProgressJournal(tmp_path.joinpath("journal.db"))
+        query = mocker.patch(
+            "reconlib.virustotal.api.VirusTotalAPI._query_service",
+            side_effect=[
+                _page(["a.nmap.org", "b.nmap.org"], cursor="CURSOR-1"),
+                _page(["c.nmap.org"]),
+            ],
+        )
+        virustotal = VirusTotalAPI(api_key=api_key, journal=journal)
+        virustotal.fetch_subdomains(target="nmap.org", limit=2, max_pages=1)
+        assert not journal.is_complete("VirusTotal", "subdomains", "nmap.org")
+        assert journal.resume_pages("VirusTotal", "nmap.org")[1] == "CURSOR-1"
+
+        virustotal = VirusTotalAPI(api_key=api_key, journal=journal)
+        assert virustotal.fetch_subdomains(target="nmap.org", limit=2) == {
+            "a.nmap.org",
+            "b.nmap.org",
+            "c.nmap.org",
+        }
+        assert query.call_args.kwargs["url"].endswith("cursor=CURSOR-1")
+        assert journal.is_complete("VirusTotal", "subdomains", "nmap.org")
@@ -0,0 +1,96 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from reconlib.core.utils.json_stream import (
+    JSONArrayParser,
+    aiter_json_array,
+    iter_json_array,
+)
+
+
+@pytest.fixture
+def json_document() -> bytes:
+    return json.dumps(
+        [{"id": 1, "name": "ação.example.com"}, 12345, "text", [1, 2], None, 6789]
+    ).encode("utf_8")
+
+
+class TestJSONArrayParser:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 1024])
+    def test_iter_json_array(self, json_document, chunk_size):
+        """
+        GIVEN a JSON array split into chunks of arbitrary size
+        WHEN the chunks are passed to iter_json_array
+        THEN every item of the array must be yielded in order, including
+            multi-byte characters and numbers split across chunks
+        """
+        chunks = (
+            json_document[i : i + chunk_size]
+            for i in range(0, len(json_document), chunk_size)
+        )
+        assert list(iter_json_array(chunks)) == json.loads(json_document)
+
+    def test_aiter_json_array(self, json_document):
+        """
+        GIVEN a JSON array received from an asynchronous iterable
+        WHEN the chunks are passed to aiter_json_array
+        THEN every item of the array must be yielded in order
+        """
+
+        async def chunks():
+            for i in range(0, len(json_document), 5):
+                yield json_document[i : i + 5]
+
+        async def collect():
+            return [item async for item in aiter_json_array(chunks())]
+
+        assert asyncio.run(collect()) == json.loads(json_document)
+
+    def test_items_are_released_as_completed(self):
+        """
+        GIVEN a JSONArrayParser instance
+        WHEN a chunk completing an item is fed to the parser
+        THEN the item must be returned immediately
+        """
+        parser = JSONArrayParser()
+        assert parser.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+        assert parser.feed(b": 2}]") == [{"b": 2}]
+        assert parser.close() == []
+
+    @pytest.mark.parametrize("document", [b'[{"a": 1}', b'{"a": 1}', b""])
+    def test_invalid_document(self, document):
+        """
+        GIVEN a truncated document or a document that is not a JSON
+            array
+        WHEN it is entirely fed to a JSONArrayParser instance
+        THEN a JSONDecodeError must be raised
+        """
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array([document]))
@@ -0,0 +1,116 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+import reconlib
+from reconlib.crtsh.api import CRTShAPI
+
+
+def _imported_modules(code: str, cwd) -> set[str]:
+    """
+    Run some code in a fresh interpreter and get the names of every
+    module imported by it
+    """
+    process = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys\nprint(*sys.modules)"],
+        cwd=cwd,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(process.stdout.split())
+
+
+class TestLazyImports:
+    def test_lazy_attributes(self):
+        """
+        GIVEN the reconlib package
+        WHEN a service is accessed as an attribute of the package
+        THEN the class defined by the service's module must be returned
+            and unknown attributes must raise AttributeError
+        """
+        assert reconlib.CRTShAPI is CRTShAPI
+        assert {"CRTShAPI", "HackerTargetAPI", "Recon"} <= set(dir(reconlib))
+        with pytest.raises(AttributeError):
+            reconlib.UndefinedAPI
+
+    def test_import_single_service(self, root_dir):
+        """
+        GIVEN a fresh Python interpreter
+        WHEN a single synchronous service is imported from the package
+            and instantiated
+        THEN neither the modules of the other services, nor asyncio, nor
+            python-dotenv must be imported
+        """
+        modules = _imported_modules(
+            "from reconlib import HackerTargetAPI\nHackerTargetAPI()", root_dir
+        )
+        assert "reconlib.hackertarget.api" in modules
+        assert not modules & {
+            "asyncio",
+            "dotenv",
+            "reconlib.core.async_transport",
+            "reconlib.crtsh.api",
+            "reconlib.virustotal.api",
+        }
+
+    def test_deferred_optional_features(self, root_dir):
+        """
+        GIVEN a fresh Python interpreter
+        WHEN every synchronous service is imported and instantiated
+            without caches, journals, snapshots, sinks or indexes
+        THEN neither the modules of those features nor sqlite3, csv and
+            concurrent.futures must be imported
+        """
+        modules = _imported_modules(
+            "from reconlib import CRTShAPI, HackerTargetAPI, VirusTotalAPI\n"
+            "CRTShAPI(), HackerTargetAPI(), VirusTotalAPI(api_key='KEY')",
+            root_dir,
+        )
+        assert not modules & {
+            "concurrent.futures",
+            "csv",
+            "sqlite3",
+            "reconlib.core.cache",
+            "reconlib.core.index",
+            "reconlib.core.journal",
+            "reconlib.core.sinks",
+            "reconlib.core.snapshots",
+        }
+
+    def test_deferred_dotenv(self, root_dir):
+        """
+        GIVEN a fresh Python interpreter
+        WHEN a VirusTotalAPI instance reads its API key from a file
+        THEN python-dotenv must be imported only at that moment
+        """
+        code = "from reconlib import VirusTotalAPI\nVirusTotalAPI(api_key={!r})"
+        assert "dotenv" not in _imported_modules(code.format("KEY"), root_dir)
+        key_file = str(root_dir.joinpath("tests/unit/virustotal/.test_env"))
+        assert "dotenv" in _imported_modules(code.format(key_file), root_dir)
@@ -0,0 +1,157 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import asyncio
+import math
+from urllib.error import HTTPError
+
+from reconlib import AsyncCRTShAPI, CRTShAPI, HackerTargetAPI
+from reconlib.core.metrics import Histogram, MetricsRegistry
+from reconlib.core.rate_limit import TokenBucket
+from reconlib.core.retry import RetryPolicy
+from reconlib.core.snapshots import SnapshotStore
+from tests.mock_server import MockServiceServer
+
+
+class TestMetricsRegistry:
+    def test_histogram(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (math.inf, 4)]
+        assert histogram.count == 4 and histogram.sum == 2.65
+
+    def test_request_finished(self):
+        """
+        GIVEN a MetricsRegistry instance with hooks
+        WHEN requests are recorded as succeeded and failed
+        THEN the hooks must be called with the timings of every request
+            and the counters and histograms must be exported both as a
+            snapshot and in the Prometheus text format
+        """
+        metrics, started, finished = MetricsRegistry(), [], []
+        metrics.add_hooks(before=started.append, after=finished.append)
+
+        timings = metrics.request_started("CRTSh", "certificates", "https://crt.sh")
+        timings.ttfb, timings.download, timings.status = 0.2, 0.01, 200
+        timings.bytes = 1024
+        metrics.request_finished(timings)
+        error = HTTPError("https://crt.sh", 503, "Service Unavailable", {}, None)
+        metrics.request_finished(
+            metrics.request_started("CRTSh", "certificates", "https://crt.sh"), error
+        )
+        metrics.observe("CRTSh", "certificates", "parse", 0.003)
+
+        assert started == finished and len(finished) == 2
+        assert finished[1].status == 503 and finished[1].error is error
+        snapshot = metrics.snapshot()
+        assert [item["status"] for item in snapshot["requests"]] == [200, 503]
+        assert snapshot["errors"][0]["error"] == "HTTPError"
+        assert snapshot["bytes"][0]["count"] == 1024
+        phases = {item["phase"]: item for item in snapshot["durations"]}
+        assert set(phases) == {"download", "parse", "total", "ttfb"}
+        assert phases["ttfb"]["buckets"][0.25] == 1
+
+        exported = metrics.to_prometheus()
+        labels = 'service="CRTSh",endpoint="certificates"'
+        assert f'reconlib_requests_total{{{labels},status="503"}} 1' in exported
+        assert (
+            f'reconlib_phase_seconds_bucket{{{labels},phase="ttfb",le="+Inf"}} 1'
+            in exported
+        )
+        assert f'reconlib_phase_seconds_count{{{labels},phase="parse"}} 1' in exported
+
+        metrics.reset()
+        assert metrics.snapshot()["requests"] == []
+
+
+class TestServiceMetrics:
+    def test_request_timings(self):
+        """
+        GIVEN a HackerTargetAPI instance with a MetricsRegistry
+        WHEN requests are sent to a server throttling some of them
+        THEN the timing breakdown, status code and size of each request
+            must be recorded, along with the duration of parsing
+        """
+        metrics, finished = MetricsRegistry(), []
+        metrics.add_hooks(after=finished.append)
+        with MockServiceServer(records=10, throttle_rate=0.5, seed=1) as server:
+            service = HackerTargetAPI(
+                transport=server.connection_pool(),
+                rate_limiter=TokenBucket(math.inf),
+                retry_policy=RetryPolicy(max_retries=10, backoff_factor=0),
+                metrics=metrics,
+            )
+            service.fetch_subdomains("github.com")
+            service.fetch_subdomains("nmap.org")
+            throttled = server.statistics["HackerTarget"][429]
+
+        assert len(finished) == throttled + 2
+        assert {timings.endpoint for timings in finished} == {"hostsearch"}
+        first, last = finished[0], finished[-1]
+        assert first.dns is not None and first.connect is not None
+        assert last.dns is None and last.connect is None  # Reused connection
+        assert last.status == 200 and last.bytes > 0 and last.ttfb <= last.total
+        parse = [
+            item for item in metrics.snapshot()["durations"] if item["phase"] == "parse"
+        ]
+        assert parse[0]["count"] == 2
+
+    def test_async_request_timings(self):
+        """
+        GIVEN an AsyncCRTShAPI instance with a MetricsRegistry
+        WHEN the subdomains of a target are fetched
+        THEN the timing breakdown of the request must be recorded
+        """
+        metrics, finished = MetricsRegistry(), []
+        metrics.add_hooks(after=finished.append)
+        with MockServiceServer(records=10) as server:
+            service = AsyncCRTShAPI(
+                transport=server.async_connection_pool(), metrics=metrics
+            )
+            asyncio.run(service.fetch_subdomains("github.com"))
+        (timings,) = finished
+        assert timings.service == "CRTSh" and timings.endpoint == "certificates"
+        assert None not in (timings.dns, timings.connect, timings.ttfb)
+        assert timings.download is not None and timings.bytes > 0
+
+    def test_diff_parse_recorded_once(self, mocker, tmp_path):
+        """
+        GIVEN a CRTShAPI instance with a MetricsRegistry
+        WHEN the subdomains of a target are compared with a snapshot
+        THEN the parsing of the response must be recorded only once
+        """
+        mocker.patch(
+            "reconlib.crtsh.api.CRTShAPI._query_service",
+            return_value='[{"id": 1, "common_name": "a.github.com", '
+            '"name_value": "a.github.com"}]',
+        )
+        metrics = MetricsRegistry()
+        service = CRTShAPI(metrics=metrics)
+        service.diff_subdomains("github.com", SnapshotStore(tmp_path.joinpath("s.db")))
+        (parse,) = [
+            item for item in metrics.snapshot()["durations"] if item["phase"] == "parse"
+        ]
+        assert parse["count"] == 1
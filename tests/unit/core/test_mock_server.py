@@ -0,0 +1,120 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import asyncio
+import math
+
+import pytest
+
+from reconlib import (
+    AsyncCRTShAPI,
+    AsyncVirusTotalAPI,
+    CRTShAPI,
+    HackerTargetAPI,
+    VirusTotalAPI,
+)
+from reconlib.core.rate_limit import TokenBucket
+from reconlib.core.retry import RetryPolicy
+from tests.mock_server import MockServiceServer
+
+
+@pytest.fixture
+def mock_server():
+    with MockServiceServer(records=20) as server:
+        yield server
+
+
+class TestMockServiceServer:
+    def test_fetch_from_all(self, mock_server, api_key):
+        """
+        GIVEN a running MockServiceServer
+        WHEN every service fetches subdomains through a connection pool
+            created by the server
+        THEN the requests must be answered by the server and the
+            subdomains generated for the target must be returned
+        """
+        transport = mock_server.connection_pool()
+        names = {f"host{i}.github.com" for i in range(20)}
+        crtsh = CRTShAPI(transport=transport).fetch_subdomains("github.com")
+        assert crtsh == names | {f"www.{name}" for name in names}
+        assert HackerTargetAPI(transport=transport).fetch_subdomains("github.com") == (
+            names
+        )
+        assert (
+            VirusTotalAPI(api_key=api_key, transport=transport).fetch_subdomains(
+                "github.com", limit=8
+            )
+            == names
+        )
+        assert mock_server.statistics == {
+            "CRTSh": {200: 1},
+            "HackerTarget": {200: 1},
+            "VirusTotal": {200: 3},
+        }
+
+    def test_async_fetch(self, mock_server, api_key):
+        """
+        GIVEN a running MockServiceServer
+        WHEN asynchronous services fetch subdomains through an asyncio
+            connection pool created by the server
+        THEN the subdomains generated for the target must be returned
+        """
+
+        async def fetch():
+            transport = mock_server.async_connection_pool()
+            return await asyncio.gather(
+                AsyncCRTShAPI(transport=transport).fetch_subdomains("nmap.org"),
+                AsyncVirusTotalAPI(
+                    api_key=api_key, transport=transport
+                ).fetch_subdomains("nmap.org"),
+            )
+
+        crtsh, virustotal = asyncio.run(fetch())
+        assert len(crtsh) == 40
+        assert len(virustotal) == 20
+
+    def test_injected_failures(self, api_key):
+        """
+        GIVEN a MockServiceServer failing half of the requests with
+            either a 429 or a 503 status code
+        WHEN a service fetches the subdomains of many targets
+        THEN failed requests must be retried until every target is
+            fetched and the failures must be counted by the server
+        """
+        with MockServiceServer(
+            records=5, error_rate=0.25, throttle_rate=0.25, seed=1
+        ) as server:
+            service = HackerTargetAPI(
+                transport=server.connection_pool(),
+                rate_limiter=TokenBucket(math.inf),
+                retry_policy=RetryPolicy(
+                    max_retries=20, backoff_factor=0, failure_threshold=100
+                ),
+            )
+            results = dict(service.fetch_subdomains_many(f"{i}.com" for i in range(20)))
+            statistics = server.statistics["HackerTarget"]
+        assert all(len(subdomains) == 5 for subdomains in results.values())
+        assert statistics[200] == 20
+        assert statistics[429] > 0 and statistics[503] > 0
@@ -0,0 +1,130 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import asyncio
+import math
+import time
+from email.utils import formatdate
+
+import pytest
+
+from reconlib.core.rate_limit import TokenBucket, get_rate_limiter, parse_retry_after
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        """
+        GIVEN a TokenBucket allowing 20 requests per second with a burst
+            of 5
+        WHEN 10 tokens are acquired
+        THEN the first 5 must be granted immediately and the remaining
+            ones at the configured rate
+        """
+        bucket = TokenBucket(rate=20, capacity=5)
+        start = time.perf_counter()
+        for _ in range(5):
+            assert bucket.acquire() == 0
+        for _ in range(5):
+            bucket.acquire()
+        assert 0.2 <= time.perf_counter() - start < 0.4
+
+    def test_acquire_async(self):
+        """
+        GIVEN a TokenBucket allowing 20 requests per second
+        WHEN tokens are acquired concurrently by several asyncio tasks
+        THEN the tasks must be spread over time at the configured rate
+        """
+        bucket = TokenBucket(rate=20, capacity=1)
+
+        async def acquire_all():
+            await asyncio.gather(*(bucket.acquire_async() for _ in range(5)))
+
+        start = time.perf_counter()
+        asyncio.run(acquire_all())
+        assert 0.2 <= time.perf_counter() - start < 0.4
+
+    def test_penalize(self):
+        """
+        GIVEN a TokenBucket with plenty of tokens available
+        WHEN it is penalized for a given delay
+        THEN no token must be granted before the delay elapses
+        """
+        bucket = TokenBucket(rate=1000, capacity=100)
+        bucket.penalize(0.1)
+        assert bucket.acquire() == pytest.approx(0.1, abs=0.02)
+
+    def test_penalize_unlimited(self):
+        """
+        GIVEN a TokenBucket without a rate limit
+        WHEN it is penalized for a given delay
+        THEN no token must be granted before the delay elapses
+        """
+        bucket = TokenBucket(math.inf)
+        assert bucket.acquire() == 0
+        bucket.penalize(0.1)
+        assert bucket.acquire() == pytest.approx(0.1, abs=0.02)
+
+    def test_shared_rate_limiter(self):
+        """
+        GIVEN a service name
+        WHEN its shared rate limiter is requested more than once
+        THEN the same bucket must be returned every time
+        """
+        bucket = get_rate_limiter("TestShared", 60)
+        assert get_rate_limiter("TestShared", 1) is bucket
+        assert bucket.rate == 1
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("5", 5.0), (None, 1.0), ("invalid", 1.0), (formatdate(usegmt=True), 0.0)],
+    )
+    def test_parse_retry_after(self, value, expected):
+        assert parse_retry_after(value) == pytest.approx(expected, abs=1)
+
+    def test_retry_on_http_429(self, local_service):
+        """
+        GIVEN an ExternalService instance
+        WHEN the service answers a request with HTTP 429
+        THEN the request must be retried after the delay set by the
+            Retry-After header
+        """
+        service = local_service()
+        url = service.get_query_url("/throttled/sync")
+        assert service._query_service(url) == "/throttled/sync"
+        assert service.transport.statistics["requests"] == 2
+
+    def test_retry_after_without_rate_limit(self, local_service):
+        """
+        GIVEN an ExternalService instance without a rate limit
+        WHEN the service answers a request with HTTP 429
+        THEN the request must still be retried only after the delay set
+            by the Retry-After header
+        """
+        service = local_service(rate_limiter=TokenBucket(math.inf))
+        url = service.get_query_url("/throttled/slow")
+        start = time.perf_counter()
+        assert service._query_service(url) == "/throttled/slow"
+        assert time.perf_counter() - start >= 0.2
+        assert service.transport.statistics["requests"] == 2
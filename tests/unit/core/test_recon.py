@@ -0,0 +1,154 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import time
+
+import pytest
+
+from reconlib import AsyncCRTShAPI
+from reconlib.core.recon import Recon
+from tests.conftest import StubService
+
+
+class _InvalidResultService(StubService):
+    def fetch_subdomains(self, target: str) -> int:
+        return 0
+
+
+class TestRecon:
+    def test_run_merges_and_deduplicates(self):
+        """
+        GIVEN a Recon instance with services returning overlapping
+            results
+        WHEN its run method is executed for a set of targets
+        THEN each subdomain must be yielded exactly once per target and
+            the merged results must be stored
+        """
+        services = (
+            StubService("A", 0.0, {"a.com": {"x.a.com", "y.a.com"}}),
+            StubService("B", 0.0, {"a.com": {"y.a.com", "z.a.com"}}),
+        )
+        yielded = [name for *_, new in Recon(services).run(["a.com"]) for name in new]
+        assert sorted(yielded) == ["x.a.com", "y.a.com", "z.a.com"]
+
+    def test_services_run_concurrently(self):
+        """
+        GIVEN a Recon instance with several slow services
+        WHEN its fetch_subdomains method is executed
+        THEN the total wall time must be bound by the slowest service
+            rather than the sum of all of them
+        """
+        services = [
+            StubService(str(i), 0.2, {"a.com": {f"{i}.a.com"}}) for i in range(5)
+        ]
+        start = time.perf_counter()
+        results = Recon(services).fetch_subdomains(["a.com"])
+        assert time.perf_counter() - start < 0.6
+        assert results["a.com"] == {f"{i}.a.com" for i in range(5)}
+
+    def test_per_service_concurrency(self):
+        """
+        GIVEN a Recon instance with a service capped at one request in
+            flight
+        WHEN several targets are queried
+        THEN requests to that service must be executed sequentially
+        """
+        service = StubService("slow", 0.1, {f"{i}.com": set() for i in range(3)})
+        start = time.perf_counter()
+        Recon([service], concurrency={"slow": 1}).fetch_subdomains(
+            f"{i}.com" for i in range(3)
+        )
+        assert time.perf_counter() - start >= 0.3
+
+    def test_errors_are_recorded(self):
+        """
+        GIVEN a Recon instance with a failing service
+        WHEN its fetch_subdomains method is executed
+        THEN the error must be recorded without interrupting the
+            remaining services unless raise_errors is set
+        """
+        services = (
+            StubService("ok", 0.0, {"a.com": {"x.a.com"}}),
+            StubService("broken", 0.0, {}),
+        )
+        recon = Recon(services)
+        assert recon.fetch_subdomains(["a.com"]) == {"a.com": {"x.a.com"}}
+        assert [(name, target) for name, target, _ in recon.errors] == [
+            ("broken", "a.com")
+        ]
+
+        with pytest.raises(ConnectionError):
+            Recon(services, raise_errors=True).fetch_subdomains(["a.com"])
+
+    def test_invalid_results_are_recorded(self):
+        """
+        GIVEN a Recon instance with a service returning a value that is
+            not an iterable of subdomains
+        WHEN its fetch_subdomains method is executed
+        THEN the resulting error must be recorded unless raise_errors is
+            set
+        """
+        services = (
+            StubService("ok", 0.0, {"a.com": {"x.a.com"}}),
+            _InvalidResultService("invalid", 0.0, {}),
+        )
+        recon = Recon(services)
+        assert recon.fetch_subdomains(["a.com"]) == {"a.com": {"x.a.com"}}
+        assert [(name, target) for name, target, _ in recon.errors] == [
+            ("invalid", "a.com")
+        ]
+
+        with pytest.raises(TypeError):
+            Recon(services, raise_errors=True).fetch_subdomains(["a.com"])
+
+    def test_async_services_are_rejected(self):
+        """
+        GIVEN an instance of an asynchronous service
+        WHEN a Recon instance is created with it
+        THEN TypeError must be raised
+        """
+        with pytest.raises(TypeError, match="AsyncCRTShAPI"):
+            Recon([AsyncCRTShAPI()])
+
+    def test_run_without_retaining_results(self):
+        """
+        GIVEN a Recon instance with several services
+        WHEN its run method is executed with "retain" set to False
+        THEN every result must be yielded and the results of each target
+            must be discarded once every service has answered for it
+        """
+        services = (
+            StubService("A", 0.0, {f"{i}.com": {f"a.{i}.com"} for i in range(5)}),
+            StubService("B", 0.0, {}),
+        )
+        recon = Recon(services)
+        yielded = {
+            name
+            for *_, new in recon.run((f"{i}.com" for i in range(5)), retain=False)
+            for name in new
+        }
+        assert yielded == {f"a.{i}.com" for i in range(5)}
+        assert len(recon.errors) == 5
+        assert recon.subdomains == {} and services[0].subdomains == {}
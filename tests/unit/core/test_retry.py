@@ -0,0 +1,153 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import time
+from urllib.error import HTTPError, URLError
+
+import pytest
+
+from reconlib.core.exceptions import ServiceUnavailableError
+from reconlib.core.retry import CircuitBreaker, RetryPolicy
+
+
+def _http_error(code: int) -> HTTPError:
+    return HTTPError("https://example.com", code, "", {}, None)
+
+
+class TestRetryPolicy:
+    @pytest.mark.parametrize(
+        "error, retryable",
+        [
+            (_http_error(503), True),
+            (_http_error(429), True),
+            (_http_error(404), False),
+            (_http_error(401), False),
+            (ConnectionResetError(), True),
+            (TimeoutError(), True),
+            (URLError("Name or service not known"), True),
+            (ValueError(), False),
+        ],
+    )
+    def test_is_retryable(self, error, retryable):
+        assert RetryPolicy().is_retryable(error) is retryable
+
+    def test_max_retries(self):
+        """
+        GIVEN a RetryPolicy allowing two retries
+        WHEN a retryable error is raised on successive attempts
+        THEN only the first two attempts must be retried
+        """
+        policy = RetryPolicy(max_retries=2)
+        error = _http_error(502)
+        assert [policy.should_retry(error, n) for n in range(3)] == [
+            True,
+            True,
+            False,
+        ]
+
+    def test_backoff(self):
+        """
+        GIVEN RetryPolicy instances with and without jitter
+        WHEN the backoff delay of successive attempts is computed
+        THEN delays must grow exponentially up to the maximum backoff,
+            with jittered delays never exceeding them
+        """
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+        assert [policy.backoff(n) for n in range(5)] == [1, 2, 4, 5, 5]
+        jittered = RetryPolicy(backoff_factor=1, max_backoff=5)
+        assert all(0 <= jittered.backoff(n) <= min(5, 2**n) for n in range(10))
+
+    def test_retry_transient_failure(self, local_service):
+        """
+        GIVEN an ExternalService instance
+        WHEN a request fails once with HTTP 503
+        THEN the request must be retried and its response returned
+        """
+        service = local_service(retry_policy=RetryPolicy(backoff_factor=0.01))
+        url = service.get_query_url("/flaky/retry")
+        assert service._query_service(url) == "/flaky/retry"
+        assert service.transport.statistics["requests"] == 2
+
+    def test_no_retry_on_client_error(self, local_service):
+        """
+        GIVEN an ExternalService instance
+        WHEN a request fails with HTTP 404
+        THEN the error must be raised without retrying the request
+        """
+        service = local_service()
+        with pytest.raises(HTTPError):
+            service._query_service(service.get_query_url("/missing"))
+        assert service.transport.statistics["requests"] == 1
+
+
+class TestCircuitBreaker:
+    def test_state_transitions(self):
+        """
+        GIVEN a CircuitBreaker instance with a threshold of two failures
+        WHEN requests fail and the recovery timeout elapses
+        THEN the breaker must open, let a single trial request through
+            once half-open and close again after a success
+        """
+        breaker = CircuitBreaker("example.com", 2, recovery_timeout=0.05)
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(ServiceUnavailableError):
+            breaker.before_request()
+
+        time.sleep(0.06)
+        assert breaker.state == "half-open"
+        breaker.before_request()  # Trial request
+        with pytest.raises(ServiceUnavailableError):
+            breaker.before_request()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        time.sleep(0.06)
+        breaker.before_request()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_fail_fast(self, local_service):
+        """
+        GIVEN an ExternalService instance
+        WHEN a host keeps failing until its circuit breaker opens
+        THEN subsequent requests must fail without reaching the network
+        """
+        service = local_service(
+            retry_policy=RetryPolicy(
+                max_retries=1,
+                backoff_factor=0,
+                failure_threshold=2,
+                recovery_timeout=60,
+            )
+        )
+        url = service.get_query_url("/down")
+        with pytest.raises(HTTPError):
+            service._query_service(url)
+        with pytest.raises(ServiceUnavailableError):
+            service._query_service(url)
+        assert service.transport.statistics["requests"] == 2
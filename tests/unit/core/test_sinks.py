@@ -0,0 +1,134 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import csv
+import json
+
+from reconlib import CRTShAPI, HackerTargetAPI
+from reconlib.core.sinks import FIELDS, ColumnarSink, CSVSink, NDJSONSink
+
+
+def _record(i: int) -> dict:
+    return {
+        "service": "CRTSh",
+        "target": "github.com",
+        "type": "subdomain",
+        "name": f"host{i}.github.com",
+        "value": None,
+    }
+
+
+class TestResultSinks:
+    def test_ndjson_sink(self, tmp_path):
+        """
+        GIVEN a NDJSONSink instance with a batch size of two records
+        WHEN three records are written to it
+        THEN the first two records must be written to the file before
+            the sink is closed and the third one when it is closed
+        """
+        file_path = tmp_path.joinpath("results.ndjson")
+        with NDJSONSink(file_path, batch_size=2) as sink:
+            for i in range(3):
+                sink.write(_record(i))
+            assert len(file_path.read_text().splitlines()) == 2
+        lines = file_path.read_text().splitlines()
+        assert [json.loads(line) for line in lines] == [_record(i) for i in range(3)]
+        assert sink.records == 3
+
+    def test_csv_sink_appends(self, tmp_path):
+        """
+        GIVEN a CSV file previously written by a CSVSink
+        WHEN more records are written to it by another CSVSink
+        THEN the records must be appended without a second header
+        """
+        file_path = tmp_path.joinpath("results.csv")
+        for i in range(2):
+            with CSVSink(file_path) as sink:
+                sink.write({**_record(i), "owner": "ignored"})
+
+        with open(file_path, newline="") as file:
+            rows = list(csv.DictReader(file))
+        assert [row["name"] for row in rows] == ["host0.github.com", "host1.github.com"]
+        assert tuple(rows[0]) == FIELDS
+
+    def test_columnar_sink(self, tmp_path):
+        """
+        GIVEN a ColumnarSink instance
+        WHEN records are written to it
+        THEN they must be converted into batches of columns
+        """
+        batches = []
+        file_path = tmp_path.joinpath("results.columns")
+        with ColumnarSink(file_path, batch_size=3, on_batch=batches.append) as sink:
+            for i in range(4):
+                sink.write(_record(i))
+
+        assert [len(batch["name"]) for batch in batches] == [3, 1]
+        assert batches[0]["type"] == ["subdomain"] * 3
+        assert [json.loads(line) for line in file_path.read_text().splitlines()] == (
+            batches
+        )
+
+    def test_services_write_to_sink(
+        self,
+        mocker,
+        crtsh_github_response,
+        crtsh_github_domains,
+        hackertarget_hostsearch_github_response,
+        hackertarget_dnslookup_github_response,
+    ):
+        """
+        GIVEN services sharing a ColumnarSink
+        WHEN results are fetched by the services
+        THEN every new subdomain and every parsed result must be written
+            to the sink
+        """
+        mocker.patch(
+            "reconlib.crtsh.api.CRTShAPI._query_service",
+            return_value=crtsh_github_response,
+        )
+        mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            side_effect=[
+                hackertarget_hostsearch_github_response,
+                hackertarget_dnslookup_github_response,
+            ],
+        )
+
+        records = []
+        with ColumnarSink(batch_size=1, on_batch=records.append) as sink:
+            crtsh = CRTShAPI(sink=sink)
+            crtsh.fetch_subdomains("github.com")
+            crtsh.fetch_subdomains("github.com")
+            hackertarget = HackerTargetAPI(sink=sink)
+            hackertarget.hostsearch("github.com")
+            hackertarget.dnslookup("github.com")
+
+        kinds = [(batch["service"][0], batch["type"][0]) for batch in records]
+        assert kinds.count(("CRTSh", "subdomain")) == len(crtsh_github_domains)
+        assert kinds.count(("HackerTarget", "host")) == len(
+            hackertarget_hostsearch_github_response.splitlines()
+        )
+        assert ("HackerTarget", "dns_record") in kinds
@@ -0,0 +1,164 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from reconlib import CRTShAPI, HackerTargetAPI
+from reconlib.core.snapshots import SnapshotStore
+
+
+def _certificate(certificate_id: int, name: str) -> dict:
+    return {"id": certificate_id, "common_name": name, "name_value": name}
+
+
+class TestSnapshotStore:
+    def test_save_and_load(self, tmp_path):
+        store = SnapshotStore(tmp_path.joinpath("snapshots.db"))
+        assert store.load("CRTSh", "github.com").names == frozenset()
+
+        store.save("CRTSh", "github.com", {"a.github.com", "b.github.com"}, 42)
+        snapshot = SnapshotStore(store.path).load("CRTSh", "github.com")
+        assert snapshot.names == {"a.github.com", "b.github.com"}
+        assert snapshot.watermark == 42
+        assert snapshot.updated is not None
+
+    def test_diff(self, tmp_path):
+        """
+        GIVEN a SnapshotStore instance containing a snapshot
+        WHEN it is compared with the names found by a new run
+        THEN the names added and removed must be returned and the
+            snapshot must be replaced
+        """
+        store = SnapshotStore(tmp_path.joinpath("snapshots.db"))
+        store.save("VirusTotal", "github.com", {"a.github.com", "b.github.com"})
+
+        diff = store.diff("VirusTotal", "github.com", {"b.github.com", "c.github.com"})
+        assert diff.added == {"c.github.com"}
+        assert diff.removed == {"a.github.com"}
+        assert store.load("VirusTotal", "github.com").names == {
+            "b.github.com",
+            "c.github.com",
+        }
+
+        diff = store.diff("VirusTotal", "github.com", set(), incremental=True)
+        assert diff.added == diff.removed == set()
+        assert len(store.load("VirusTotal", "github.com").names) == 2
+
+    def test_crtsh_watermark(self, mocker, tmp_path):
+        """
+        GIVEN a CRTShAPI instance and a SnapshotStore holding the
+            results of a previous run
+        WHEN the subdomains of the same target are compared again
+        THEN certificates up to the highest identifier of the last run
+            must be skipped and only new subdomains must be reported
+        """
+        responses = [
+            [_certificate(1, "a.github.com"), _certificate(2, "b.github.com")],
+            [
+                _certificate(1, "a.github.com"),
+                _certificate(2, "b.github.com"),
+                _certificate(3, "c.github.com"),
+            ],
+        ]
+        mocker.patch(
+            "reconlib.crtsh.api.CRTShAPI._query_service",
+            side_effect=[json.dumps(response) for response in responses],
+        )
+        store = SnapshotStore(tmp_path.joinpath("snapshots.db"))
+
+        diff = CRTShAPI().diff_subdomains("github.com", store)
+        assert diff.added == {"a.github.com", "b.github.com"}
+
+        crtsh = CRTShAPI()
+        diff = crtsh.diff_subdomains("github.com", store)
+        assert diff.added == {"c.github.com"}
+        assert diff.removed == set()
+        assert [c["id"] for c in crtsh.results["github.com"]] == [3]
+        snapshot = store.load("CRTSh", "github.com")
+        assert snapshot.watermark == 3
+        assert len(snapshot.names) == 3
+
+    def test_crtsh_watermark_with_parse_executor(self, mocker, tmp_path):
+        """
+        GIVEN a CRTShAPI instance with a parse executor and a
+            SnapshotStore holding the results of a previous run
+        WHEN the subdomains of the same target are compared again
+        THEN certificates up to the highest identifier of the last run
+            must be skipped by the executor and the highest identifier
+            it reports must be stored
+        """
+        responses = [
+            [_certificate(1, "a.github.com"), _certificate(2, "b.github.com")],
+            [
+                _certificate(1, "a.github.com"),
+                _certificate(2, "b.github.com"),
+                _certificate(3, "c.github.com"),
+            ],
+        ]
+        mocker.patch(
+            "reconlib.crtsh.api.CRTShAPI._fetch",
+            side_effect=[json.dumps(response).encode() for response in responses],
+        )
+        store = SnapshotStore(tmp_path.joinpath("snapshots.db"))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            crtsh = CRTShAPI(parse_executor=executor)
+            offload = mocker.spy(crtsh, "_offload")
+            diff = crtsh.diff_subdomains("github.com", store)
+            assert diff.added == {"a.github.com", "b.github.com"}
+            assert store.load("CRTSh", "github.com").watermark == 2
+
+            diff = crtsh.diff_subdomains("github.com", store)
+        assert diff.added == {"c.github.com"}
+        assert diff.removed == set()
+        assert [call.kwargs["since_id"] for call in offload.call_args_list] == [
+            None,
+            2,
+        ]
+        snapshot = store.load("CRTSh", "github.com")
+        assert snapshot.watermark == 3
+        assert len(snapshot.names) == 3
+
+    def test_removed_subdomains(self, mocker, tmp_path):
+        """
+        GIVEN a HackerTargetAPI instance and a SnapshotStore holding the
+            results of a previous run
+        WHEN a subdomain is no longer returned by the service
+        THEN it must be reported as removed
+        """
+        mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            side_effect=[
+                "a.github.com,140.82.112.3\nb.github.com,140.82.112.4",
+                "b.github.com,140.82.112.4",
+            ],
+        )
+        store = SnapshotStore(tmp_path.joinpath("snapshots.db"))
+        (hackertarget := HackerTargetAPI()).diff_subdomains("github.com", store)
+
+        diff = hackertarget.diff_subdomains("github.com", store)
+        assert diff.added == set()
+        assert diff.removed == {"a.github.com"}
@@ -0,0 +1,181 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import threading
+from urllib.error import HTTPError
+
+import pytest
+
+from reconlib.core.transport import ConnectionPool
+
+
+class TestConnectionPool:
+    def test_connection_reuse(self, local_server):
+        """
+        GIVEN a ConnectionPool instance
+        WHEN several sequential requests are sent to the same host
+        THEN a single connection must be opened and reused by all of
+            them
+        """
+        pool = ConnectionPool()
+        for i in range(5):
+            with pool.urlopen(f"{local_server}/path/{i}") as response:
+                assert response.read() == f"/path/{i}".encode()
+        assert pool.statistics["connections_opened"] == 1
+        assert pool.statistics["connections_reused"] == 4
+        assert pool.statistics["reuse_ratio"] == pytest.approx(0.8)
+        pool.clear()
+
+    def test_max_requests_per_connection(self, local_server):
+        """
+        GIVEN a ConnectionPool instance limited to two requests per
+            connection
+        WHEN four sequential requests are sent to the same host
+        THEN two connections must be opened
+        """
+        pool = ConnectionPool(max_requests=2)
+        for _ in range(4):
+            with pool.urlopen(local_server) as response:
+                response.read()
+        assert pool.statistics["connections_opened"] == 2
+        pool.clear()
+
+    def test_idle_timeout(self, local_server):
+        """
+        GIVEN a ConnectionPool instance with an idle timeout of zero
+        WHEN two sequential requests are sent to the same host
+        THEN the idle connection must be discarded and a new one opened
+        """
+        pool = ConnectionPool(idle_timeout=0)
+        for _ in range(2):
+            with pool.urlopen(local_server) as response:
+                response.read()
+        assert pool.statistics["connections_opened"] == 2
+
+    def test_unread_response_is_not_reused(self, local_server):
+        """
+        GIVEN a ConnectionPool instance
+        WHEN a response is closed before its body is entirely read
+        THEN its connection must not be handed back to the pool
+        """
+        pool = ConnectionPool()
+        with pool.urlopen(local_server):
+            pass
+        assert pool.statistics["idle_connections"] == 0
+
+    def test_concurrent_requests(self, local_server):
+        """
+        GIVEN a ConnectionPool instance limited to two idle connections
+        WHEN requests are sent concurrently from several threads
+        THEN all of them must succeed and no more than two connections
+            must be kept idle
+        """
+        pool = ConnectionPool(max_size=2)
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(10):
+                    with pool.urlopen(local_server) as response:
+                        response.read()
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert pool.statistics["requests"] == 40
+        assert pool.statistics["idle_connections"] <= 2
+        pool.clear()
+
+    def test_http_error(self, local_server):
+        """
+        GIVEN a ConnectionPool instance
+        WHEN the server responds with an error status code
+        THEN an HTTPError must be raised and the connection must remain
+            available for reuse
+        """
+        pool = ConnectionPool()
+        with pytest.raises(HTTPError) as e:
+            pool.urlopen(f"{local_server}/missing")
+        assert e.value.code == 404
+        assert pool.statistics["idle_connections"] == 1
+        pool.clear()
+
+    def test_http_proxy(self, local_server):
+        """
+        GIVEN a ConnectionPool instance configured with an HTTP proxy
+        WHEN a plain HTTP request is sent
+        THEN it must be sent to the proxy with the absolute URL of the
+            resource, unless its host is excluded from proxying
+        """
+        pool = ConnectionPool(proxies={"http": local_server})
+        with pool.urlopen("http://example.test/path?q=1") as response:
+            assert response.read() == b"http://example.test:80/path?q=1"
+        pool.clear()
+
+        pool = ConnectionPool(
+            proxies={"http": "http://127.0.0.1:9", "no": "127.0.0.1,localhost"}
+        )
+        with pool.urlopen(f"{local_server}/direct") as response:
+            assert response.read() == b"/direct"
+        pool.clear()
+
+    def test_https_proxy(self, local_server):
+        """
+        GIVEN a ConnectionPool instance configured with an HTTPS proxy
+            requiring credentials
+        WHEN an HTTPS request is sent
+        THEN a tunnel must be requested from the proxy with the
+            credentials of the proxy URL
+        """
+        proxy = local_server.replace("http://", "http://user:p%40ss@")
+        pool = ConnectionPool(proxies={"https": proxy})
+        assert pool._proxy(("https", "example.test", 443))[2] == {
+            "Proxy-Authorization": "Basic dXNlcjpwQHNz"
+        }
+        # The local server does not support the CONNECT method
+        with pytest.raises(OSError, match="Tunnel connection failed: 501"):
+            pool.urlopen("https://example.test/")
+
+    def test_proxies_from_environment(self, monkeypatch):
+        """
+        GIVEN the http_proxy, https_proxy and no_proxy environment
+            variables
+        WHEN a ConnectionPool instance is created without proxies
+        THEN the proxies of the environment must be used
+        """
+        monkeypatch.setenv("http_proxy", "http://proxy.test:3128")
+        monkeypatch.setenv("https_proxy", "http://proxy.test:3129")
+        monkeypatch.setenv("no_proxy", "internal.test")
+        pool = ConnectionPool()
+        assert pool._proxy(("http", "example.test", 80)) == ("proxy.test", 3128, {})
+        assert pool._proxy(("https", "example.test", 443))[:2] == ("proxy.test", 3129)
+        assert pool._proxy(("https", "internal.test", 443)) is None
+        assert ConnectionPool(proxies={})._proxy(("http", "example.test", 80)) is None
@@ -23,7 +23,10 @@ Contact: https://www.twitter.com/eon_raider
     <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
 """
 
-from reconlib import CRTShAPI
+import asyncio
+
+from reconlib import AsyncCRTShAPI, CRTShAPI
+from reconlib.crtsh.results import CertificateTable
 
 
 class TestCRTShAPI:
@@ -92,6 +95,31 @@ class TestCRTShAPI:
         assert domain_info.results == parsed_crtsh_github_response
         assert domain_info.subdomains[target] == crtsh_github_domains
 
+    def test_fetch_compact_certificates(
+        self,
+        mocker,
+        crtsh_github_response,
+        parsed_crtsh_github_response,
+        crtsh_github_domains,
+    ):
+        """
+        GIVEN an object of type CRTShAPI with compact results enabled
+        WHEN its fetch_certificates method is executed
+        THEN the certificates must be stored in a CertificateTable
+            equivalent to the response of the service
+        """
+        mocker.patch(
+            "reconlib.crtsh.api.CRTShAPI._query_service",
+            return_value=crtsh_github_response,
+        )
+
+        target = "github.com"
+        (crtsh := CRTShAPI(compact_results=True)).fetch_certificates(target=target)
+
+        assert isinstance(crtsh.results[target], CertificateTable)
+        assert crtsh.results[target] == parsed_crtsh_github_response[target]
+        assert crtsh.subdomains[target] == crtsh_github_domains
+
     def test_fetch_subdomains(
         self, mocker, crtsh_github_response, crtsh_github_domains
     ):
@@ -110,3 +138,61 @@ class TestCRTShAPI:
         )
 
         assert CRTShAPI().fetch_subdomains(target="github.com") == crtsh_github_domains
+
+    def test_async_fetch_subdomains(
+        self, mocker, crtsh_github_response, crtsh_github_domains
+    ):
+        """
+        GIVEN a correctly instantiated object of type AsyncCRTShAPI
+        WHEN a string containing a correctly formatted domain is passed
+            as an argument to its fetch_subdomains coroutine
+        THEN a set of subdomains must be returned by the service without
+            exceptions
+        """
+        mocker.patch(
+            "reconlib.crtsh.api.AsyncCRTShAPI._query_service",
+            return_value=crtsh_github_response,
+        )
+
+        assert (
+            asyncio.run(AsyncCRTShAPI().fetch_subdomains(target="github.com"))
+            == crtsh_github_domains
+        )
+
+    def test_stream_certificates(
+        self, mocker, crtsh_github_response, parsed_crtsh_github_response
+    ):
+        """
+        GIVEN a correctly instantiated object of type CRTShAPI
+        WHEN the response of crt.sh is received in small chunks by its
+            stream_certificates method
+        THEN each certificate must be yielded in order without being
+            stored in the results attribute
+        """
+        raw = crtsh_github_response.encode()
+        mocker.patch(
+            "reconlib.crtsh.api.CRTShAPI._stream_service",
+            return_value=(raw[i : i + 64] for i in range(0, len(raw), 64)),
+        )
+
+        crtsh = CRTShAPI()
+        certificates = list(crtsh.stream_certificates(target="github.com"))
+        assert certificates == parsed_crtsh_github_response["github.com"]
+        assert not crtsh.results
+
+    def test_stream_subdomains(
+        self, mocker, crtsh_github_response, crtsh_github_domains
+    ):
+        """
+        GIVEN a correctly instantiated object of type CRTShAPI
+        WHEN its stream_subdomains method is executed
+        THEN each known subdomain must be yielded exactly once
+        """
+        mocker.patch(
+            "reconlib.crtsh.api.CRTShAPI._stream_service",
+            return_value=iter([crtsh_github_response.encode()]),
+        )
+
+        subdomains = list(CRTShAPI().stream_subdomains(target="github.com"))
+        assert len(subdomains) == len(crtsh_github_domains)
+        assert set(subdomains) == crtsh_github_domains
@@ -0,0 +1,85 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import pytest
+
+from reconlib.crtsh.names import SubdomainExtractor, target_suffix
+
+
+class TestSubdomainExtractor:
+    @pytest.mark.parametrize(
+        "target, suffix",
+        [
+            ("github.com", "github.com"),
+            ("%.GitHub.com.", "github.com"),
+            ("git%.com", None),
+        ],
+    )
+    def test_target_suffix(self, target, suffix):
+        assert target_suffix(target) == suffix
+
+    def test_normalization(self):
+        """
+        GIVEN a SubdomainExtractor instance
+        WHEN names in different cases, with wildcards, trailing dots and
+            out of the scope of the target are fed to it
+        THEN only normalized subdomains of the target must be returned,
+            each of them only once
+        """
+        extractor = SubdomainExtractor("github.com")
+        assert extractor.add(
+            {
+                "common_name": "*.API.github.com",
+                "name_value": "*.api.github.com\napi.github.com.\n"
+                "github.com\nevilgithub.com\nadmin@github.com\nwww.github.com",
+            }
+        ) == ["api.github.com", "github.com", "www.github.com"]
+        assert extractor.feed("WWW.GITHUB.COM", None, "") == []
+        assert extractor.subdomains == {
+            "api.github.com",
+            "github.com",
+            "www.github.com",
+        }
+
+    def test_pattern_target(self):
+        """
+        GIVEN a SubdomainExtractor instance for a target containing a
+            pattern
+        WHEN names are fed to it
+        THEN every name except e-mail addresses must be kept
+        """
+        extractor = SubdomainExtractor("git%.com")
+        assert extractor.feed("gitlab.com\ngithub.com\nadmin@github.com") == [
+            "gitlab.com",
+            "github.com",
+        ]
+
+    def test_shared_set(self):
+        subdomains = {"www.github.com"}
+        extractor = SubdomainExtractor("github.com", subdomains)
+        assert extractor.update(
+            [{"common_name": "www.github.com", "name_value": "api.github.com"}]
+        ) == ["api.github.com"]
+        assert subdomains == {"www.github.com", "api.github.com"}
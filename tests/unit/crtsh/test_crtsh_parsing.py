@@ -0,0 +1,119 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from reconlib import AsyncCRTShAPI, CRTShAPI
+from reconlib.core.index import SubdomainIndex
+from reconlib.crtsh.parsing import parse_response
+from reconlib.crtsh.results import CertificateTable
+
+
+@pytest.fixture(scope="module")
+def process_pool():
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        yield executor
+
+
+class TestParseResponse:
+    def test_parse_response(self, crtsh_github_response, crtsh_github_domains):
+        body = crtsh_github_response.encode()
+        ids = [certificate["id"] for certificate in json.loads(body)]
+
+        parsed = parse_response(body, "github.com")
+        assert parsed.subdomains == crtsh_github_domains
+        assert parsed.certificates is None
+        assert parsed.last_id == max(ids)
+
+        compact = parse_response(body, "github.com", compact_results=True)
+        assert compact.subdomains == crtsh_github_domains
+        assert compact.certificates == json.loads(body)
+
+        assert parse_response(body, "github.com", since_id=max(ids)).subdomains == set()
+
+
+class TestParseExecutor:
+    def test_fetch_subdomains(
+        self, mocker, process_pool, crtsh_github_response, crtsh_github_domains
+    ):
+        """
+        GIVEN a CRTShAPI instance with a process pool as parse executor
+        WHEN the subdomains of a target are fetched
+        THEN the response must be parsed in the pool and the subdomains
+            found must be stored and recorded as if parsed in-process
+        """
+        mocker.patch(
+            "reconlib.crtsh.api.CRTShAPI._fetch",
+            return_value=crtsh_github_response.encode(),
+        )
+        crtsh = CRTShAPI(parse_executor=process_pool, index=(index := SubdomainIndex()))
+        assert crtsh.fetch_subdomains(target="github.com") == crtsh_github_domains
+        assert set(index) == crtsh_github_domains
+        assert "github.com" not in crtsh.results
+
+    def test_fetch_compact_certificates(
+        self, mocker, process_pool, crtsh_github_response, crtsh_github_domains
+    ):
+        """
+        GIVEN a CRTShAPI instance with compact results and a process
+            pool as parse executor
+        WHEN the certificates of a target are fetched
+        THEN a CertificateTable built in the pool must be returned and
+            stored along with the subdomains found
+        """
+        mocker.patch(
+            "reconlib.crtsh.api.CRTShAPI._fetch",
+            return_value=crtsh_github_response.encode(),
+        )
+        crtsh = CRTShAPI(compact_results=True, parse_executor=process_pool)
+        certificates = crtsh.fetch_certificates(target="github.com")
+        assert isinstance(certificates, CertificateTable)
+        assert certificates == json.loads(crtsh_github_response)
+        assert crtsh.results["github.com"] is certificates
+        assert crtsh.subdomains["github.com"] == crtsh_github_domains
+
+    def test_async_fetch_subdomains(
+        self, mocker, process_pool, crtsh_github_response, crtsh_github_domains
+    ):
+        """
+        GIVEN an AsyncCRTShAPI instance with a process pool as parse
+            executor
+        WHEN the subdomains of a target are fetched
+        THEN the response must be parsed in the pool without blocking
+            the event loop
+        """
+        mocker.patch(
+            "reconlib.crtsh.api.AsyncCRTShAPI._fetch",
+            return_value=crtsh_github_response.encode(),
+        )
+        crtsh = AsyncCRTShAPI(parse_executor=process_pool)
+        assert (
+            asyncio.run(crtsh.fetch_subdomains(target="github.com"))
+            == crtsh_github_domains
+        )
@@ -0,0 +1,149 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+from reconlib.crtsh.results import (
+    CertificateTable,
+    format_timestamp,
+    parse_timestamp,
+)
+
+
+@pytest.fixture
+def certificates(parsed_crtsh_github_response) -> list[dict]:
+    return parsed_crtsh_github_response["github.com"]
+
+
+class TestTimestamps:
+    @pytest.mark.parametrize(
+        "timestamp",
+        [
+            "2023-01-10T23:48:41.932",
+            "2022-10-05T18:07:17.34",
+            "2022-10-05T18:07:17.000001",
+            "2024-01-24T23:59:59",
+            "1969-12-31T23:59:59.5",
+            None,
+        ],
+    )
+    def test_round_trip(self, timestamp):
+        """
+        GIVEN a timestamp in the format returned by crt.sh
+        WHEN it is converted to an integer and back into a string
+        THEN the original timestamp must be returned
+        """
+        assert format_timestamp(parse_timestamp(timestamp)) == timestamp
+
+    def test_parse_timestamp(self):
+        assert parse_timestamp("1970-01-01T00:00:01.5") == 1_500_000
+
+
+class TestCertificateTable:
+    def test_round_trip(self, certificates):
+        """
+        GIVEN a list of certificates returned by crt.sh
+        WHEN a CertificateTable is created from it
+        THEN iterating over the table, indexing it and converting it
+            back must return the original certificates
+        """
+        table = CertificateTable(certificates)
+        assert len(table) == len(certificates)
+        assert table.to_dicts() == certificates
+        assert list(table) == certificates
+        assert table[0] == certificates[0]
+        assert table[-1] == certificates[-1]
+        assert table == certificates
+
+    def test_interned_issuers(self, certificates):
+        table = CertificateTable(certificates)
+        assert set(table.issuers) == {c["issuer_name"] for c in certificates}
+        assert len(table.issuers) < len(table)
+        assert table.column("id").typecode == "q"
+
+    def test_unknown_and_missing_keys(self):
+        """
+        GIVEN certificates with missing values and unknown keys
+        WHEN they are stored in a CertificateTable
+        THEN missing values must be returned as None and unknown keys
+            must be preserved
+        """
+        table = CertificateTable(
+            [{"id": 1, "common_name": "a.b.c", "result_count": 3}, {"id": 2}]
+        )
+        assert table[0]["result_count"] == 3
+        assert table[0]["entry_timestamp"] is None
+        assert "result_count" not in table[1]
+        assert table[1]["issuer_ca_id"] is None
+        assert table.column("result_count") == [3, None]
+        assert table.filter(lambda c: c["id"] == 2) == [table[1]]
+
+    def test_filter(self, certificates):
+        """
+        GIVEN a CertificateTable instance
+        WHEN it is filtered by issuer, entry timestamp or predicate
+        THEN a new table containing only the matching certificates must
+            be returned
+        """
+        table = CertificateTable(certificates)
+        issuer = certificates[0]["issuer_name"]
+        assert table.filter(issuer_name=issuer) == [
+            c for c in certificates if c["issuer_name"] == issuer
+        ]
+        assert len(table.filter(issuer_name="unknown")) == 0
+
+        since = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        assert table.filter(since=since) == [
+            c for c in certificates if c["entry_timestamp"] >= "2023-01-01"
+        ]
+        assert table.filter(until="2023-01-01T00:00:00") == [
+            c for c in certificates if c["entry_timestamp"] < "2023-01-01"
+        ]
+        assert table.filter(lambda c: c["common_name"].startswith("*")) == [
+            c for c in certificates if c["common_name"].startswith("*")
+        ]
+
+    def test_memory_usage(self, certificates):
+        """
+        GIVEN a large number of certificates
+        WHEN they are stored in a CertificateTable
+        THEN the table must be smaller than the list of dictionaries,
+            even if every certificate carries a key unknown to the table
+        """
+        rows = [
+            dict(c, id=c["id"] + i, result_count=i)
+            for i in range(200)
+            for c in certificates
+        ]
+        table = CertificateTable(rows)
+        dict_size = sys.getsizeof(rows) + sum(map(sys.getsizeof, rows))
+        table_size = sum(map(sys.getsizeof, table._columns.values())) + sum(
+            map(sys.getsizeof, table._extra.values())
+        )
+        assert table_size < dict_size / 3
+        assert table == rows
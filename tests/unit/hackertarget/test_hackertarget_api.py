@@ -23,12 +23,15 @@ Contact: https://www.twitter.com/eon_raider
     <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
 """
 
+import asyncio
+import time
 from ipaddress import IPv4Address, IPv4Network
+from urllib.parse import parse_qs, urlsplit
 
 import pytest
 
 from reconlib.core.exceptions import InvalidTargetError
-from reconlib import HackerTargetAPI
+from reconlib import AsyncHackerTargetAPI, HackerTargetAPI
 from reconlib.hackertarget.api import HackerTarget
 
 
@@ -227,3 +230,201 @@ class TestHackerTargetAPI:
             f"appear to be an IPv4 or IPv6 address"
         )
         assert e.value.code == 1
+
+    def test_reverse_dns_many(self, mocker):
+        """
+        GIVEN a correctly instantiated object of type HackerTargetAPI
+        WHEN IP addresses and networks are passed as an argument to its
+            reverse_dns_many method
+        THEN every host address must be resolved and addresses already
+            resolved must not be requested again
+        """
+
+        def reverse_dns_response(url):
+            ip_addr = parse_qs(urlsplit(url).query)["q"][0]
+            return f"{ip_addr} host-{ip_addr.replace('.', '-')}.github.com"
+
+        query_service = mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            side_effect=reverse_dns_response,
+        )
+
+        results = dict(
+            (domain_info := HackerTargetAPI()).reverse_dns_many(
+                [IPv4Network("10.0.0.0/30"), "10.0.0.1", IPv4Address("10.0.0.9")],
+                concurrency=1,
+            )
+        )
+        assert results == {
+            "10.0.0.1": {IPv4Address("10.0.0.1"): "host-10-0-0-1.github.com"},
+            "10.0.0.2": {IPv4Address("10.0.0.2"): "host-10-0-0-2.github.com"},
+            "10.0.0.9": {IPv4Address("10.0.0.9"): "host-10-0-0-9.github.com"},
+        }
+        assert query_service.call_count == 3
+        assert domain_info.hostnames[IPv4Address("10.0.0.2")] == (
+            "host-10-0-0-2.github.com"
+        )
+
+    def test_aslookup_many(self, mocker, hackertarget_aslookup_github_response):
+        """
+        GIVEN a correctly instantiated object of type HackerTargetAPI
+        WHEN many IP addresses are passed as an argument to its
+            aslookup_many method
+        THEN addresses within the network of a known ASN must be
+            answered without new requests and invalid addresses must be
+            reported
+        """
+        query_service = mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            return_value=hackertarget_aslookup_github_response,
+        )
+
+        results = dict(
+            HackerTargetAPI().aslookup_many(
+                ["140.82.114.27", "140.82.114.0/29"], concurrency=1
+            )
+        )
+        assert len(results) == 7
+        assert all(result["ASN"] == 36459 for result in results.values())
+        assert results["140.82.114.5"]["IP_ADDRESS"] == IPv4Address("140.82.114.5")
+        assert query_service.call_count == 1
+
+        with pytest.raises(InvalidTargetError):
+            list(HackerTargetAPI().aslookup_many(["NOT-AN-IP-ADDRESS"]))
+
+    def test_concurrent_lookups_are_coalesced(
+        self, mocker, hackertarget_aslookup_github_response
+    ):
+        """
+        GIVEN a correctly instantiated object of type HackerTargetAPI
+        WHEN duplicate addresses, or addresses of the same network, are
+            looked up concurrently
+        THEN a single request must be sent while the others wait for its
+            result
+        """
+
+        def slow_response(response):
+            def query_service(url):
+                time.sleep(0.05)
+                return response
+
+            return query_service
+
+        query_service = mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            side_effect=slow_response("10.0.0.1 host.github.com"),
+        )
+        results = dict(
+            HackerTargetAPI().reverse_dns_many(["10.0.0.1"] * 8, concurrency=4)
+        )
+        assert results == {"10.0.0.1": {IPv4Address("10.0.0.1"): "host.github.com"}}
+        assert query_service.call_count == 1
+
+        query_service.side_effect = slow_response(hackertarget_aslookup_github_response)
+        results = dict(
+            HackerTargetAPI().aslookup_many(["140.82.114.0/29"], concurrency=4)
+        )
+        assert len(results) == 6
+        assert all(result["ASN"] == 36459 for result in results.values())
+        assert query_service.call_count == 2
+
+    def test_async_concurrent_lookups_are_coalesced(
+        self, mocker, hackertarget_aslookup_github_response
+    ):
+        """
+        GIVEN a correctly instantiated object of type AsyncHackerTargetAPI
+        WHEN addresses of the same network are looked up concurrently
+        THEN a single request must be sent while the others wait for its
+            result
+        """
+
+        async def query_service(url):
+            await asyncio.sleep(0.05)
+            return hackertarget_aslookup_github_response
+
+        mocked = mocker.patch(
+            "reconlib.hackertarget.api.AsyncHackerTargetAPI._query_service",
+            side_effect=query_service,
+        )
+
+        async def aslookup_many():
+            return [
+                result
+                async for result in AsyncHackerTargetAPI().aslookup_many(
+                    ["140.82.114.0/29"], concurrency=4
+                )
+            ]
+
+        assert len(asyncio.run(aslookup_many())) == 6
+        assert mocked.call_count == 1
+
+    def test_async_reverse_dns_many(
+        self, mocker, hackertarget_reversedns_github_response
+    ):
+        """
+        GIVEN a correctly instantiated object of type AsyncHackerTargetAPI
+        WHEN IP addresses are passed as an argument to its
+            reverse_dns_many asynchronous generator
+        THEN the hostname of each address must be yielded
+        """
+        mocker.patch(
+            "reconlib.hackertarget.api.AsyncHackerTargetAPI._query_service",
+            return_value=hackertarget_reversedns_github_response,
+        )
+
+        async def reverse_dns_many():
+            return [
+                result
+                async for result in AsyncHackerTargetAPI().reverse_dns_many(
+                    ["140.82.121.9"]
+                )
+            ]
+
+        assert asyncio.run(reverse_dns_many()) == [
+            (
+                "140.82.121.9",
+                {IPv4Address("140.82.121.9"): "lb-140-82-121-9-fra.github.com"},
+            )
+        ]
+
+    def test_async_hostsearch(
+        self,
+        mocker,
+        hackertarget_hostsearch_github_response,
+        hackertarget_github_subdomains,
+    ):
+        """
+        GIVEN a correctly instantiated object of type AsyncHackerTargetAPI
+        WHEN a string containing a correctly formatted domain is passed
+            as an argument to its fetch_subdomains coroutine
+        THEN a set of subdomains must be returned by the service without
+            exceptions
+        """
+        mocker.patch(
+            "reconlib.hackertarget.api.AsyncHackerTargetAPI._query_service",
+            return_value=hackertarget_hostsearch_github_response,
+        )
+
+        assert (
+            asyncio.run(AsyncHackerTargetAPI().fetch_subdomains(target="github.com"))
+            == hackertarget_github_subdomains
+        )
+
+    def test_async_aslookup(self, mocker, hackertarget_aslookup_github_response):
+        """
+        GIVEN a correctly instantiated object of type AsyncHackerTargetAPI
+        WHEN a string containing a valid IP address is passed as an
+            argument to its aslookup coroutine
+        THEN the parsed lookup results must be returned without
+            exceptions
+        """
+        mocker.patch(
+            "reconlib.hackertarget.api.AsyncHackerTargetAPI._query_service",
+            return_value=hackertarget_aslookup_github_response,
+        )
+        assert asyncio.run(AsyncHackerTargetAPI().aslookup(target="140.82.121.9")) == {
+            "ASN": 36459,
+            "IP_ADDRESS": IPv4Address("140.82.114.27"),
+            "NETWORK": IPv4Network("140.82.114.0/24"),
+            "OWNER": "GITHUB, US",
+        }
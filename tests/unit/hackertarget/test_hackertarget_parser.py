@@ -0,0 +1,140 @@
+"""
+ReconLib: A collection of modules and helpers for active and passive
+reconnaissance of remote hosts.
+
+Author: EONRaider
+GitHub: https://github.com/EONRaider
+Contact: https://www.twitter.com/eon_raider
+
+    Copyright (C) 2023 EONRaider @ keybase.io/eonraider
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program. If not, see
+    <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
+"""
+
+from ipaddress import IPv4Address
+
+import pytest
+
+from reconlib import HackerTargetAPI
+from reconlib.core.exceptions import QuotaExceededError, ServiceResponseError
+from reconlib.hackertarget.parser import (
+    HackerTargetParser,
+    is_error_message,
+    iter_lines,
+)
+
+
+class TestHackerTargetParser:
+    def test_iter_lines(self):
+        assert list(iter_lines("a\r\n\nb \n")) == ["a", "b"]
+        assert list(iter_lines("a\nb".encode("utf_16"), "utf_16")) == ["a", "b"]
+
+    def test_hostsearch(self):
+        """
+        GIVEN a HackerTargetParser instance
+        WHEN a "hostsearch" response containing repeated addresses and
+            malformed lines is parsed
+        THEN every valid line must be parsed, repeated addresses must
+            share a single object and malformed lines must be collected
+        """
+        errors = []
+        response = (
+            "a.github.com,140.82.112.3\n"
+            "b.github.com,140.82.112.3\n"
+            "c.github.com,not-an-ip\n"
+            "API count exceeded - Increase Quota with Membership\n"
+        )
+        entries = list(HackerTargetParser().hostsearch(iter_lines(response), errors))
+        assert entries == [
+            ("a.github.com", IPv4Address("140.82.112.3")),
+            ("b.github.com", IPv4Address("140.82.112.3")),
+        ]
+        assert entries[0][1] is entries[1][1]
+        assert errors == [
+            "c.github.com,not-an-ip",
+            "API count exceeded - Increase Quota with Membership",
+        ]
+
+    def test_interned_tables_are_bounded(self):
+        parser = HackerTargetParser(max_interned=2)
+        for value in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+            parser.ip_address(value)
+        assert len(parser._ip_addresses) == 1
+
+    def test_error_responses(self, mocker):
+        """
+        GIVEN a correctly instantiated object of type HackerTargetAPI
+        WHEN the service answers with an error message in place of
+            results
+        THEN QuotaExceededError or ServiceResponseError must be raised
+            and the message must be stored in the errors attribute
+        """
+        mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            return_value="API count exceeded - Increase Quota with Membership",
+        )
+        hackertarget = HackerTargetAPI()
+        with pytest.raises(QuotaExceededError):
+            hackertarget.fetch_subdomains("github.com")
+        with pytest.raises(QuotaExceededError):
+            hackertarget.dnslookup("github.com")
+        with pytest.raises(QuotaExceededError):
+            hackertarget.reverse_dns("140.82.121.9")
+        with pytest.raises(QuotaExceededError):
+            hackertarget.aslookup("140.82.121.9")
+        assert len(hackertarget.errors["github.com"]) == 2
+        assert hackertarget.errors["140.82.121.9"] == [
+            "API count exceeded - Increase Quota with Membership"
+        ]
+
+        mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            return_value="error check your search parameter",
+        )
+        with pytest.raises(ServiceResponseError):
+            hackertarget.fetch_subdomains("github.com")
+
+    def test_partial_error_responses(self, mocker):
+        """
+        GIVEN a correctly instantiated object of type HackerTargetAPI
+        WHEN a response holds malformed lines along with valid ones
+        THEN the valid lines must be returned and the malformed lines
+            must be stored in the errors attribute
+        """
+        mocker.patch(
+            "reconlib.hackertarget.api.HackerTargetAPI._query_service",
+            return_value="a.github.com,140.82.112.3\nb.github.com,not-an-ip\n",
+        )
+        hackertarget = HackerTargetAPI()
+        assert hackertarget.fetch_subdomains("github.com") == {"a.github.com"}
+        assert hackertarget.errors["github.com"] == ["b.github.com,not-an-ip"]
+
+    def test_is_error_message(self):
+        assert is_error_message(b"API count exceeded - Increase Quota with Membership")
+        assert is_error_message("error invalid host\n")
+        assert not is_error_message("a.github.com,140.82.112.3\n")
+        assert not is_error_message(b"")
+
+    def test_error_messages_are_not_cached(self):
+        """
+        GIVEN a HackerTargetAPI instance
+        WHEN a response body holds an error message in place of results
+        THEN the body must not be stored in the response cache
+        """
+        hackertarget = HackerTargetAPI()
+        assert not hackertarget._is_cacheable(
+            b"API count exceeded - Increase Quota with Membership"
+        )
+        assert hackertarget._is_cacheable(b"a.github.com,140.82.112.3\n")
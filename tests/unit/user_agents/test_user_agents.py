@@ -27,7 +27,11 @@ from pathlib import Path
 
 import pytest
 
-from reconlib.core.utils.user_agents import random_user_agent
+from reconlib.core.utils.user_agents import (
+    Rotation,
+    UserAgentPool,
+    random_user_agent,
+)
 
 
 @pytest.fixture
@@ -48,3 +52,59 @@ class TestUserAgents:
     def test_open_invalid_file(self):
         with pytest.raises(FileNotFoundError):
             random_user_agent(file_path="invalid")
+
+    def test_custom_file(self, tmp_path):
+        user_agents_file = tmp_path.joinpath("agents.txt")
+        user_agents_file.write_text("Agent-A\n\nAgent-B\n")
+        assert random_user_agent(file_path=user_agents_file) in {"Agent-A", "Agent-B"}
+
+
+class TestUserAgentPool:
+    def test_lazy_loading(self, user_agents):
+        """
+        GIVEN a UserAgentPool instance
+        WHEN it is created and then used to select a user-agent
+        THEN the file must only be read upon the first selection and
+            every user-agent must be kept in memory
+        """
+        pool = UserAgentPool()
+        assert pool._agents == ()
+        assert pool.select() in user_agents
+        assert set(pool.agents) == user_agents
+
+    def test_reload(self, tmp_path):
+        """
+        GIVEN a UserAgentPool instance
+        WHEN it is reloaded from a custom file
+        THEN only the user-agents of the custom file must be selected
+        """
+        user_agents_file = tmp_path.joinpath("agents.txt")
+        user_agents_file.write_text("Agent-A\n")
+        (pool := UserAgentPool()).reload(user_agents_file)
+        assert pool.agents == ("Agent-A",)
+
+    def test_weighted_rotation(self, tmp_path):
+        """
+        GIVEN a UserAgentPool instance with the WEIGHTED rotation
+        WHEN a user-agent has a weight of zero
+        THEN it must never be selected
+        """
+        user_agents_file = tmp_path.joinpath("agents.txt")
+        user_agents_file.write_text("Agent-A\nAgent-B\n")
+        pool = UserAgentPool(
+            user_agents_file, rotation=Rotation.WEIGHTED, weights=[0, 1]
+        )
+        assert {pool.select() for _ in range(100)} == {"Agent-B"}
+
+        with pytest.raises(ValueError):
+            UserAgentPool(user_agents_file, weights=[1]).select()
+
+    def test_sticky_rotation(self):
+        """
+        GIVEN a UserAgentPool instance with the STICKY rotation
+        WHEN user-agents are selected for different hosts
+        THEN the same user-agent must be returned for each host
+        """
+        pool = UserAgentPool(rotation=Rotation.STICKY)
+        assert len({pool.select("crt.sh") for _ in range(20)}) == 1
+        assert len({pool.select(f"{i}.com") for i in range(20)}) > 1
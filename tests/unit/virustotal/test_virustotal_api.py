@@ -23,13 +23,16 @@ Contact: https://www.twitter.com/eon_raider
     <https://github.com/EONRaider/ReconLib/blob/master/LICENSE>.
 """
 
+import asyncio
+import json
 import os
 import re
+from urllib.error import HTTPError
 
 import pytest
 
 from reconlib.core.exceptions import APIKeyError
-from reconlib import VirusTotalAPI
+from reconlib import AsyncVirusTotalAPI, VirusTotalAPI
 from reconlib.virustotal.api import VirusTotal
 
 
@@ -137,3 +140,125 @@ class TestVirusTotalAPI:
             VirusTotalAPI(api_key=api_key).fetch_subdomains(target="nmap.org")
             == virustotal_nmap_subdomains
         )
+
+    def test_async_fetch_subdomains(
+        self,
+        mocker,
+        api_key,
+        virustotal_subdomains_nmap_response,
+        virustotal_nmap_subdomains,
+    ):
+        """
+        GIVEN a correctly instantiated object of type AsyncVirusTotalAPI
+        WHEN a string containing a correctly formatted domain is passed
+            as an argument to its fetch_subdomains coroutine
+        THEN a set of subdomains must be returned by the service without
+            exceptions
+        """
+        mocker.patch(
+            "reconlib.virustotal.api.AsyncVirusTotalAPI._query_service",
+            return_value=virustotal_subdomains_nmap_response,
+        )
+        assert (
+            asyncio.run(
+                AsyncVirusTotalAPI(api_key=api_key).fetch_subdomains(target="nmap.org")
+            )
+            == virustotal_nmap_subdomains
+        )
+
+    @pytest.mark.parametrize("code, exception", [(401, APIKeyError), (500, HTTPError)])
+    def test_fetch_subdomains_http_error(self, mocker, api_key, code, exception):
+        """
+        GIVEN a correctly instantiated object of type VirusTotalAPI
+        WHEN VirusTotal responds to a request with an HTTP error
+        THEN an APIKeyError must be raised only if the API key was
+            rejected and the original error must be raised otherwise
+        """
+        mocker.patch(
+            "reconlib.virustotal.api.VirusTotalAPI._query_service",
+            side_effect=HTTPError("https://www.virustotal.com", code, "", {}, None),
+        )
+        with pytest.raises(exception):
+            VirusTotalAPI(api_key=api_key).fetch_subdomains(target="nmap.org")
+
+    @pytest.fixture
+    def virustotal_paginated_responses(self) -> list[str]:
+        def page(names, cursor=None):
+            meta = {"count": 5} if cursor is None else {"count": 5, "cursor": cursor}
+            return json.dumps(
+                {
+                    "meta": meta,
+                    "data": [{"id": name, "type": "domain"} for name in names],
+                }
+            )
+
+        return [
+            page(["a.nmap.org", "b.nmap.org"], cursor="CURSOR-1"),
+            page(["c.nmap.org", "d.nmap.org"], cursor="CURSOR-2"),
+            page(["e.nmap.org"]),
+        ]
+
+    def test_fetch_subdomains_pagination(
+        self, mocker, api_key, virustotal_paginated_responses
+    ):
+        """
+        GIVEN a correctly instantiated object of type VirusTotalAPI
+        WHEN the "subdomains" relationship spans several pages
+        THEN every page must be fetched by following the pagination
+            cursors and the results of all pages must be merged
+        """
+        query = mocker.patch(
+            "reconlib.virustotal.api.VirusTotalAPI._query_service",
+            side_effect=virustotal_paginated_responses,
+        )
+        virustotal = VirusTotalAPI(api_key=api_key)
+        assert virustotal.fetch_subdomains(target="nmap.org", limit=2) == {
+            f"{name}.nmap.org" for name in "abcde"
+        }
+        assert [call.kwargs["url"].split("?")[1] for call in query.call_args_list] == [
+            "limit=2",
+            "limit=2&cursor=CURSOR-1",
+            "limit=2&cursor=CURSOR-2",
+        ]
+        assert len(virustotal.results["nmap.org"]["data"]) == 5
+
+    def test_iter_subdomain_pages_max_pages(
+        self, mocker, api_key, virustotal_paginated_responses
+    ):
+        """
+        GIVEN a correctly instantiated object of type VirusTotalAPI
+        WHEN its iter_subdomain_pages method is executed with a maximum
+            number of pages
+        THEN the subdomains of each page must be yielded separately and
+            no page beyond the maximum must be fetched
+        """
+        query = mocker.patch(
+            "reconlib.virustotal.api.VirusTotalAPI._query_service",
+            side_effect=virustotal_paginated_responses,
+        )
+        pages = VirusTotalAPI(api_key=api_key).iter_subdomain_pages(
+            target="nmap.org", limit=2, max_pages=2
+        )
+        assert list(pages) == [
+            {"a.nmap.org", "b.nmap.org"},
+            {"c.nmap.org", "d.nmap.org"},
+        ]
+        assert query.call_count == 2
+
+    def test_async_fetch_subdomains_pagination(
+        self, mocker, api_key, virustotal_paginated_responses
+    ):
+        """
+        GIVEN a correctly instantiated object of type AsyncVirusTotalAPI
+        WHEN the "subdomains" relationship spans several pages
+        THEN every page must be fetched and the results of all pages
+            must be merged
+        """
+        mocker.patch(
+            "reconlib.virustotal.api.AsyncVirusTotalAPI._query_service",
+            side_effect=virustotal_paginated_responses,
+        )
+        virustotal = AsyncVirusTotalAPI(api_key=api_key)
+        assert asyncio.run(virustotal.fetch_subdomains(target="nmap.org")) == {
+            f"{name}.nmap.org" for name in "abcde"
+        }